@@ -6,9 +6,11 @@ module __Drainage__: Capillary Pressure Curve Simulation
 
 """
 
+import heapq as hq
 import scipy as sp
 import numpy as np
 import matplotlib.pyplot as plt
+import OpenPNM.Utilities.misc as misc
 from OpenPNM.Algorithms import GenericAlgorithm
 from OpenPNM.Base import logging
 logger = logging.getLogger(__name__)
@@ -356,7 +358,7 @@ class Drainage(GenericAlgorithm):
         else:
             raise Exception('Unrecognized \'bc_type\' specified')
 
-    def run(self, npts=25, inv_pressures=None):
+    def run(self, npts=25, inv_pressures=None, mode='points'):
         r"""
         Run the algorithm for specified number of points or at given capillary
         pressures.
@@ -372,20 +374,28 @@ class Drainage(GenericAlgorithm):
         inv_pressures : array_like
             A list of capillary pressures to apply. List should contain
             increasing and unique values.
-        """
-        # If no invasion points are given then generate some
-        if inv_pressures is None:
-            logger.info('Generating list of invasion pressures')
-            min_p = sp.amin(self['throat.entry_pressure']) * 0.98  # nudge down
-            max_p = sp.amax(self['throat.entry_pressure']) * 1.02  # bump up
-            inv_points = sp.logspace(sp.log10(min_p),
-                                     sp.log10(max_p),
-                                     npts)
-        else:
-            # Make sure the given invastion points are sensible
-            inv_points = sp.unique(inv_pressures)
-        self._inv_points = inv_points
 
+        mode : string
+            Controls how the capillary pressure is applied.  Options are:
+
+            **'points'** : (default) The pressure is increased in discrete
+            steps given by ``npts`` or ``inv_pressures``, and the network is
+            reclustered at each step.
+
+            **'events'** : The pressure is increased continuously by sorting
+            the throat entry pressures once and invading throats in order of
+            accessibility, so the exact invasion pressure of every pore and
+            throat is found in a single pass.  Residual phase and trapping
+            are both accounted for.  The ``npts`` and ``inv_pressures``
+            arguments are ignored, and the capillary pressure curve is
+            reported at each distinct invasion pressure.
+
+        Notes
+        -----
+        The 'events' mode gives identical results to the 'points' mode when
+        the latter is given every distinct invasion pressure as a point, but
+        without reclustering the network at each point.
+        """
         # Ensure inlets are set
         if sp.sum(self['pore.inlets']) == 0:
             raise Exception('Inlet pores have not been specified')
@@ -395,14 +405,35 @@ class Drainage(GenericAlgorithm):
             if sp.sum(self['pore.outlets']) == 0:
                 raise Exception('Outlet pores have not been specified')
 
-        # Generate curve from points
-        for inv_val in self._inv_points:
-            # Apply one applied pressure and determine invaded pores
-            logger.info('Applying capillary pressure: ' + str(inv_val))
-            self._apply_percolation(inv_val)
-            if self._trapping:
-                logger.info('Checking for trapping')
-                self._check_trapping(inv_val)
+        if mode == 'events':
+            self._run_events()
+            Pinv = sp.concatenate((self['pore.inv_Pc'],
+                                   self['throat.inv_Pc']))
+            self._inv_points = sp.unique(Pinv[Pinv < sp.inf])
+        elif mode == 'points':
+            # If no invasion points are given then generate some
+            if inv_pressures is None:
+                logger.info('Generating list of invasion pressures')
+                min_p = sp.amin(self['throat.entry_pressure']) * 0.98  # nudge down
+                max_p = sp.amax(self['throat.entry_pressure']) * 1.02  # bump up
+                inv_points = sp.logspace(sp.log10(min_p),
+                                         sp.log10(max_p),
+                                         npts)
+            else:
+                # Make sure the given invastion points are sensible
+                inv_points = sp.unique(inv_pressures)
+            self._inv_points = inv_points
+
+            # Generate curve from points
+            for inv_val in self._inv_points:
+                # Apply one applied pressure and determine invaded pores
+                logger.info('Applying capillary pressure: ' + str(inv_val))
+                self._apply_percolation(inv_val)
+                if self._trapping:
+                    logger.info('Checking for trapping')
+                    self._check_trapping(inv_val)
+        else:
+            raise Exception('Unrecognized mode: ' + str(mode))
 
         # Find invasion sequence values (to correspond with IP algorithm)
         Pinv = self['pore.inv_Pc']
@@ -410,6 +441,146 @@ class Drainage(GenericAlgorithm):
         Tinv = self['throat.inv_Pc']
         self['throat.inv_seq'] = sp.searchsorted(sp.unique(Tinv), Tinv)
 
+    def _run_events(self):
+        r"""
+        Determine the exact capillary pressure at which each pore and throat
+        is invaded by processing throats in order of accessibility from the
+        inlets.  This method is called by ``run`` when mode is 'events'.
+
+        Notes
+        -----
+        The throats are invaded in the order of an invasion percolation
+        simulation, and the running maximum of the entry pressures of the
+        invaded throats is the lowest applied pressure at which each throat
+        becomes accessible.  Residual throats act as bridges with no entry
+        pressure.  Trapping is then applied as a post-process by
+        ``_apply_trapping_events``.
+        """
+        net = self._net
+        conns = net['throat.conns']
+        Pe = sp.array(self['throat.entry_pressure'], dtype=float)
+        Pe[self['throat.residual']] = -sp.inf
+        neighbor_Ts = net.find_neighbor_throats(pores=net.Ps, flatten=False)
+        t_inv = sp.ones((net.Nt,))*sp.inf
+        p_inv = sp.ones((net.Np,))*sp.inf
+        p_reached = sp.copy(self['pore.inlets'])
+        queue = []
+        for P in net.pores()[p_reached]:
+            [hq.heappush(queue, (Pe[T], T)) for T in neighbor_Ts[P]]
+        Pc = -sp.inf
+        while len(queue) > 0:
+            entry, T = hq.heappop(queue)
+            if t_inv[T] < sp.inf:
+                continue
+            Pc = max(Pc, entry)
+            t_inv[T] = Pc
+            for P in conns[T]:
+                if p_inv[P] == sp.inf:
+                    p_inv[P] = Pc
+                if not p_reached[P]:
+                    p_reached[P] = True
+                    [hq.heappush(queue, (Pe[t], t)) for t in neighbor_Ts[P]
+                     if t_inv[t] == sp.inf]
+        # Elements reached only via residual throats are invaded along with
+        # the residual phase itself
+        t_inv[t_inv == -sp.inf] = 0
+        p_inv[p_inv == -sp.inf] = 0
+        if self._trapping:
+            self._apply_trapping_events(p_inv=p_inv, t_inv=t_inv)
+        self['pore.inv_Pc'] = p_inv
+        self['throat.inv_Pc'] = t_inv
+        # Set residual pores and throats, if any, to invaded
+        if sp.any(self['pore.residual']):
+            self['pore.inv_Pc'][self['pore.residual']] = 0
+        if sp.any(self['throat.residual']):
+            self['throat.inv_Pc'][self['throat.residual']] = 0
+
+    def _apply_trapping_events(self, p_inv, t_inv):
+        r"""
+        Find the pores and throats that are trapped by the invading phase
+        before they can be invaded.  This method is called by ``_run_events``
+        and updates the received invasion pressures in place.
+
+        Notes
+        -----
+        The invasion is replayed in reverse, adding defending throats back
+        one invasion pressure at a time and merging the defending clusters
+        they connect with a union-find structure.  A pore or throat is trapped
+        if, just before its invasion pressure is reached, its defending
+        cluster contains no uninvaded outlet pores.  The pressure at which
+        it became trapped is the one at which its cluster lost its last
+        outlet, and is stored in 'pore(throat).trapped'.
+        """
+        net = self._net
+        conns = net['throat.conns']
+        self['pore.trapped'] = sp.inf
+        self['throat.trapped'] = sp.inf
+        t_res = self['throat.residual']
+        p_res = self['pore.residual']
+        parent = sp.arange(net.Np)
+        has_outlet = sp.zeros((net.Np,), dtype=bool)
+        pending = {}
+
+        def find(P):
+            while parent[P] != P:
+                parent[P] = parent[parent[P]]
+                P = parent[P]
+            return P
+
+        def release(root, Pc):
+            for element, ind in pending.pop(root, []):
+                self[element + '.trapped'][ind] = Pc
+
+        # Group the pores and throats by their invasion pressure
+        levels = sp.unique(sp.concatenate((p_inv, t_inv)))[::-1]
+        t_level = sp.searchsorted(-levels, -t_inv)
+        p_level = sp.searchsorted(-levels, -p_inv)
+        t_groups = sp.split(sp.argsort(t_level, kind='mergesort'),
+                            sp.cumsum(sp.bincount(t_level,
+                                                  minlength=levels.size))[:-1])
+        p_groups = sp.split(sp.argsort(p_level, kind='mergesort'),
+                            sp.cumsum(sp.bincount(p_level,
+                                                  minlength=levels.size))[:-1])
+        outlets = self['pore.outlets']
+        # Pores with no defending throats are never part of a defending cluster
+        p_def = sp.bincount(conns[~t_res].flatten(), minlength=net.Np) > 0
+        for Pc, Ts, Ps in zip(levels, t_groups, p_groups):
+            Ts = Ts[~t_res[Ts]]
+            Ps = Ps[~p_res[Ps] * p_def[Ps]]
+            # Throats invaded at Pc are still defended just below Pc
+            for T in Ts:
+                r1, r2 = find(conns[T][0]), find(conns[T][1])
+                if r1 == r2:
+                    continue
+                if has_outlet[r1] and not has_outlet[r2]:
+                    release(r2, Pc)
+                elif has_outlet[r2] and not has_outlet[r1]:
+                    release(r1, Pc)
+                elif not has_outlet[r1]:
+                    pending.setdefault(r1, []).extend(pending.pop(r2, []))
+                parent[r2] = r1
+                has_outlet[r1] = has_outlet[r1] or has_outlet[r2]
+            # Outlets invaded at Pc are still open to escape just below Pc
+            for P in Ps[outlets[Ps]]:
+                root = find(P)
+                if not has_outlet[root]:
+                    release(root, Pc)
+                    has_outlet[root] = True
+            # Elements whose defending cluster has no outlet are trapped
+            for T in Ts:
+                root = find(conns[T][0])
+                if not has_outlet[root]:
+                    pending.setdefault(root, []).append(('throat', T))
+            for P in Ps:
+                root = find(P)
+                if not has_outlet[root]:
+                    pending.setdefault(root, []).append(('pore', P))
+        # Clusters that never had an outlet are trapped from the start
+        for root in list(pending.keys()):
+            release(root, levels[-1])
+        t_inv[self['throat.trapped'] < sp.inf] = sp.inf
+        p_inv[self['pore.trapped'] < sp.inf] = sp.inf
+
     def _check_trapping(self, inv_val):
         r"""
         Determine which pores and throats are trapped by invading phase.  This
@@ -507,37 +678,58 @@ class Drainage(GenericAlgorithm):
         Tvol = self._net[self._throat_volume]
         Total_vol = sp.sum(Pvol) + sp.sum(Tvol)
         # Find cumulative filled volume at each applied capillary pressure
-        Vnwp_t = []
-        Vnwp_p = []
-        Vnwp_all = []
-        for Pc in PcPoints:
-            # Calculate filled pore volumes
-            p_inv = self['pore.inv_Pc'] <= Pc
-            if self._pore_filling is None:
-                Vp = sp.sum(Pvol[p_inv])
-            else:
-                Vp = self._calc_fractional_filling(pressure=Pc,
-                                                   element='pore')
-                Vp = sp.sum(Vp[p_inv])
-            # Calculate filled throat volumes
-            t_inv = self['throat.inv_Pc'] <= Pc
-            if self._throat_filling is None:
-                Vt = sp.sum(Tvol[t_inv])
-            else:
-                Vt = self._calc_fractional_filling(pressure=Pc,
-                                                   element='throat')
-                Vt = sp.sum(Vt[t_inv])
-            Vnwp_p.append(Vp)
-            Vnwp_t.append(Vt)
-            Vnwp_all.append(Vp + Vt)
+        Vnwp_p = self._calc_invaded_volume(element='pore', pressures=PcPoints)
+        Vnwp_t = self._calc_invaded_volume(element='throat',
+                                           pressures=PcPoints)
+        Vnwp_all = Vnwp_p + Vnwp_t
         # Convert volumes to saturations by normalizing with total pore volume
-        Snwp_all = [V/Total_vol for V in Vnwp_all]
+        Snwp_all = Vnwp_all/Total_vol
         data = {}
         data['capillary_pressure'] = PcPoints
         data['invading_phase_saturation'] = Snwp_all
-        data['defending_phase_saturation'] = [1-s for s in Snwp_all]
+        data['defending_phase_saturation'] = 1 - Snwp_all
         return data
 
+    def _calc_invaded_volume(self, element, pressures):
+        r"""
+        Calculates the total volume of pores or throats filled with invading
+        phase at each of the given capillary pressures
+
+        Parameters
+        ----------
+        element : string
+            Can either be 'pore' or 'throat' indicating which type of element
+            to be calculated
+
+        pressures : array_like
+            The capillary pressures at which the invaded volume is required
+
+        Notes
+        -----
+        If no filling model was given for the element then the volumes are
+        sorted by invasion pressure and accumulated once, so the cost does
+        not depend on the number of pressures.  Otherwise the filling model
+        must be run at each pressure.
+        """
+        if element == 'pore':
+            filling = self._pore_filling
+            vol = self._net[self._pore_volume]
+        elif element == 'throat':
+            filling = self._throat_filling
+            vol = self._net[self._throat_volume]
+        else:
+            raise Exception('element must be either \'pore\' or \'throat\'')
+        pressures = sp.array(pressures, ndmin=1, dtype=float)
+        if filling is None:
+            return misc.invaded_volume(self[element + '.inv_Pc'], vol,
+                                       pressures)
+        V = sp.zeros_like(pressures)
+        for i, Pc in enumerate(pressures):
+            inv = self[element + '.inv_Pc'] <= Pc
+            Vf = self._calc_fractional_filling(pressure=Pc, element=element)
+            V[i] = sp.sum(Vf[inv])
+        return V
+
     def _calc_fractional_filling(self, element, pressure):
         r"""
         Calculates the fractional filling of each pore or throat as the
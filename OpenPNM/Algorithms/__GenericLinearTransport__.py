@@ -982,7 +982,8 @@ class GenericLinearTransport(GenericAlgorithm):
                 pass
 
         # Fetch area and length of domain
-        if 'pore.vert_index' in self._net.props():
+        if 'pore.vert_ids' in self._net.props() or \
+                'pore.vert_index' in self._net.props():
             A = vo.vertex_dimension(network=self._net, face1=inlets,
                                     parm='area')
             L = vo.vertex_dimension(network=self._net, face1=inlets,
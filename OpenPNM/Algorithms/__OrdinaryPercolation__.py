@@ -9,6 +9,7 @@ module __OrdinaryPercolation__: Ordinary Percolation Algorithm
 import scipy as sp
 import numpy as np
 import matplotlib.pyplot as plt
+import OpenPNM.Utilities.misc as misc
 from OpenPNM.Algorithms import GenericAlgorithm
 from OpenPNM.Base import logging
 logger = logging.getLogger(__name__)
@@ -157,6 +158,23 @@ class OrdinaryPercolation(GenericAlgorithm):
             logger.info('Applying capillary pressure: ' + str(inv_val))
             self._do_one_inner_iteration(inv_val)
 
+        # Store total network saturation at the pressure each element invaded
+        inv_Pc = sp.concatenate((self['pore.inv_Pc'], self['throat.inv_Pc']))
+        PcPoints = sp.unique(inv_Pc[inv_Pc < sp.inf])
+        Vp = self._calc_invaded_volume(element='pore',
+                                       volume=self._net['pore.volume'],
+                                       locations=self.Ps, pressures=PcPoints)
+        Vt = self._calc_invaded_volume(element='throat',
+                                       volume=self._net['throat.volume'],
+                                       locations=self.Ts, pressures=PcPoints)
+        total = sp.sum(self._net['throat.volume']) + \
+            sp.sum(self._net['pore.volume'])
+        sat = sp.concatenate(((Vp + Vt)/total, [sp.inf]))
+        inds = sp.searchsorted(PcPoints, self['pore.inv_Pc'])
+        self['pore.inv_sat'] = sat[inds]
+        inds = sp.searchsorted(PcPoints, self['throat.inv_Pc'])
+        self['throat.inv_sat'] = sat[inds]
+
         # Find invasion sequence values (to correspond with IP algorithm)
         self['pore.inv_seq'] = sp.searchsorted(sp.unique(self['pore.inv_Pc']),
                                                self['pore.inv_Pc'])
@@ -194,12 +212,6 @@ class OrdinaryPercolation(GenericAlgorithm):
         # Store current applied pressure in newly invaded throats
         tinds = (self['throat.inv_Pc'] == sp.inf) * (tmask)
         self['throat.inv_Pc'][tinds] = inv_val
-        # Store total network saturation
-        tsat = sp.sum(self._net['throat.volume'][self['throat.inv_Pc'] <= inv_val])
-        psat = sp.sum(self._net['pore.volume'][self['pore.inv_Pc'] <= inv_val])
-        total = sp.sum(self._net['throat.volume']) + sp.sum(self._net['pore.volume'])
-        self['pore.inv_sat'][pinds] = (tsat + psat)/total
-        self['throat.inv_sat'][tinds] = (tsat + psat)/total
 
     def evaluate_trapping(self, p_outlets):
         r"""
@@ -337,32 +349,82 @@ class OrdinaryPercolation(GenericAlgorithm):
                 temp = sp.array(~t_inv, dtype=sp.float_, ndmin=1)
                 self._def_phase['throat.' + occupancy] = temp
 
-    def plot_drainage_curve(self, pore_volume='volume', throat_volume='volume',
-                            pore_label='all', throat_label='all'):
+    def get_drainage_data(self, pore_volume='volume', throat_volume='volume',
+                          pore_label='all', throat_label='all'):
         r"""
-        Plot drainage capillary pressure curve
+        Obtain the numerical values of the resultant capillary pressure curve.
+
+        Parameters
+        ----------
+        pore_volume and throat_volume : string
+            The names of the pore and throat volume properties on the Network
+            (without the 'pore.' and 'throat.' prefix).  The default is
+            'volume' for both.
+
+        pore_label and throat_label : string
+            Only the pores and throats with these labels contribute to the
+            invaded volume.  The default is 'all'.
+
+        Returns
+        -------
+        A dictionary containing arrays of applied capillary pressures, the
+        invaded pore and throat volumes, and the phase saturations.  The
+        dictionary keys explain the content of each array.
+
+        Notes
+        -----
+        The volumes are sorted by invasion pressure and accumulated once, so
+        the cost of this method does not depend on the number of pressure
+        points applied during ``run``.  The saturations are normalized by the
+        total pore and throat volume of the Network.
         """
         try:
             PcPoints = sp.unique(self['pore.inv_Pc'])
         except:
-            raise Exception('Cannot print drainage curve: ordinary percolation \
+            raise Exception('Cannot get drainage data: ordinary percolation \
                              simulation has not been run')
-        pores = self._net.pores(labels=pore_label)
-        throats = self._net.throats(labels=throat_label)
-        Snwp_t = sp.zeros_like(PcPoints)
-        Snwp_p = sp.zeros_like(PcPoints)
-        Snwp_all = sp.zeros_like(PcPoints)
+        PcPoints = PcPoints[PcPoints < sp.inf]
         Pvol = self._net['pore.' + pore_volume]
         Tvol = self._net['throat.' + throat_volume]
-        Pvol_tot = sp.sum(Pvol)
-        Tvol_tot = sp.sum(Tvol)
-        vol_tot = Pvol_tot + Tvol_tot
-        for i in range(0, sp.size(PcPoints)):
-            Pc = PcPoints[i]
-            Snwp_p[i] = sp.sum(Pvol[self['pore.inv_Pc'][pores] <= Pc]) / vol_tot
-            Snwp_t[i] = sp.sum(Tvol[self['throat.inv_Pc'][throats] <= Pc]) / vol_tot
-            Snwp_all[i] = (sp.sum(Tvol[self['throat.inv_Pc'][throats] <= Pc]) +
-                           sp.sum(Pvol[self['pore.inv_Pc'][pores] <= Pc])) / vol_tot
+        pores = self._net.pores(labels=pore_label)
+        throats = self._net.throats(labels=throat_label)
+        Vp = self._calc_invaded_volume(element='pore', volume=Pvol,
+                                       locations=pores, pressures=PcPoints)
+        Vt = self._calc_invaded_volume(element='throat', volume=Tvol,
+                                       locations=throats, pressures=PcPoints)
+        vol_tot = sp.sum(Pvol) + sp.sum(Tvol)
+        data = {}
+        data['capillary_pressure'] = PcPoints
+        data['invaded_pore_volume'] = Vp
+        data['invaded_throat_volume'] = Vt
+        data['invading_phase_saturation'] = (Vp + Vt)/vol_tot
+        data['defending_phase_saturation'] = 1 - (Vp + Vt)/vol_tot
+        return data
+
+    def _calc_invaded_volume(self, element, volume, locations, pressures):
+        r"""
+        Calculates the total volume of the given pores or throats that is
+        invaded at each of the given capillary pressures, by sorting the
+        volumes by invasion pressure and taking a cumulative sum.
+        """
+        return misc.invaded_volume(self[element + '.inv_Pc'][locations],
+                                   volume[locations], pressures)
+
+    def plot_drainage_curve(self, pore_volume='volume', throat_volume='volume',
+                            pore_label='all', throat_label='all'):
+        r"""
+        Plot drainage capillary pressure curve
+        """
+        data = self.get_drainage_data(pore_volume=pore_volume,
+                                      throat_volume=throat_volume,
+                                      pore_label=pore_label,
+                                      throat_label=throat_label)
+        PcPoints = data['capillary_pressure']
+        vol_tot = sp.sum(self._net['pore.' + pore_volume]) + \
+            sp.sum(self._net['throat.' + throat_volume])
+        Snwp_p = data['invaded_pore_volume'] / vol_tot
+        Snwp_t = data['invaded_throat_volume'] / vol_tot
+        Snwp_all = data['invading_phase_saturation']
         if sp.mean(self._inv_phase['pore.contact_angle']) < 90:
             Snwp_p = 1 - Snwp_p
             Snwp_t = 1 - Snwp_t
@@ -385,31 +447,12 @@ class OrdinaryPercolation(GenericAlgorithm):
         and total saturation of the wetting phase on the abscissa.
         This is the preffered style in the petroleum engineering
         """
-        try:
-            PcPoints = sp.unique(self['pore.inv_Pc'])
-        except:
-            raise Exception('Cannot print drainage curve: ordinary percolation \
-                            simulation has not been run')
-        pores = self._net.pores(labels=pore_label)
-        throats = self._net.throats(labels=throat_label)
-        p_inv = self['pore.inv_Pc']
-        t_inv = self['throat.inv_Pc']
-        Snwp_t = sp.zeros_like(PcPoints)
-        Snwp_p = sp.zeros_like(PcPoints)
-        Snwp_all = sp.zeros_like(PcPoints)
-        Swp_all = sp.zeros_like(PcPoints)
-        Pvol = self._net['pore.' + pore_volume]
-        Tvol = self._net['throat.' + throat_volume]
-        Pvol_tot = sp.sum(Pvol)
-        Tvol_tot = sp.sum(Tvol)
-        for i in range(0, sp.size(PcPoints)):
-            Pc = PcPoints[i]
-            Snwp_p[i] = sp.sum(Pvol[p_inv[pores] <= Pc]) / Pvol_tot
-            Snwp_t[i] = sp.sum(Tvol[t_inv[throats] <= Pc]) / Tvol_tot
-            Snwp_all[i] = (sp.sum(Tvol[t_inv[throats] <= Pc]) +
-                           sp.sum(Pvol[p_inv[pores] <= Pc])) / \
-                          (Tvol_tot + Pvol_tot)
-            Swp_all[i] = 1 - Snwp_all[i]
+        data = self.get_drainage_data(pore_volume=pore_volume,
+                                      throat_volume=throat_volume,
+                                      pore_label=pore_label,
+                                      throat_label=throat_label)
+        PcPoints = data['capillary_pressure']
+        Swp_all = data['defending_phase_saturation']
         fig = plt.figure()
         plt.plot(Swp_all, PcPoints, 'k.-')
         plt.xlim(xmin=0)
@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""
+===============================================================================
+module __RelativePermeability__: Saturation dependent multiphase flow
+===============================================================================
+
+"""
+import scipy as sp
+import scipy.sparse as sprs
+import scipy.sparse.linalg as sprslin
+import OpenPNM.Utilities.misc as misc
+from OpenPNM.Algorithms import GenericAlgorithm
+from OpenPNM.Base import logging
+logger = logging.getLogger(__name__)
+
+
+class RelativePermeability(GenericAlgorithm):
+    r"""
+    Computes the relative permeability of the invading and defending phases
+    at each saturation of a percolation simulation.
+
+    The invasion pressures found by a *Drainage* or *OrdinaryPercolation*
+    algorithm are sorted once, and the occupancy of the network is streamed
+    through the applied capillary pressures.  At each step only the conduits
+    whose occupancy changed have their conductance updated in the coefficient
+    matrix of each phase, which keeps the same sparsity pattern throughout,
+    and the flow problem is solved starting from the previous step's solution.
+
+    Parameters
+    ----------
+    network : OpenPNM Network Object
+        The network upon which the simulation will be run
+
+    name : string (optional)
+        The name to apply to the Algorithm for quick identification
+
+    Notes
+    -----
+    This replaces the manual loop of calling ``return_results`` on the
+    percolation algorithm, regenerating the 'conduit_conductance' models on
+    each Physics and building and solving a new *StokesFlow* algorithm for
+    each saturation.  The conduit conductances are calculated in the same
+    way as ``Physics.models.multiphase.conduit_conductance``.
+
+    Examples
+    --------
+    >>> import scipy as sp
+    >>> import OpenPNM as op
+    >>> pn = op.Network.Cubic(shape=[5, 5, 5], spacing=0.0001)
+    >>> geo = op.Geometry.Toray090(network=pn, pores=pn.Ps, throats=pn.Ts)
+    >>> water = op.Phases.Water(network=pn)
+    >>> air = op.Phases.Air(network=pn)
+    >>> phys_w = op.Physics.Standard(network=pn, phase=water, geometry=geo)
+    >>> phys_a = op.Physics.Standard(network=pn, phase=air, geometry=geo)
+    >>> drn = op.Algorithms.Drainage(network=pn)
+    >>> drn.setup(invading_phase=water, defending_phase=air)
+    >>> drn.set_inlets(pores=pn.pores('top'))
+    >>> drn.run(mode='events')
+
+    Once the percolation algorithm has been run, the relative permeability
+    of both phases can be found for flow between any two faces:
+
+    >>> rp = op.Algorithms.RelativePermeability(network=pn)
+    >>> rp.setup(invading_phase=water, defending_phase=air, percolation=drn)
+    >>> rp.set_inlets(pores=pn.pores('left'))
+    >>> rp.set_outlets(pores=pn.pores('right'))
+    >>> rp.run()
+    >>> data = rp.get_relperm_data()
+    >>> kr = data['defending_phase_relperm']
+    >>> bool(sp.all((kr >= 0) & (kr <= 1)))
+    True
+
+    """
+
+    def __init__(self, network, name=None):
+        super().__init__(network=network, name=name)
+
+    def setup(self,
+              invading_phase,
+              defending_phase,
+              percolation,
+              conductance='throat.hydraulic_conductance',
+              mode='strict',
+              factor=1e-6,
+              pore_volume='pore.volume',
+              throat_volume='throat.volume'):
+        r"""
+        Used to specify necessary arguments to the simulation.
+
+        Parameters
+        ----------
+        invading_phase and defending_phase : OpenPNM Phase objects
+            The Phase objects containing the single phase conductance of each
+            fluid.
+
+        percolation : OpenPNM Algorithm object
+            A percolation algorithm, such as *Drainage* or
+            *OrdinaryPercolation*, that has already been run.  Its
+            'pore.inv_Pc' and 'throat.inv_Pc' arrays define the occupancy of
+            the invading phase at each capillary pressure.
+
+        conductance : string (optional)
+            The dictionary key on each Phase where the single phase throat
+            conductance is found.  The default is
+            'throat.hydraulic_conductance'.
+
+        mode : string (optional)
+            How agressively conduits that are not filled by a phase are
+            closed.  Options are 'strict' (default), 'medium' and 'loose', as
+            described in ``Physics.models.multiphase.conduit_conductance``.
+
+        factor : float (optional)
+            The factor by which the conductance of closed conduits is
+            multiplied.  The default is 1e-6.
+
+        pore_volume and throat_volume : string (optional)
+            The dictionary key on the Network where the pore or throat volume
+            data is located.  The defaults is 'pore.volume' and
+            'throat.volume'.
+
+        """
+        if mode not in ['strict', 'medium', 'loose']:
+            raise Exception('Unrecognized mode: ' + str(mode))
+        self['pore.inv_Pc'] = percolation['pore.inv_Pc']
+        self['throat.inv_Pc'] = percolation['throat.inv_Pc']
+        self['pore.inlets'] = False
+        self['pore.outlets'] = False
+        self._inv_phase = invading_phase
+        self._def_phase = defending_phase
+        self._conductance = conductance
+        self._mode = mode
+        self._factor = factor
+        self._pore_volume = pore_volume
+        self._throat_volume = throat_volume
+
+    def set_inlets(self, pores):
+        r"""
+        Set the pores through which both phases enter the network.  These
+        pores are held at a pressure of 1 when solving for the flow rate.
+        """
+        Ps = self._parse_locations(pores)
+        if sp.sum(self['pore.outlets'][Ps]) > 0:
+            raise Exception('Some inlets are already defined as outlets')
+        self['pore.inlets'] = False
+        self['pore.inlets'][Ps] = True
+
+    def set_outlets(self, pores):
+        r"""
+        Set the pores through which both phases leave the network.  These
+        pores are held at a pressure of 0 when solving for the flow rate.
+        """
+        Ps = self._parse_locations(pores)
+        if sp.sum(self['pore.inlets'][Ps]) > 0:
+            raise Exception('Some outlets are already defined as inlets')
+        self['pore.outlets'] = False
+        self['pore.outlets'][Ps] = True
+
+    def run(self, inv_pressures=None, iterative_solver='cg', **kwargs):
+        r"""
+        Stream the occupancy of the network through the capillary pressures
+        and find the relative permeability of both phases at each one.
+
+        Parameters
+        ----------
+        inv_pressures : array_like (optional)
+            The capillary pressures at which the relative permeabilities are
+            sought.  If not given, every distinct invasion pressure of the
+            percolation algorithm is used.
+
+        iterative_solver : string or None
+            The solver used at each step.  The default is 'cg', which is
+            warm-started from the solution of the previous step and applied
+            to the diagonally scaled system.  If None, the direct solver
+            ``spsolve`` is used instead.
+
+        kwargs : list of keyword arguments
+            These are sent to the iterative solver.  The default tolerance is
+            1e-10.
+
+        """
+        if sp.sum(self['pore.inlets']) == 0:
+            raise Exception('Inlet pores have not been specified')
+        if sp.sum(self['pore.outlets']) == 0:
+            raise Exception('Outlet pores have not been specified')
+        if iterative_solver not in [None, 'cg']:
+            raise Exception('Unrecognized iterative solver: ' +
+                            str(iterative_solver))
+        self._iterative_solver = iterative_solver
+        self._solver_params = {'tol': 1e-10}
+        self._solver_params.update(kwargs)
+        p_inv = self['pore.inv_Pc']
+        t_inv = self['throat.inv_Pc']
+        if inv_pressures is None:
+            Pc = sp.concatenate((p_inv, t_inv))
+            inv_pressures = sp.unique(Pc[Pc < sp.inf])
+        else:
+            inv_pressures = sp.unique(inv_pressures)
+
+        # Single phase flow rates for normalization
+        g_nwp = self._inv_phase[self._conductance]
+        g_wp = self._def_phase[self._conductance]
+        Q_nwp = self._calc_rate(self._build_system(g_nwp))
+        Q_wp = self._calc_rate(self._build_system(g_wp))
+
+        # Initial state has no invading phase present
+        p_occ = sp.zeros((self.Np,), dtype=bool)
+        t_occ = sp.zeros((self.Nt,), dtype=bool)
+        sys_nwp = self._build_system(self._calc_conduit_conductance(
+            g_nwp, p_occ, t_occ, self.Ts))
+        sys_wp = self._build_system(self._calc_conduit_conductance(
+            g_wp, ~p_occ, ~t_occ, self.Ts))
+
+        kr_nwp = sp.zeros_like(inv_pressures)
+        kr_wp = sp.zeros_like(inv_pressures)
+        snapshots = self._stream_occupancy(inv_pressures, p_occ, t_occ)
+        for i, Ts in enumerate(snapshots):
+            logger.info('Applying capillary pressure: ' +
+                        str(inv_pressures[i]))
+            g = self._calc_conduit_conductance(g_nwp, p_occ, t_occ, Ts)
+            self._update_system(sys_nwp, Ts, g)
+            g = self._calc_conduit_conductance(g_wp, ~p_occ, ~t_occ, Ts)
+            self._update_system(sys_wp, Ts, g)
+            kr_nwp[i] = self._calc_rate(sys_nwp)/Q_nwp
+            kr_wp[i] = self._calc_rate(sys_wp)/Q_wp
+
+        self._inv_points = inv_pressures
+        self._kr_nwp = kr_nwp
+        self._kr_wp = kr_wp
+
+    def _stream_occupancy(self, inv_pressures, p_occ, t_occ):
+        r"""
+        A generator that updates the received occupancy arrays in place to
+        each of the given capillary pressures in turn, and yields the throats
+        whose conduits are affected by the change.
+        """
+        p_inv = self['pore.inv_Pc']
+        t_inv = self['throat.inv_Pc']
+        p_order = sp.argsort(p_inv, kind='mergesort')
+        t_order = sp.argsort(t_inv, kind='mergesort')
+        p_stop = sp.searchsorted(p_inv[p_order], inv_pressures, side='right')
+        t_stop = sp.searchsorted(t_inv[t_order], inv_pressures, side='right')
+        im = self._net.create_incidence_matrix(sprsfmt='csr')
+        p_start = 0
+        t_start = 0
+        for i in range(sp.size(inv_pressures)):
+            Ps = p_order[p_start:p_stop[i]]
+            Ts = t_order[t_start:t_stop[i]]
+            p_occ[Ps] = True
+            t_occ[Ts] = True
+            # Conduits are affected by a change in any of their elements
+            Ts = sp.unique(sp.concatenate((Ts, im[Ps].indices)))
+            yield Ts
+            p_start = p_stop[i]
+            t_start = t_stop[i]
+
+    def _calc_conduit_conductance(self, g, p_occ, t_occ, throats):
+        r"""
+        Calculates the conductance of the given conduits for a phase with the
+        given occupancy, closing unfilled conduits by multiplying their
+        conductance by ``factor``.
+        """
+        throats_closed = ~t_occ[throats]
+        if self._mode == 'loose':
+            closed_conduits = throats_closed
+        else:
+            conns = self._net['throat.conns'][throats]
+            pores_1_closed = ~p_occ[conns[:, 0]]
+            pores_2_closed = ~p_occ[conns[:, 1]]
+            if self._mode == 'medium':
+                closed_conduits = throats_closed | \
+                    (pores_1_closed & pores_2_closed)
+            if self._mode == 'strict':
+                closed_conduits = pores_1_closed | throats_closed | \
+                    pores_2_closed
+        value = g[throats]*~closed_conduits + \
+            g[throats]*closed_conduits*self._factor
+        return value
+
+    def _build_system(self, g):
+        r"""
+        Builds the coefficient matrix and RHS of the flow problem for the
+        given throat conductances, with the inlet and outlet pores removed as
+        known values.  The positions of each throat's entries in the matrix
+        data are stored so they can be updated in place.
+        """
+        conns = self._net['throat.conns']
+        inlets = self['pore.inlets']
+        known = inlets + self['pore.outlets']
+        # Map each unknown pore to its row in the reduced system
+        row = -sp.ones((self.Np,), dtype=int)
+        row[~known] = sp.arange(sp.sum(~known))
+        N = sp.sum(~known)
+        r1 = row[conns[:, 0]]
+        r2 = row[conns[:, 1]]
+        internal = (r1 >= 0) * (r2 >= 0)
+        # Build the pattern with the diagonal first then both off-diagonals
+        rows = sp.concatenate((sp.arange(N), r1[internal], r2[internal]))
+        cols = sp.concatenate((sp.arange(N), r2[internal], r1[internal]))
+        A = sprs.coo_matrix((sp.ones_like(rows, dtype=float), (rows, cols)),
+                            shape=(N, N)).tocsr()
+        A.sum_duplicates()
+        A.sort_indices()
+        keys = sp.repeat(sp.arange(N, dtype=sp.int64), sp.diff(A.indptr))*N + \
+            A.indices
+        A.data[:] = 0.0
+        system = {}
+        system['A'] = A
+        system['b'] = sp.zeros((N,))
+        system['x'] = sp.zeros((N,))
+        system['g'] = sp.zeros((self.Nt,))
+        system['row'] = row
+        system['pos_12'] = -sp.ones((self.Nt,), dtype=int)
+        system['pos_21'] = -sp.ones((self.Nt,), dtype=int)
+        system['pos_12'][internal] = sp.searchsorted(keys, r1[internal]*N +
+                                                     r2[internal])
+        system['pos_21'][internal] = sp.searchsorted(keys, r2[internal]*N +
+                                                     r1[internal])
+        system['pos_diag'] = sp.searchsorted(keys, sp.arange(N)*(N + 1))
+        # Pressure of each pore if it is known, 1 at inlets and 0 at outlets
+        system['P_known'] = sp.array(inlets, dtype=float)
+        self._update_system(system, self.Ts, g[self.Ts])
+        return system
+
+    def _update_system(self, system, throats, g):
+        r"""
+        Changes the conductance of the given throats in a system built by
+        ``_build_system``, modifying only the affected entries of the
+        coefficient matrix and RHS, then solves it.
+        """
+        dg = g - system['g'][throats]
+        system['g'][throats] = g
+        conns = self._net['throat.conns'][throats]
+        row = system['row']
+        data = system['A'].data
+        pos = system['pos_12'][throats]
+        inds = pos >= 0
+        sp.add.at(data, pos[inds], -dg[inds])
+        sp.add.at(data, system['pos_21'][throats][inds], -dg[inds])
+        for i, j in [(0, 1), (1, 0)]:
+            r = row[conns[:, i]]
+            inds = r >= 0
+            sp.add.at(data, system['pos_diag'][r[inds]], dg[inds])
+            # Neighbors with a known pressure contribute to the RHS instead
+            inds = inds * (row[conns[:, j]] < 0)
+            sp.add.at(system['b'], r[inds],
+                      dg[inds]*system['P_known'][conns[inds, j]])
+        self._solve(system)
+
+    def _solve(self, system):
+        r"""
+        Solves the flow problem of a system in place, starting from its
+        previous solution if an iterative solver is used.
+        """
+        A = system['A']
+        b = system['b']
+        if sp.size(b) == 0:
+            return
+        if self._iterative_solver is None:
+            system['x'] = sprslin.spsolve(A, b)
+        else:
+            # Scale the system to a unit diagonal and RHS so the tolerance
+            # does not depend on the magnitude of the conductances
+            d = sp.sqrt(A.diagonal())
+            norm = sp.sqrt(sp.sum((b/d)**2))
+            if norm == 0:
+                system['x'] = sp.zeros_like(b)
+                return
+            D = sprs.diags(1/d, 0)
+            y, info = sprslin.cg(D*A*D, b/d/norm, x0=system['x']*d/norm,
+                                 **self._solver_params)
+            if info != 0:
+                logger.warning('Iterative solver did not converge, info: ' +
+                               str(info))
+            system['x'] = y*norm/d
+
+    def _calc_rate(self, system):
+        r"""
+        Calculates the total flow rate leaving the inlet pores of a system.
+        """
+        P = sp.copy(system['P_known'])
+        unknown = system['row'] >= 0
+        P[unknown] = system['x'][system['row'][unknown]]
+        conns = self._net['throat.conns']
+        inlets = self['pore.inlets']
+        Ts = inlets[conns[:, 0]] != inlets[conns[:, 1]]
+        dP = sp.absolute(P[conns[Ts, 0]] - P[conns[Ts, 1]])
+        return sp.sum(system['g'][Ts]*dP)
+
+    def get_relperm_data(self):
+        r"""
+        Obtain the numerical values of the resultant relative permeability
+        curves.
+
+        Returns
+        -------
+        A dictionary containing arrays of applied capillary pressures, the
+        invading phase saturation and the relative permeability of each phase.
+        The dictionary keys explain the content of each array.
+        """
+        if not hasattr(self, '_kr_nwp'):
+            raise Exception('Cannot get relative permeability data: the ' +
+                            'simulation has not been run')
+        Pc = self._inv_points
+        Pvol = self._net[self._pore_volume]
+        Tvol = self._net[self._throat_volume]
+        V = misc.invaded_volume(self['pore.inv_Pc'], Pvol, Pc) + \
+            misc.invaded_volume(self['throat.inv_Pc'], Tvol, Pc)
+        data = {}
+        data['capillary_pressure'] = Pc
+        data['invading_phase_saturation'] = V/(sp.sum(Pvol) + sp.sum(Tvol))
+        data['invading_phase_relperm'] = self._kr_nwp
+        data['defending_phase_relperm'] = self._kr_wp
+        return data
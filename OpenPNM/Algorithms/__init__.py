@@ -19,6 +19,9 @@ Classes
 .. autoclass:: InvasionPercolation
    :members:
 
+.. autoclass:: RelativePermeability
+   :members:
+
 .. autoclass:: FickianDiffusion
    :members:
 
@@ -42,3 +45,4 @@ from .__StokesFlow__ import StokesFlow
 from .__OrdinaryPercolation__ import OrdinaryPercolation
 from .__InvasionPercolation__ import InvasionPercolation
 from .__Drainage__ import Drainage
+from .__RelativePermeability__ import RelativePermeability
@@ -4,6 +4,7 @@ Core:  Core Data Class
 ###############################################################################
 """
 from OpenPNM.Base import Workspace
+import weakref
 import string
 import random
 import scipy as sp
@@ -11,7 +12,6 @@ import scipy.constants
 from OpenPNM.Base import logging, Tools
 from OpenPNM.Base import ModelsDict
 logger = logging.getLogger()
-mgr = Workspace()
 
 
 class Core(dict):
@@ -21,14 +21,27 @@ class Core(dict):
 
     def __new__(typ, *args, **kwargs):
         obj = dict.__new__(typ, *args, **kwargs)
+        # Objects belong to the Workspace of their Network, or else to the
+        # active Workspace.  The Network may also be passed by position.
+        network = kwargs.get('network', None)
+        if network is None:
+            network = next((item for item in args if isinstance(item, Core)),
+                           None)
+        obj._workspace = getattr(network, '_workspace', None)
+        if obj._workspace is None:
+            obj._workspace = Workspace()
+        obj._storage = None
         obj.update({'pore.all': sp.array([], ndmin=1, dtype=bool)})
         obj.update({'throat.all': sp.array([], ndmin=1, dtype=bool)})
         # Initialize phase, physics, and geometry tracking lists
         obj._name = None
-        obj.phases = Tools.ObjectContainer()
-        obj.geometries = Tools.ObjectContainer()
-        obj.physics = Tools.ObjectContainer()
-        obj.network = Tools.ObjectContainer()
+        obj._referrers = []
+        obj._clone_refs = []
+        obj._shared = set()
+        obj.phases = Tools.ObjectContainer(owner=obj)
+        obj.geometries = Tools.ObjectContainer(owner=obj)
+        obj.physics = Tools.ObjectContainer(owner=obj)
+        obj.network = Tools.ObjectContainer(owner=obj)
         obj._parent = None
         # Initialize ordered dict for storing property models
         obj.models = ModelsDict()
@@ -39,6 +52,28 @@ class Core(dict):
         logger.debug('Initializing Core class')
         self.name = name
 
+    def __getstate__(self):
+        # The Workspace is not stored, so the object can be saved on its own.
+        # Nor are the back references, which would drag every referrer and
+        # clone into a pickle or deep copy; _relink restores them.
+        state = self.__dict__.copy()
+        for item in ['_workspace', '_referrers', '_clone_refs', '_shared']:
+            state.pop(item, None)
+        return state
+
+    def __setstate__(self, state):
+        # Objects saved before models became a property store it as 'models'
+        if 'models' in state:
+            state['_models'] = state.pop('models')
+        self.__dict__.update(state)
+        if '_models' in self.__dict__:
+            self.models = self._models
+        if '_workspace' not in self.__dict__:
+            self._workspace = Workspace()
+        self.__dict__.setdefault('_referrers', [])
+        self.__dict__.setdefault('_clone_refs', [])
+        self.__dict__.setdefault('_shared', set())
+
     def __repr__(self):
         return '<%s.%s object at %s>' % (
             self.__class__.__module__,
@@ -75,7 +110,7 @@ class Core(dict):
         value = sp.array(value, ndmin=1)
         # Skip checks for 'coords', 'conns'
         if key in ['pore.coords', 'throat.conns']:
-            super(Core, self).__setitem__(key, value)
+            self._write(key, value)
             return
         # Skip checks for protected props, and prevent changes if defined
         protected_keys = ['all']
@@ -83,21 +118,21 @@ class Core(dict):
             if key in self.keys():
                 if sp.shape(self[key]) == (0,):
                     logger.debug(key+' is being defined.')
-                    super(Core, self).__setitem__(key, value)
+                    self._write(key, value)
                 else:
                     logger.warning(key+' is already defined.')
             else:
                 logger.debug(key+' is being defined.')
-                super(Core, self).__setitem__(key, value)
+                self._write(key, value)
             return
         # Write value to dictionary
         if sp.shape(value)[0] == 1:  # If value is scalar
             logger.debug('Broadcasting scalar value into vector: '+key)
             value = sp.ones((self._count(element), ), dtype=value.dtype)*value
-            super(Core, self).__setitem__(key, value)
+            self._write(key, value)
         elif sp.shape(value)[0] == self._count(element):
             logger.debug('Updating vector: '+key)
-            super(Core, self).__setitem__(key, value)
+            self._write(key, value)
         else:
             if self._count(element) == 0:
                 self.update({key: value})
@@ -107,19 +142,115 @@ class Core(dict):
                 # TODO: This should probably raise the following exception
                 # raise Exception('Cannot write vector of the wrong length')
 
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        # Arrays opened lazily from file are read on first access
+        if isinstance(value, Tools.LazyArray):
+            value = value.load()
+            super().__setitem__(key, value)
+        # Arrays shared by a copy-on-write clone and its original are copied
+        # on first access, since the caller may write to them in place
+        elif key in self._shared:
+            self._write(key, sp.array(value))
+            value = super().__getitem__(key)
+        return value
+
+    def get(self, key, default=None):
+        if key in self.keys():
+            return Core.__getitem__(self, key)
+        return default
+
+    def update(self, *args, **kwargs):
+        storage = self._get_storage()
+        if storage is None:
+            return super().update(*args, **kwargs)
+        for key, value in dict(*args, **kwargs).items():
+            self._write(key, value, storage=storage)
+
+    def _write(self, key, value, storage=None):
+        r"""
+        Puts ``value`` in the dictionary without any checks, after passing
+        it to the storage backend of the simulation if one has been set.
+        """
+        if storage is None:
+            storage = self._get_storage()
+        # A shared array still belongs to the other objects sharing it
+        old = None if key in self._shared else dict.get(self, key)
+        self._shared.discard(key)
+        if storage is not None:
+            value = storage.store(self, key, value, old=old)
+        super().__setitem__(key, value)
+
+    def _get_storage(self):
+        try:
+            return self._net._storage
+        except (AttributeError, IndexError):
+            return None
+
+    def _dtype(self, key):
+        r"""
+        Returns the dtype of the array stored under ``key`` without reading
+        it from file if it has not been loaded yet.
+        """
+        return dict.__getitem__(self, key).dtype
+
+    def _relink(self):
+        r"""
+        Record this object on every object it refers to, and on the object it
+        was cloned from.  This is needed after the object is unpickled or
+        deep copied, since these references are not stored.
+        """
+        for container in [self.phases, self.geometries, self.physics,
+                          self.network]:
+            container._owner = self
+            for item in container.values():
+                container._link(item)
+        if self._parent is not None:
+            self._parent._add_clone(self)
+
+    def _add_clone(self, clone):
+        r"""
+        Record ``clone`` as a clone of this object.  Only a weak reference is
+        kept, so clones can still be garbage collected.
+        """
+        self._clone_refs[:] = [ref for ref in self._clone_refs
+                               if ref() is not None]
+        if not any(ref() is clone for ref in self._clone_refs):
+            self._clone_refs.append(weakref.ref(clone))
+
+    def _clones(self):
+        r"""
+        Return the clones of this object that are still alive.  They carry
+        labels named after this object.
+        """
+        clones = [ref() for ref in self._clone_refs]
+        return [item for item in clones if item is not None]
+
     def _get_mgr(self):
-        if self in mgr.values():
-            return mgr
+        if self._workspace.get(self.name) is self:
+            return self._workspace
         else:
             return {}
 
     def _set_mgr(self, mgr):
-        if self not in mgr.values():
+        self._workspace = mgr
+        if mgr.get(self.name) is not self:
             mgr.update({self.name: self})
 
     workspace = property(fget=_get_mgr, fset=_set_mgr)
 
+    def _get_models(self):
+        return self._models
+
+    def _set_models(self, models):
+        # The ModelsDict looks up its master through this weak reference
+        models._master_ref = weakref.ref(self)
+        self._models = models
+
+    models = property(fget=_get_models, fset=_set_models)
+
     def _set_name(self, name):
+        mgr = self._workspace
         if name in mgr.keys():
             raise Exception('An object named '+name+' already exists')
         elif name is None:
@@ -130,19 +261,28 @@ class Core(dict):
         elif self._name is not None:
             logger.info('Changing the name of '+self.name+' to '+name)
             # Check if name collides with any arrays in the simulation
-            if mgr._validate_name(name):
+            objs = self._simulation() + self._referrers + self._clones()
+            if mgr._validate_name(name, objects=objs):
                 # Rename any label arrays
                 for item in self._simulation():
                     if 'pore.'+self.name in item.keys():
                         item['pore.'+name] = item.pop('pore.'+self.name)
                     if 'throat.'+self.name in item.keys():
                         item['throat.'+name] = item.pop('throat.'+self.name)
+                # Update the handles to self on associated objects
+                for item in self._referrers:
+                    for container in [item.phases, item.geometries,
+                                      item.physics, item.network]:
+                        if container.get(self.name) is self:
+                            temp = [(name if v is self else k, v)
+                                    for k, v in container.items()]
+                            dict.clear(container)
+                            dict.update(container, temp)
             else:
                 raise Exception('The provided name is already in use')
         # Remove reference to object under old name, if present
-        for item in list(mgr.items()):
-            if item[1] is self:
-                mgr.pop(item[0])
+        if (self._name is not None) and (mgr.get(self._name) is self):
+            mgr.pop(self._name)
         # Add object to workspace under new name
         mgr.update({name: self})
         self._name = name
@@ -321,7 +461,7 @@ class Core(dict):
         mode = self._parse_mode(mode=mode, allowed=allowed)
         element = self._parse_element(element=element)
         # Prepare lists of each type of array
-        props = [item for item in self.keys() if self[item].dtype != bool]
+        props = [item for item in self.keys() if self._dtype(item) != bool]
         models = list(self.models.keys())
         constants = [item for item in props if item not in models]
         # Execute desired array lookup
@@ -355,7 +495,7 @@ class Core(dict):
         element = self._parse_element(element=element)
         # Collect list of all pore OR throat labels
         a = set([k for k in self.keys() if k.split('.')[0] == element[0]])
-        b = set([k for k in self.keys() if self[k].dtype == bool])
+        b = set([k for k in self.keys() if self._dtype(k) == bool])
         labels = list(a.intersection(b))
         labels.sort()
         labels = sp.array(labels)  # Convert to ND-array for following checks
@@ -445,7 +585,7 @@ class Core(dict):
                 a = set([key for key in self.keys()
                          if key.split('.')[0] == item])
                 b = set([key for key in self.keys()
-                         if self[key].dtype == bool])
+                         if self._dtype(key) == bool])
                 labels.extend(list(a.intersection(b)))
         elif (sp.size(pores) > 0) and (sp.size(throats) > 0):
             raise Exception('Cannot perform label query on pores and ' +
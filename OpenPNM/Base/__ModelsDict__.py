@@ -4,8 +4,9 @@ ModelsDict:  Abstract Class for Containing Models
 ###############################################################################
 """
 import inspect
+import weakref
 from collections import OrderedDict
-from OpenPNM.Base import logging, Workspace
+from OpenPNM.Base import logging
 logger = logging.getLogger()
 
 
@@ -22,6 +23,10 @@ class ModelWrapper(dict):
     def __init__(self, **kwargs):
         self.update(**kwargs)
 
+    def __getstate__(self):
+        # The reference to the ModelsDict is set again when it is rebuilt
+        return {}
+
     def __call__(self):
         return self['model'](**self)
 
@@ -81,19 +86,11 @@ class ModelWrapper(dict):
         return self['model'](**kwargs)
 
     def _find_master(self):
-        mgr = Workspace()
-        master = []
-        for item in list(mgr.keys()):
-            if mgr[item].models is not None:
-                for model in list(mgr[item].models.keys()):
-                    if mgr[item].models[model] is self:
-                        master.append(mgr[item])
-        if len(master) > 1:
-            raise Exception('More than one master found! This model dictionary '
-                            'has been associated with multiple objects. To use '
-                            'the same dictionary multiple times use the copy'
-                            'method.')
-        return master[0]
+        ref = getattr(self, '_models_ref', None)
+        models = ref() if ref is not None else None
+        if models is None:
+            raise Exception('This model has not been added to a ModelsDict')
+        return models._find_master()
 
 
 class GenericModel(ModelWrapper):
@@ -147,8 +144,14 @@ class ModelsDict(OrderedDict):
     def __setitem__(self, propname, model):
         temp = ModelWrapper(propname=propname, model=None)
         temp.update(**model)
+        temp._models_ref = weakref.ref(self)
         super().__setitem__(propname, temp)
 
+    def __reduce__(self):
+        # The reference to the master object is not stored, it is set again
+        # when the ModelsDict is assigned to an object
+        return (self.__class__, (), None, None, iter(self.items()))
+
     def __str__(self):
         horizontal_rule = '-' * 60
         lines = [horizontal_rule]
@@ -360,11 +363,14 @@ class ModelsDict(OrderedDict):
             self.move_to_end(item)
 
     def _find_master(self):
-        mgr = Workspace()
-        master = []
-        for item in list(mgr.keys()):
-            if mgr[item].models is self:
-                master.append(mgr[item])
+        ref = getattr(self, '_master_ref', None)
+        owner = ref() if ref is not None else None
+        if owner is None:
+            raise Exception('ModelsDict has no master.')
+        # Only the Workspace of the owner can hold other objects sharing it
+        master = [owner] if owner.models is self else []
+        master += [item for item in owner._workspace.values()
+                   if (item is not owner) and (item.models is self)]
         if len(master) > 1:
             raise Exception('More than one master found! This model dictionary '
                             'has been associated with multiple objects. To use the '
@@ -3,6 +3,10 @@
 Tools:  Useful classes for use throughout the project
 ###############################################################################
 """
+import os as _os
+import shutil as _shutil
+import tempfile as _tempfile
+import weakref as _weakref
 import scipy as _sp
 from collections import OrderedDict as _odict
 
@@ -39,6 +43,31 @@ class ObjectContainer(dict):
     still be a regular dictionary. Eventually, we could remove the callable
     aspect (i.e. in V2.0).
     """
+    def __init__(self, *args, owner=None, **kwargs):
+        self._owner = owner
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, name, obj):
+        super().__setitem__(name, obj)
+        self._link(obj)
+
+    def update(self, *args, **kwargs):
+        items = dict(*args, **kwargs)
+        super().update(items)
+        for obj in items.values():
+            self._link(obj)
+
+    def _link(self, obj):
+        # Record the owner on the referenced object, so the objects holding
+        # a reference to it can be found without searching the Workspace
+        owner = getattr(self, '_owner', None)
+        referrers = getattr(obj, '_referrers', None)
+        if (owner is None) or (referrers is None):
+            return
+        if not any(item is owner for item in referrers):
+            referrers.append(owner)
+
     def __call__(self, name=None):
         if self == {}:
             return []
@@ -97,6 +126,133 @@ class HealthDict(PrintableDict):
     health = property(fget=_get_health)
 
 
+class LazyArray():
+    r"""
+    A placeholder for an array that has not been read from disk yet.  It
+    knows the ``shape`` and ``dtype`` of the data it stands for, so these can
+    be inspected without any I/O, and the data itself is only read when
+    ``load`` is called.  **Core** objects replace these placeholders with the
+    loaded array on first access.
+
+    Parameters
+    ----------
+    loader : callable
+        A function taking no arguments and returning the ndarray
+
+    shape : tuple
+        The shape of the array returned by ``loader``
+
+    dtype : numpy dtype
+        The dtype of the array returned by ``loader``
+    """
+    def __init__(self, loader, shape, dtype):
+        self._loader = loader
+        self.shape = tuple(shape)
+        self.dtype = _sp.dtype(dtype)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __repr__(self):
+        return '<LazyArray shape=%s dtype=%s>' % (self.shape, self.dtype)
+
+    def __array__(self, dtype=None):
+        arr = self.load()
+        if dtype is not None:
+            arr = arr.astype(dtype)
+        return arr
+
+    def __reduce__(self):
+        # Pickling or copying a placeholder stores the actual data
+        return (_sp.asarray, (self.load(), ))
+
+    def load(self):
+        return self._loader()
+
+
+class MemmapStorage():
+    r"""
+    A storage backend that keeps the pore and throat arrays of a simulation in
+    memory-mapped files instead of in RAM.  It is normally created with
+    ``network.set_storage('memmap')`` rather than directly.
+
+    Parameters
+    ----------
+    path : string, optional
+        The scratch directory in which to create the files.  If not given a
+        temporary directory is created, which is deleted along with its
+        contents when this object is garbage collected.
+
+    Notes
+    -----
+    Each array is written to its own uniquely named file, prefixed with the
+    names of the object and the array.  Arrays with ``object`` dtype and
+    empty arrays cannot be mapped to a file and are kept in memory.
+
+    The arrays are ``numpy.memmap`` instances whose ``filename`` attribute
+    gives the file holding the data, so worker processes can open them with
+    ``MemmapStorage.open_readonly`` and share the topology of a large network
+    without copying it.
+    """
+
+    def __init__(self, path=None):
+        self._temporary = path is None
+        if path is None:
+            path = _tempfile.mkdtemp(prefix='OpenPNM_')
+            _weakref.finalize(self, _shutil.rmtree, path, True)
+        elif not _os.path.isdir(path):
+            _os.makedirs(path)
+        self.path = _os.path.abspath(path)
+
+    def __getstate__(self):
+        return {'path': None if self._temporary else self.path}
+
+    def __setstate__(self, state):
+        self.__init__(path=state['path'])
+
+    def store(self, obj, key, value, old=None):
+        r"""
+        Copy ``value`` into a new memory-mapped file and return the mapped
+        array.  If ``old`` is an array previously returned by this method its
+        file is removed.
+        """
+        value = _sp.asarray(value)
+        if (value.dtype.kind == 'O') or (value.size == 0):
+            return value
+        fd, filename = _tempfile.mkstemp(prefix=obj.name+'.'+key+'.',
+                                         suffix='.dat', dir=self.path)
+        _os.close(fd)
+        arr = _sp.memmap(filename, dtype=value.dtype, mode='w+',
+                         shape=value.shape)
+        arr[...] = value
+        # Read-only arrays are shared with another object, so keep the file
+        if isinstance(old, _sp.memmap) and old is not value and \
+                old.flags.writeable:
+            self.release(old)
+        return arr
+
+    def release(self, array):
+        r"""
+        Remove the file behind an array previously returned by ``store``.
+        The array itself must no longer be used afterward.
+        """
+        filename = getattr(array, 'filename', None)
+        if filename and _os.path.dirname(filename) == self.path:
+            try:
+                _os.remove(filename)
+            except OSError:  # The file is still in use on some platforms
+                pass
+
+    @staticmethod
+    def open_readonly(filename, dtype, shape):
+        r"""
+        Open a file written by ``store`` as a read-only array, for instance
+        in a worker process.  The ``filename``, ``dtype`` and ``shape`` can be
+        taken from the array on the original object.
+        """
+        return _sp.memmap(filename, dtype=dtype, mode='r', shape=shape)
+
+
 class SetLocations():
 
     @staticmethod
@@ -5,6 +5,8 @@ Workspace:  A class for managing the workspace of all objects
 """
 import dill as _pickle
 import copy as _copy
+import threading as _threading
+import scipy as _sp
 import time
 import random
 import string
@@ -14,19 +16,73 @@ logger = logging.getLogger()
 
 
 class Workspace(dict):
+    r"""
+    A dictionary holding all the OpenPNM objects, stored under their names.
+
+    Notes
+    -----
+    Calling ``Workspace()`` anywhere in the code returns the *active*
+    Workspace, which is the same default object everywhere unless another
+    Workspace has been activated.  Separate simulations can be kept apart by
+    creating independent Workspaces with ``Workspace.isolated()`` and
+    activating one with a ``with`` statement.  Objects created inside the
+    ``with`` block belong to that Workspace, as do objects created later on a
+    Network from it.  The active Workspace is tracked per thread, so each
+    thread in a pool can drive its own simulation:
+
+    >>> import OpenPNM
+    >>> ws = OpenPNM.Base.Workspace.isolated()
+    >>> with ws:
+    ...     pn = OpenPNM.Network.Cubic(shape=[3, 3, 3], name='isolated_net')
+    >>> 'isolated_net' in ws.keys()
+    True
+    >>> 'isolated_net' in OpenPNM.Base.Workspace().keys()
+    False
+    """
     # The following __instance__ class variable and subclassed __new__ method
-    # makes the Workspace class a 'Singleton'.  This way, any instantiation
-    # of a workspace object anywhere in the code will return the same object.
+    # makes the default Workspace a 'Singleton'.  This way, any instantiation
+    # of a workspace object anywhere in the code will return the same object,
+    # unless a different Workspace has been activated in the current thread.
     __instance__ = None
+    _active = _threading.local()
+    _lock = _threading.Lock()
 
     def __new__(cls, *args, **kwargs):
+        stack = getattr(Workspace._active, 'stack', None)
+        if stack:
+            return stack[-1]
         if Workspace.__instance__ is None:
-            Workspace.__instance__ = dict.__new__(cls)
+            with Workspace._lock:  # Threads may race on first access
+                if Workspace.__instance__ is None:
+                    Workspace.__instance__ = dict.__new__(cls)
         return Workspace.__instance__
 
     def __init__(self):
         self.comments = 'Using OpenPNM ' + OpenPNM.__version__
 
+    def __enter__(self):
+        if not hasattr(Workspace._active, 'stack'):
+            Workspace._active.stack = []
+        Workspace._active.stack.append(self)
+        return self
+
+    def __exit__(self, *args):
+        Workspace._active.stack.pop()
+
+    @classmethod
+    def isolated(cls):
+        r"""
+        Create a new Workspace that is independent of the default one.  Use
+        it in a ``with`` statement to create objects in it.
+
+        Returns
+        -------
+        A new, empty Workspace object
+        """
+        ws = dict.__new__(cls)
+        ws.__init__()
+        return ws
+
     def __str__(self):
         lines = []
         horizontal_rule = 60 * '-'
@@ -178,14 +234,25 @@ class Workspace(dict):
             self.pop(net.name, None)
         elif mode == 'single':
             name = obj.name
-            for item in list(self.keys()):
+            # Only objects associated with obj can hold its labels, but
+            # objects from old files may not know their associations
+            referrers = obj._referrers + obj._clones()
+            if not referrers:
+                referrers = list(self.values())
+            for item in [obj] + referrers:
                 # Remove label arrays from all other objects
-                self[item].pop('pore.' + name, None)
-                self[item].pop('throat.' + name, None)
+                item.pop('pore.' + name, None)
+                item.pop('throat.' + name, None)
                 # Remove associations on other objects
-                self[item].geometries.pop(name, None)
-                self[item].physics.pop(name, None)
-                self[item].phases.pop(name, None)
+                item.geometries.pop(name, None)
+                item.physics.pop(name, None)
+                item.phases.pop(name, None)
+            # Stop the objects referenced by obj from referring back to it
+            for container in [obj.geometries, obj.physics, obj.phases,
+                              obj.network]:
+                for item in container.values():
+                    item._referrers[:] = [i for i in item._referrers
+                                          if i is not obj]
             # Remove object from Workspace dict
             self.pop(name, None)
 
@@ -256,7 +323,8 @@ class Workspace(dict):
         self.update({obj.name: obj})
         return obj_new
 
-    def save_simulation(self, network, filename=''):
+    def save_simulation(self, network, filename='', fileformat='net',
+                        **kwargs):
         r"""
         Save a single Network simulation to a 'net' file, including all of its
         associated objects, but not Algorithms
@@ -267,16 +335,27 @@ class Workspace(dict):
             The Network to save
         filename : string, optional
             If no filename is given the name of the Network is used
+        fileformat : string, optional
+            Either 'net' (default) to pickle the simulation into a single
+            file, or 'hdf5' to write each array to its own dataset in an HDF5
+            file, which can be loaded lazily.  Any additional keyword arguments
+            such as ``compression`` are passed to ``IO.HDF5.save``.
         """
+        fileformat = fileformat.lower()
         if filename == '':
             filename = network.name
-        else:
+        if fileformat == 'net':
             filename = filename.rsplit('.net', 1)[0]
+            # Save nested dictionary pickle
+            _pickle.dump(network, open(filename + '.net', 'wb'))
+        elif fileformat in ['hdf5', 'h5']:
+            import OpenPNM.Utilities.IO as io
+            io.HDF5.save(objects=network._simulation(), filename=filename,
+                         **kwargs)
+        else:
+            raise ValueError(fileformat+' is not a valid format')
 
-        # Save nested dictionary pickle
-        _pickle.dump(network, open(filename + '.net', 'wb'))
-
-    def load_simulation(self, filename):
+    def load_simulation(self, filename, lazy=True):
         r"""
         Loads a Network simulation fromt the specified 'net' file and adds it
         to the Workspace
@@ -284,10 +363,20 @@ class Workspace(dict):
         Parameters
         ----------
         filename : string
-            The name of the file containing the Network simulation to load
+            The name of the file containing the Network simulation to load.
+            Files ending in 'hdf5' or 'h5' are read as HDF5 files.
+        lazy : boolean, optional
+            Only applies to HDF5 files.  If ``True`` (default) each array is
+            read from the file the first time it is accessed.
         """
-        filename = filename.rsplit('.net', 1)[0]
-        net = _pickle.load(open(filename + '.net', 'rb'))
+        with self:  # Loaded objects belong to this Workspace
+            if filename.endswith('.hdf5') or filename.endswith('.h5'):
+                import OpenPNM.Utilities.IO as io
+                objs = io.HDF5.load(filename=filename, lazy=lazy)
+                net = [item for item in objs if item._isa('Network')][0]
+            else:
+                filename = filename.rsplit('.net', 1)[0]
+                net = _pickle.load(open(filename + '.net', 'rb'))
         temp_dict = {}  # Store objects temporarily to ensure no exceptions
         if net.name not in self.keys():
             temp_dict[net.name] = net
@@ -300,9 +389,10 @@ class Workspace(dict):
                 raise Exception('An object with that name is already present')
         # If no exceptions, then transfer objects to self
         for item in temp_dict.values():
+            item._relink()
             item.workspace = self
 
-    def save_workspace(self, filename=''):
+    def save_workspace(self, filename='', fileformat='pnm', **kwargs):
         r"""
         Save the entire state of the Workspace to a 'pnm' file.
 
@@ -311,6 +401,11 @@ class Workspace(dict):
         filename : string, optional
             The file name to save as. If no filename is provided the current
             date and time is used.
+        fileformat : string, optional
+            Either 'pnm' (default) to pickle the Workspace into a single file,
+            or 'hdf5' to write each array to its own dataset in an HDF5 file,
+            which can be loaded lazily.  Any additional keyword arguments such
+            as ``compression`` are passed to ``IO.HDF5.save``.
 
         Examples
         --------
@@ -336,11 +431,16 @@ class Workspace(dict):
             from datetime import datetime
             i = datetime.now()
             filename = i.strftime('%Y-%m-%d_%H-%M-%S')
+        fileformat = fileformat.lower()
+        if fileformat == 'pnm':
+            filename = filename.rsplit('.pnm', 1)[0]
+            # Save nested dictionary pickle
+            _pickle.dump(self, open(filename + '.pnm', 'wb'))
+        elif fileformat in ['hdf5', 'h5']:
+            import OpenPNM.Utilities.IO as io
+            io.HDF5.save(objects=self.values(), filename=filename, **kwargs)
         else:
-            filename = filename.rstrip('.pnm')
-
-        # Save nested dictionary pickle
-        _pickle.dump(self, open(filename + '.pnm', 'wb'))
+            raise ValueError(fileformat+' is not a valid format')
 
     def save(self, **kwargs):
         r"""
@@ -349,27 +449,42 @@ class Workspace(dict):
         logger.warning("This method is deprecated, use \'save_workspace\'.")
         self.save_workspace(**kwargs)
 
-    def load_workspace(self, filename):
+    def load_workspace(self, filename, lazy=True):
         r"""
         Load an entire Workspace from a 'pnm' file.
 
         Parameters
         ----------
         filename : string
-            The file name of the Workspace to load.
+            The file name of the Workspace to load.  Files ending in 'hdf5' or
+            'h5' are read as HDF5 files.
+        lazy : boolean, optional
+            Only applies to HDF5 files.  If ``True`` (default) each array is
+            read from the file the first time it is accessed.
 
         Notes
         -----
         This calls the ``clear`` method of the Workspace object, so it will
         remove all existing objects in the current workspace.
         """
-        filename = filename.rsplit('.pnm', 1)[0]
         if self != {}:
             logger.warn('Loading data onto non-empty workspace object,' +
                         ' existing data will be lost')
             self.clear()
 
-        self = _pickle.load(open(filename+'.pnm', 'rb'))
+        if filename.endswith('.hdf5') or filename.endswith('.h5'):
+            import OpenPNM.Utilities.IO as io
+            with self:
+                objs = io.HDF5.load(filename=filename, lazy=lazy)
+            for item in objs:
+                item._relink()
+                item.workspace = self
+            return
+        filename = filename.rsplit('.pnm', 1)[0]
+        with self:  # Unpickling a Workspace fills the active one
+            self = _pickle.load(open(filename+'.pnm', 'rb'))
+        for item in self.values():
+            item._relink()
         for item in self._comments.values():
             if 'Using OpenPNM' in item:
                 version = item.lstrip('Using OpenPNM ')
@@ -482,16 +597,17 @@ class Workspace(dict):
         import OpenPNM.Utilities.IO as io
         # Handle normal file types
         ext = filename.split('.')[-1]
-        if ext.lower() == 'csv':
-            network = io.CSV.load(filename=filename)
-        elif ext.lower() == 'mat':
-            network = io.MAT.load(filename=filename)
-        elif ext.lower() == 'yaml':
-            network = io.NetworkX.load(filename=filename)
-        elif ext.lower() == 'vtp':
-            network = io.VTK.load(filename=filename)
-        else:
-            raise Exception('Filename does not have suppored extension')
+        with self:
+            if ext.lower() == 'csv':
+                network = io.CSV.load(filename=filename)
+            elif ext.lower() == 'mat':
+                network = io.MAT.load(filename=filename)
+            elif ext.lower() == 'yaml':
+                network = io.NetworkX.load(filename=filename)
+            elif ext.lower() == 'vtp':
+                network = io.VTK.load(filename=filename)
+            else:
+                raise Exception('Filename does not have suppored extension')
         return network
 
     def _set_comments(self, string):
@@ -508,7 +624,7 @@ class Workspace(dict):
 
     comments = property(fget=_get_comments, fset=_set_comments)
 
-    def clone_simulation(self, network, name=None):
+    def clone_simulation(self, network, name=None, copy_on_write=False):
         r"""
         Accepts a Network object and creates a complete clone including all
         associated objects.  All objects in the cloned simulation are
@@ -524,6 +640,12 @@ class Workspace(dict):
         name : string
             This string will be appended to the name of all cloned objects.
 
+        copy_on_write : boolean
+            If False (default) all the pore and throat arrays are copied.  If
+            True the cloned objects share the arrays of the original objects,
+            and each object only copies an array when it first accesses it,
+            so cloning is quick and uses little memory.
+
         Returns
         -------
         A handle to the new Network object, which will include handles to
@@ -539,6 +661,12 @@ class Workspace(dict):
         that can be trimmed to a smaller size.  This smaller simulation will
         result in much faster Algorithms calculations.
 
+        With ``copy_on_write`` an object is given its own copy of a shared
+        array the first time the array is accessed through ``obj[key]``, so
+        ``pn2['pore.diameter'][0] = 1.0`` never changes the original, nor the
+        other way around.  The arrays in the clone are read-only views until
+        then.
+
         Examples
         --------
         >>> import OpenPNM
@@ -547,6 +675,10 @@ class Workspace(dict):
         >>> pn2 = mgr.clone_simulation(pn, name='cloned')
         >>> pn2 is pn
         False
+        >>> pn3 = mgr.clone_simulation(pn, name='shared', copy_on_write=True)
+        >>> pn3['pore.coords'][0] = [-1, -1, -1]
+        >>> pn['pore.coords'][0].tolist() == [-1, -1, -1]
+        False
         """
         if network._parent is not None:
             logger.error('Cannot clone a network that is already a clone')
@@ -559,10 +691,15 @@ class Workspace(dict):
             logger.error('The provided name is already in use')
             return
 
-        net = _copy.deepcopy(network)  # Make clone
+        with self:  # The clones belong to this Workspace
+            if copy_on_write:
+                net = self._shallow_clone(network)
+            else:
+                net = _copy.deepcopy(network)  # Make clone
         # Add supplied name suffix to all cloned objects
         for item in net._simulation():
             item._parent = network
+            item._relink()
             item.name = item.name + '_' + name
 
         # Add parent Network numbering to clone
@@ -570,14 +707,56 @@ class Workspace(dict):
         net['throat.' + network.name] = network.Ts
         return net
 
-    def _validate_name(self, name):
-        valid_name = True
-        for item_name in list(self.keys()):
-            # Check object names for conflict
-            if name == item_name:
+    def _shallow_clone(self, network):
+        r"""
+        Clone the simulation with all arrays shared as read-only views.  The
+        arrays are taken out of the objects while they are deep copied, then
+        given to the clones without being copied.  The shared keys are
+        recorded on both sides, so each object copies an array on first
+        access and the original's arrays are left untouched.
+        """
+        objs = network._simulation()
+        contents = [dict(obj) for obj in objs]
+        # The cached sparse matrices only depend on the shared topology
+        memo = {}
+        for item in ['_adjacency_matrix', '_incidence_matrix']:
+            cache = getattr(network, item, None)
+            if cache is not None:
+                memo[id(cache)] = dict(cache)
+        try:
+            for obj in objs:
+                dict.clear(obj)
+            net = _copy.deepcopy(network, memo)
+        finally:
+            for obj, data in zip(objs, contents):
+                dict.update(obj, data)
+        clones = {item.name: item for item in net._simulation()}
+        for obj, data in zip(objs, contents):
+            shared = {}
+            for key, value in data.items():
+                # Arrays not yet read from file are shared as placeholders
+                if isinstance(value, _sp.ndarray):
+                    value = value.view()
+                    value.setflags(write=False)
+                    obj._shared.add(key)
+                    clones[obj.name]._shared.add(key)
+                shared[key] = value
+            dict.update(clones[obj.name], shared)
+        return net
+
+    def _validate_name(self, name, objects=None):
+        r"""
+        Check that ``name`` is not used by any object, nor by a label array
+        on any of the given ``objects`` (all objects in the Workspace by
+        default).
+        """
+        # Check object names for conflict
+        if name in self.keys():
+            return False
+        if objects is None:
+            objects = self.values()
+        # Also check array names on the given objects
+        for item in objects:
+            if ('pore.' + name in item) or ('throat.' + name in item):
                 return False
-            # Also check array names on all objects
-            for array_name in list(self[item_name].keys()):
-                if name == array_name.split('.')[-1]:
-                    return False
-        return valid_name
+        return True
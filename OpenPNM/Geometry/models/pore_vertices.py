@@ -4,7 +4,7 @@ pore_vertices -- update pore vertices from Vornoi object
 ===============================================================================
 
 """
-import scipy as _sp
+import OpenPNM.Utilities.vertexops as vo
 
 
 def voronoi(network, geometry, **kwargs):
@@ -12,7 +12,6 @@ def voronoi(network, geometry, **kwargs):
     Update the pore vertices from the voronoi vertices
     """
     pores = geometry.map_pores(network, geometry.pores())
-    value = _sp.ndarray(len(pores), dtype=object)
-    for i in range(len(pores)):
-        value[i] = _sp.asarray(list(network['pore.vert_index'][pores[i]].values()))
+    indptr, verts = vo.vertex_csr(network, 'pore', pores)
+    value = vo.csr_to_objects(indptr, verts)
     return value
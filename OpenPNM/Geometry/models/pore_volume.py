@@ -4,11 +4,14 @@ pore_volume --
 ===============================================================================
 
 """
+import itertools
+import tempfile
 import scipy as _sp
 import numpy as np
 from scipy.spatial import Delaunay
 from scipy.spatial import ConvexHull
 import OpenPNM.Utilities.misc as misc
+import OpenPNM.Utilities.vertexops as vo
 from scipy import ndimage
 from OpenPNM.Base import logging
 logger = logging.getLogger(__name__)
@@ -34,8 +37,6 @@ def inhull(geometry, xyz, pore, tol=1e-7):
     # start index
     si = np.floor(origin).astype(int)
     xyz -= origin
-    dom = np.zeros([xr, yr, zr], dtype=np.uint8)
-    indx, indy, indz = np.indices((xr, yr, zr))
     # Calculate the tesselation of the points
     hull = ConvexHull(xyz)
     # Assume 3d for now
@@ -57,26 +58,28 @@ def inhull(geometry, xyz, pore, tol=1e-7):
     nrmls[k] = -nrmls[k]
     # Now we want to test whether dot(x,N) >= dot(a,N)
     aN = np.sum(nrmls*a, axis=-1)
-
-    for plane_index in range(len(a)):
-        eqx = nrmls[plane_index][0]*(indx)
-        eqy = nrmls[plane_index][1]*(indy)
-        eqz = nrmls[plane_index][2]*(indz)
-        xN = eqx + eqy + eqz
-        dom[xN - aN[plane_index] >= 0-tol] += 1
-    dom[dom < len(a)] = 0
-    dom[dom == len(a)] = 1
-    ds = np.shape(dom)
-    temp_arr = np.zeros_like(geometry._hull_image, dtype=bool)
-    temp_arr[si[0]:si[0]+ds[0], si[1]:si[1]+ds[1], si[2]:si[2]+ds[2]] = dom
-    geometry._hull_image[temp_arr] = pore
+    # Test the voxels against all planes at once, a few x slices at a time to
+    # limit the size of the temporary arrays
+    dom = np.zeros([xr, yr, zr], dtype=bool)
+    indy, indz = np.indices((yr, zr))
+    eqyz = nrmls[:, 1]*indy[..., np.newaxis] + nrmls[:, 2]*indz[..., np.newaxis]
+    step = max(1, int(1e6/np.size(eqyz)))
+    for x0 in range(0, xr, step):
+        indx = np.arange(x0, min(x0 + step, xr))[:, np.newaxis, np.newaxis,
+                                                 np.newaxis]
+        xN = nrmls[:, 0]*indx + eqyz
+        dom[x0:x0 + step] = np.all(xN - aN >= 0-tol, axis=-1)
+    # Write directly into the sub-block of the images covered by the hull,
+    # clipped to the extent of the images
+    lo = np.maximum(si, 0)
+    hi = np.minimum(si + np.shape(dom), np.shape(geometry._hull_image))
+    block = tuple(slice(l, h) for l, h in zip(lo, hi))
+    dom = dom[tuple(slice(l, h) for l, h in zip(lo - si, hi - si))]
+    geometry._hull_image[block][dom] = pore
     hull_num = np.sum(dom)
-    dom = dom * geometry._fibre_image[si[0]:si[0]+ds[0], si[1]:si[1]+ds[1],
-                                      si[2]:si[2]+ds[2]]
-    pore_num = np.sum(dom)
+    pore_num = np.sum(geometry._fibre_image[block][dom])
     fibre_num = hull_num - pore_num
 
-    del temp_arr
     return pore_num, fibre_num
 
 
@@ -85,139 +88,176 @@ def _voxel_centroid(image, pores=None, vox_len=1e-6):
     Calculate Pore Centroid from indices of the voronoi voxel image generated
     in _get_voxel_volume
     """
-    if pores is None:
-        pores = np.unique(image)
-    centroids = np.zeros([len(pores), 3])
-    for i, pore in enumerate(pores):
-        px, py, pz = np.where(image == pore)
-        try:
-            # If one is empty then all will be - no pore volume for this pore
-            if len(px) > 0:
-                cx = np.mean(px)
-                cy = np.mean(py)
-                cz = np.mean(pz)
-            centroids[i] = np.array([cx, cy, cz])*vox_len
-        except:
-            logger.warn("Some centroid data may be invalid, look for zeros")
+    centroids = misc.label_stats(image, labels=pores,
+                                 voxel_size=vox_len)['centroid']
+    if _sp.any(_sp.isnan(centroids)):
+        # No pore volume for these pores
+        logger.warn("Some centroid data may be invalid, look for zeros")
+        centroids[_sp.isnan(centroids)] = 0.0
     return centroids
 
 
-def _get_vertex_range(verts):
-    # Find the extent of the vetrices
-    [vxmin, vxmax, vymin, vymax, vzmin, vzmax] = [1e20, 0, 1e20, 0, 1e20, 0]
-    for vert in verts:
-        if np.min(vert[:, 0]) < vxmin:
-            vxmin = np.min(vert[:, 0])
-        if np.max(vert[:, 0]) > vxmax:
-            vxmax = np.max(vert[:, 0])
-        if np.min(vert[:, 1]) < vymin:
-            vymin = np.min(vert[:, 1])
-        if np.max(vert[:, 1]) > vymax:
-            vymax = np.max(vert[:, 1])
-        if np.min(vert[:, 2]) < vzmin:
-            vzmin = np.min(vert[:, 2])
-        if np.max(vert[:, 2]) > vzmax:
-            vzmax = np.max(vert[:, 2])
-    return [vxmin, vxmax, vymin, vymax, vzmin, vzmax]
-
-
-def _get_fibre_image(network, cpores, vox_len, fibre_rad):
+def _get_fibre_image(network, cpores, vox_len, fibre_rad, chunk_len=100,
+                     memmap_dir=None):
     r"""
-    Produce image by filling in voxels along throat edges using Bresenham line
+    Produce image by filling in voxels along throat edges using _line_voxels
     Then performing distance transform on fibre voxels to erode the pore space
+
+    The distance transform is performed on cubic tiles of ``chunk_len`` voxels,
+    each padded by a halo wide enough to contain every fibre voxel within
+    ``fibre_rad`` of the tile, so the result is identical to transforming the
+    whole domain at once but only the output image is ever held at full size.
+    If ``memmap_dir`` is given the output image is a memory mapped file in that
+    directory.
     """
 
     cthroats = network.find_neighbor_throats(pores=cpores)
-
-    # Below method copied from geometry model throat.vertices
-    # Needed now as network may not have all throats assigned to geometry
-    # i.e network['throat.vertices'] could return garbage
-    verts = _sp.ndarray(network.num_throats(), dtype=object)
-    for i in range(len(verts)):
-        verts[i] = _sp.asarray(list(network["throat.vert_index"][i].values()))
-    cverts = verts[cthroats]
-    [vxmin, vxmax, vymin, vymax, vzmin, vzmax] = _get_vertex_range(cverts)
+    # Network may not have all throats assigned to geometry i.e.
+    # network['throat.vertices'] could return garbage
+    indptr, cverts = vo.vertex_csr(network, 'throat', cthroats)
+    vmin = np.amin(cverts, axis=0)
+    vmax = np.amax(cverts, axis=0)
     # Translate vertices so that minimum occurs at the origin
-    for index in range(len(cverts)):
-        cverts[index] -= np.array([vxmin, vymin, vzmin])
+    cverts = cverts - vmin
     # Find new size of image array
-    cdomain = np.around(np.array([(vxmax-vxmin),
-                                  (vymax-vymin),
-                                  (vzmax-vzmin)]), 6)
+    cdomain = np.around(vmax - vmin, 6)
     logger.info("Creating fibre domain range: " + str(np.around(cdomain, 5)))
-    lx = np.int(np.around(cdomain[0]/vox_len)+1)
-    ly = np.int(np.around(cdomain[1]/vox_len)+1)
-    lz = np.int(np.around(cdomain[2]/vox_len)+1)
-    # Try to create all the arrays we will need at total domain size
-    try:
-        pore_space = np.ones([lx, ly, lz], dtype=np.uint8)
-        fibre_space = np.zeros(shape=[lx, ly, lz], dtype=np.uint8)
-        dt = np.zeros([lx, ly, lz], dtype=float)
-        # Only need one chunk
-        cx = cy = cz = 1
-        chunk_len = np.max(np.shape(pore_space))
-    except:
-        logger.info("Domain too large to fit into memory so chunking domain"
-                    "to process image, this may take some time")
-        # Do chunking
-        chunk_len = 100
-        if (lx > chunk_len):
-            cx = np.ceil(lx/chunk_len).astype(int)
+    shape = tuple(np.around(cdomain/vox_len).astype(int) + 1)
+    fibre_space = _empty_image(shape, np.uint8, memmap_dir)
+
+    # Get image of the fibres, sorted along x so those near each tile are
+    # found quickly
+    line_ints = _line_voxels(indptr, cverts, vox_len, shape)
+
+    halo = int(np.ceil(fibre_rad)) + 1
+    corners = list(itertools.product(*[range(0, l, chunk_len) for l in shape]))
+    for cnum, corner in enumerate(corners):
+        logger.debug("Processing Fibre Chunk: " + str(cnum + 1) + " of " +
+                     str(len(corners)))
+        corner = np.array(corner)
+        stop = np.minimum(corner + chunk_len, shape)
+        lo = np.maximum(corner - halo, 0)
+        hi = np.minimum(stop + halo, shape)
+        i0, i1 = np.searchsorted(line_ints[:, 0], [lo[0], hi[0]])
+        pts = line_ints[i0:i1]
+        pts = pts[np.all((pts >= lo)*(pts < hi), axis=1)] - lo
+        pore_space = np.ones(hi - lo, dtype=np.uint8)
+        pore_space[pts[:, 0], pts[:, 1], pts[:, 2]] = 0
+        core = tuple(slice(a, b) for a, b in zip(corner - lo, stop - lo))
+        if len(pts) > 0:
+            dt = ndimage.distance_transform_edt(pore_space)
+            chunk = (dt[core] > fibre_rad).astype(np.uint8)
         else:
-            cx = 1
-        if (ly > chunk_len):
-            cy = np.ceil(ly/chunk_len).astype(int)
-        else:
-            cy = 1
-        if (lz > chunk_len):
-            cz = np.ceil(lz/chunk_len).astype(int)
-        else:
-            cz = 1
-
-    # Get image of the fibres
-    line_points = bresenham(cverts, vox_len/2)
-    line_ints = (np.around((line_points/vox_len), 0)).astype(int)
-    for x, y, z in line_ints:
-        try:
-            pore_space[x][y][z] = 0
-        except IndexError:
+            # No fibres within reach of this tile
+            chunk = pore_space[core]
+        fibre_space[tuple(slice(a, b) for a, b in zip(corner, stop))] = chunk
+    return fibre_space
+
+
+def _empty_image(shape, dtype, memmap_dir=None, fill=None):
+    r"""
+    Allocate an image in memory, or as a memory mapped temporary file in
+    ``memmap_dir`` which is removed once the image is no longer referenced
+    """
+    if memmap_dir is None:
+        image = np.empty(shape, dtype=dtype)
+    else:
+        image = np.memmap(tempfile.TemporaryFile(dir=memmap_dir), dtype=dtype,
+                          mode='w+', shape=shape)
+    if fill is not None:
+        image[...] = fill
+    return image
+
+
+def _line_voxels(indptr, verts, vox_len, shape):
+    r"""
+    Find the voxels lying along the edges of all faces at once
+
+    Parameters
+    ----------
+    indptr, verts : array_like
+        The vertices of each face in the ragged CSR layout returned by
+        ``vertexops.vertex_csr``
+    vox_len : float
+        The edge length of a voxel
+    shape : tuple
+        The shape of the image, voxels outside of which are discarded
+
+    Returns
+    -------
+    An (N, 3) array of the unique voxel indices, sorted by x then y then z
+
+    Notes
+    -----
+    The vertices of each face are put in order around the face by their angle
+    about its mean, in the plane of the two axes with the largest spread.  Each
+    edge is then sampled at intervals of half a voxel in the same way as
+    ``bresenham``, and the voxels are made unique by packing their indices
+    into a single integer key.  The sample points only differ from those of
+    ``bresenham`` by round-off, where that has traversed an edge in the
+    opposite direction.  The edges are processed in blocks to limit the memory
+    used by the sample points.
+    """
+    counts = np.diff(indptr)
+    N = len(counts)
+    if indptr[-1] == 0:
+        return np.zeros([0, 3], dtype=int)
+    ids = np.repeat(np.arange(N), counts)
+    # Find the axis with the smallest spread in each face and remove it
+    mean = np.vstack([np.bincount(ids, verts[:, i], minlength=N)
+                      for i in range(3)]).T/np.maximum(counts, 1)[:, None]
+    std = np.sqrt(np.vstack([np.bincount(ids, (verts[:, i] - mean[ids, i])**2,
+                                         minlength=N)
+                             for i in range(3)]).T/np.maximum(counts, 1)[:, None])
+    drop = np.where((std[:, 0] < std[:, 1])*(std[:, 0] < std[:, 2]), 0,
+                    np.where((std[:, 1] < std[:, 0])*(std[:, 1] < std[:, 2]),
+                             1, 2))
+    keep = np.array([[1, 2], [0, 2], [0, 1]])[drop]
+    rel = verts - mean[ids]
+    a = rel[np.arange(len(ids)), keep[ids, 0]]
+    b = rel[np.arange(len(ids)), keep[ids, 1]]
+    # Counter-clockwise order around each face
+    order = np.lexsort((np.arctan2(b, a), ids))
+    ids = ids[order]
+    face = np.around(verts[order], 6)
+    starts = np.where(np.concatenate(([True], ids[1:] != ids[:-1])))[0]
+    ends = np.concatenate((starts[1:], [len(ids)])) - 1
+    prv = np.arange(-1, len(ids) - 1)
+    prv[starts] = ends
+    # Sample each edge from the previous vertex to the current one
+    vec = face - face[prv]
+    num = np.ceil(np.linalg.norm(vec, axis=1)/(vox_len/2)).astype(int)
+    step = 1.0/np.maximum(num - 1, 1)
+    shape = np.array(shape)
+    keys = []
+    block = np.concatenate(([0], np.cumsum(num)))
+    edges = np.arange(len(num))
+    while len(edges) > 0:
+        # Take as many edges as keep the number of points below a limit
+        n = max(1, np.searchsorted(block[edges + 1] - block[edges[0]], 2**22,
+                                   side='right'))
+        e = edges[:n]
+        edges = edges[n:]
+        e_num = num[e]
+        e_ptr = np.concatenate(([0], np.cumsum(e_num)))
+        edge = np.repeat(e, e_num)
+        k = np.arange(e_ptr[-1]) - np.repeat(e_ptr[:-1], e_num)
+        t = k*step[edge]
+        t[(k == num[edge] - 1)*(num[edge] > 1)] = 1.0
+        points = face[prv[edge]] + vec[edge]*t[:, np.newaxis]
+        ints = np.around(points/vox_len, 0).astype(int)
+        inside = np.all((ints >= 0)*(ints < shape), axis=1)
+        if not np.all(inside):
             logger.warning("Some elements in image processing are out" +
                            "of bounds")
-
-    num_chunks = np.int(cx*cy*cz)
-    cnum = 1
-    for ci in range(cx):
-        for cj in range(cy):
-            for ck in range(cz):
-                # Work out chunk range
-                logger.info("Processing Fibre Chunk: "+str(cnum)+" of " +
-                            str(num_chunks))
-                cxmin = ci*chunk_len
-                cxmax = np.int(np.ceil((ci+1)*chunk_len + 5*fibre_rad))
-                cymin = cj*chunk_len
-                cymax = np.int(np.ceil((cj+1)*chunk_len + 5*fibre_rad))
-                czmin = ck*chunk_len
-                czmax = np.int(np.ceil((ck+1)*chunk_len + 5*fibre_rad))
-                # Don't overshoot
-                if cxmax > lx:
-                    cxmax = lx
-                if cymax > ly:
-                    cymax = ly
-                if czmax > lz:
-                    czmax = lz
-                dt = ndimage.distance_transform_edt(pore_space[cxmin:cxmax,
-                                                               cymin:cymax,
-                                                               czmin:czmax])
-                fibre_space[cxmin:cxmax,
-                            cymin:cymax,
-                            czmin:czmax][dt <= fibre_rad] = 0
-                fibre_space[cxmin:cxmax,
-                            cymin:cymax,
-                            czmin:czmax][dt > fibre_rad] = 1
-                del dt
-                cnum += 1
-    del pore_space
-    return fibre_space
+        ints = ints[inside]
+        keys.append(np.unique((ints[:, 0]*shape[1] + ints[:, 1])*shape[2] +
+                              ints[:, 2]))
+    keys = np.unique(np.concatenate(keys))
+    voxels = np.column_stack((keys//(shape[1]*shape[2]),
+                              (keys//shape[2]) % shape[1],
+                              keys % shape[2]))
+    return voxels
 
 
 def bresenham(faces, dx):
@@ -302,63 +342,32 @@ def _get_hull_volume(points):
     except _sp.spatial.qhull.QhullError:
         logger.error("Volume suspect for points: " + str(points))
     # We only want points included in the convex hull to calculate the centroid
-    hull_centroid = _sp.array([points[:, 0].mean(),
-                               points[:, 1].mean(),
-                               points[:, 2].mean()])
-    hull_volume = 0.0
-    pyramid_COMs = []
-    for ia, ib, ic in tri.convex_hull:
-        # Points making each triangular face
-        # Collection of co-ordinates of each point in this face
-        face_x = points[[ia, ib, ic]][:, 0]
-        face_y = points[[ia, ib, ic]][:, 1]
-        face_z = points[[ia, ib, ic]][:, 2]
-        # Average of each co-ordinate is the centroid of the face
-        face_centroid = [face_x.mean(), face_y.mean(), face_z.mean()]
-        face_centroid_vector = face_centroid - hull_centroid
-        # Vectors of the sides of the face used to find normal vector and area
-        vab = points[ib] - points[ia]
-        vac = points[ic] - points[ia]
-        vbc = points[ic] - points[ib]
-        # As vectors are co-planar the cross-product will produce the normal
-        # vector of the face
-        face_normal = _sp.cross(vab, vac)
-        try:
-            face_unit_normal = face_normal/_sp.linalg.norm(face_normal)
-        except RuntimeWarning:
-            logger.error('Pore Volume Error:' + str(vab) + ' ' + str(vac))
-        """
-        As triangles are orientated randomly in 3D we could either transform
-        co-ordinates to align with a plane and perform 2D operations to work
-        out the area or we could work out the lengths of each side and use
-        Heron's formula which is easier. Using Delaunay traingulation will
-        always produce triangular faces but if dealing with other polygons
-        co-ordinate transfer may be necessary
-        """
-        a = _sp.linalg.norm(vab)
-        b = _sp.linalg.norm(vbc)
-        c = _sp.linalg.norm(vac)
-        # Semiperimeter
-        s = 0.5*(a + b + c)
-        face_area = _sp.sqrt(s*(s-a)*(s-b)*(s-c))
-        # Now the volume of the pyramid section defined by the 3 face points
-        # and the hull centroid can be calculated "
-        pyramid_volume = _sp.absolute(_sp.dot(face_centroid_vector,
-                                              face_unit_normal)*face_area/3)
-        # Each pyramid is summed together to calculate the total volume
-        hull_volume += pyramid_volume
-        # The Centre of Mass will not be the same as the geometrical centroid.
-        # Weighted adjustment is calculated from pyramid centroid and volume.
-        vha = points[ia] - hull_centroid
-        vhb = points[ib] - hull_centroid
-        vhc = points[ic] - hull_centroid
-        pCOM = ((vha+vhb+vhc)/4)*pyramid_volume
-        pyramid_COMs.append(pCOM)
+    hull_centroid = _sp.mean(points, axis=0)
+    # Points making each triangular face of the hull
+    pa, pb, pc = [points[i] for i in tri.convex_hull.T]
+    # Vectors of the sides of the face used to find normal vector and area
+    vab = pb - pa
+    vac = pc - pa
+    # As vectors are co-planar the cross-product produces the normal vector of
+    # the face, and its magnitude is twice the area of the triangle
+    face_normal = _sp.cross(vab, vac)
+    face_area = 0.5*_sp.linalg.norm(face_normal, axis=1)
+    with _sp.errstate(invalid='ignore', divide='ignore'):
+        face_unit_normal = face_normal/(2*face_area[:, _sp.newaxis])
+    # Now the volume of the pyramid section defined by the 3 face points and
+    # the hull centroid can be calculated
+    face_centroid_vector = (pa + pb + pc)/3 - hull_centroid
+    pyramid_volume = _sp.absolute(_sp.sum(face_centroid_vector*face_unit_normal,
+                                          axis=1)*face_area/3)
+    # Each pyramid is summed together to calculate the total volume
+    hull_volume = _sp.sum(pyramid_volume)
     if _sp.isnan(hull_volume):
         hull_volume = 0.0
     if hull_volume > 0:
-        hull_COM = hull_centroid + _sp.mean(_sp.asarray(pyramid_COMs),
-                                            axis=0) / hull_volume
+        # The Centre of Mass will not be the same as the geometrical centroid.
+        # Weighted adjustment is calculated from pyramid centroid and volume.
+        pCOM = ((pa + pb + pc - 3*hull_centroid)/4)*pyramid_volume[:, _sp.newaxis]
+        hull_COM = hull_centroid + _sp.mean(pCOM, axis=0)/hull_volume
     else:
         hull_COM = hull_centroid
 
@@ -372,29 +381,36 @@ def voronoi(network, geometry, **kwargs):
     volume.
     """
     pores = geometry.map_pores(network, geometry.pores())
+    throats = geometry.map_throats(network, geometry.throats())
     Np = len(pores)
     volume = _sp.zeros(Np)
     com = _sp.zeros([Np, 3])
-    for i in range(Np):
-        throat_vert_list = []
-        net_throats = network.find_neighbor_throats([pores[i]])
-        geom_throats = network.map_throats(target=geometry,
-                                           throats=net_throats,
-                                           return_mapping=True)['target']
-        if len(geom_throats) > 1:
-            for throat in geom_throats:
-                geom_throat_verts = geometry["throat.offset_vertices"][throat]
-                if geom_throat_verts is not None:
-                    for j in range(len(geom_throat_verts)):
-                        throat_vert_list.append(geom_throat_verts[j])
-            throat_array = _sp.asarray(throat_vert_list)
-            if len(throat_array) > 4:
-                volume[i], com[i] = _get_hull_volume(throat_array)
-            else:
-                volume[i] = 0
-        elif len(geom_throats) == 1 and 'throat.centroid' in geometry.props():
-                com[i] = geometry['throat.centroid'][geom_throats]
-                volume[i] = 0
+    # Pair each geometry throat with the geometry pores at either end, sorted
+    # by pore so that the throats of each pore are contiguous
+    pmap = -_sp.ones(network.num_pores(), dtype=int)
+    pmap[pores] = _sp.arange(Np)
+    P = pmap[network['throat.conns'][throats]].ravel()
+    T = _sp.repeat(_sp.arange(len(throats)), 2)
+    keep = P >= 0
+    order = _sp.argsort(P[keep], kind='mergesort')
+    P = P[keep][order]
+    T = T[keep][order]
+    num_throats = _sp.bincount(P, minlength=Np)
+    # Gather the offset vertices of the throats of each pore in CSR layout
+    t_ptr, t_verts = vo.objects_to_csr(geometry['throat.offset_vertices'])
+    lengths = _sp.diff(t_ptr)[T]
+    entry_ptr = _sp.concatenate(([0], _sp.cumsum(lengths)))
+    ind = _sp.repeat(t_ptr[T] - entry_ptr[:-1], lengths) + \
+        _sp.arange(entry_ptr[-1])
+    p_verts = t_verts[ind]
+    counts = _sp.bincount(P, weights=lengths, minlength=Np)
+    indptr = _sp.concatenate(([0], _sp.cumsum(counts))).astype(int)
+    for i in _sp.where((num_throats > 1) * (counts > 4))[0]:
+        volume[i], com[i] = _get_hull_volume(p_verts[indptr[i]:indptr[i+1]])
+    if 'throat.centroid' in geometry.props():
+        single = _sp.where(num_throats == 1)[0]
+        first = _sp.concatenate(([0], _sp.cumsum(num_throats)))[single]
+        com[single] = geometry['throat.centroid'][T[first]]
     # Find any pores with centroids at origin and use the mean of the pore
     # vertices.  Not doing this messes up hydraulic conductances using centre
     # to centre
@@ -407,10 +423,23 @@ def voronoi(network, geometry, **kwargs):
     return volume
 
 
-def in_hull_volume(network, geometry, fibre_rad, vox_len=1e-6, **kwargs):
+def in_hull_volume(network, geometry, fibre_rad, vox_len=1e-6, chunk_len=100,
+                   memmap_dir=None, **kwargs):
     r"""
     Work out the voxels inside the convex hull of the voronoi vertices of each
     pore
+
+    Parameters
+    ----------
+    fibre_rad : float
+        The radius of the fibres placed along the Voronoi edges
+    vox_len : float
+        The edge length of a voxel
+    chunk_len : int
+        The edge length in voxels of the tiles used to create the fibre image
+    memmap_dir : string
+        If given, the full size fibre and hull images are stored as memory
+        mapped temporary files in this directory rather than in RAM
     """
     Np = network.num_pores()
     geom_pores = geometry.map_pores(network, geometry.pores())
@@ -427,17 +456,22 @@ def in_hull_volume(network, geometry, fibre_rad, vox_len=1e-6, **kwargs):
     fibre_rad = np.around((fibre_rad-(vox_len/2))/vox_len, 0).astype(int)
 
     # Get the fibre image
-    fibre_image = _get_fibre_image(network, geom_pores, vox_len, fibre_rad)
+    fibre_image = _get_fibre_image(network, geom_pores, vox_len, fibre_rad,
+                                   chunk_len=chunk_len, memmap_dir=memmap_dir)
     # Save as private variables
     geometry._fibre_image = fibre_image
-    hull_image = np.ones_like(fibre_image, dtype=np.uint16)*-1
+    # Label the hulls with the smallest type holding every pore index as
+    # well as the largest value, which marks voxels outside any hull
+    dtype = np.promote_types(np.uint16, np.min_scalar_type(Np))
+    hull_image = _empty_image(np.shape(fibre_image), dtype, memmap_dir,
+                              fill=np.iinfo(dtype).max)
     geometry._hull_image = hull_image
-    for pore in nbps:
-        logger.info("Processing Pore: "+str(pore+1)+" of "+str(len(nbps)))
-        verts = np.asarray([i for i in network["pore.vert_index"][pore].values()])
-        verts = np.asarray(misc.unique_list(np.around(verts, 6)))
-        verts /= vox_len
-        pore_vox[pore], fibre_vox[pore] = inhull(geometry, verts, pore)
+    logger.info("Processing " + str(len(nbps)) + " pores")
+    indptr, verts = vo.vertex_csr(network, 'pore', nbps)
+    for i, pore in enumerate(nbps):
+        pverts = np.unique(np.around(verts[indptr[i]:indptr[i+1]], 6), axis=0)
+        pverts /= vox_len
+        pore_vox[pore], fibre_vox[pore] = inhull(geometry, pverts, pore)
 
     volume = pore_vox*voxel
     geometry["pore.fibre_voxels"] = fibre_vox[geom_pores]
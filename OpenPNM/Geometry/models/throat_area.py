@@ -6,7 +6,6 @@ Submodule -- throat_area
 """
 import scipy as _sp
 import OpenPNM.Utilities.vertexops as vo
-from scipy.spatial import ConvexHull
 
 
 def cylinder(geometry, throat_diameter='throat.diameter', **kwargs):
@@ -53,18 +52,6 @@ def voronoi(geometry, **kwargs):
     r"""
     Use the Voronoi verts and throat normals to work out the area
     """
-    Nt = geometry.num_throats()
-    verts = geometry['throat.offset_vertices']
-    normals = geometry['throat.normal']
-    area = _sp.ndarray(Nt)
-    for i in range(Nt):
-        if len(verts[i]) > 2:
-            verts_2D = vo.rotate_and_chop(verts[i], normals[i], [0, 0, 1])
-            # Get in hull order
-            hull = ConvexHull(verts_2D, qhull_options='QJ Pp')
-            verts_2D = verts_2D[hull.vertices]
-            area[i] = vo.PolyArea2D(verts_2D)
-        else:
-            area[i] = 0.0
-
+    indptr, verts = vo.objects_to_csr(geometry['throat.offset_vertices'])
+    area = vo.csr_polygon_area(indptr, verts, geometry['throat.normal'])
     return area
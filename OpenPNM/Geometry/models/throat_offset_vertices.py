@@ -5,170 +5,69 @@ throat_offset_vertices -- Offeset throat vertices using a fibre radius parameter
 
 """
 import scipy as sp
+import numpy as np
 from transforms3d import _gohlketransforms as tr
 from OpenPNM.Base import logging
 logger = logging.getLogger(__name__)
 
 
-def distance_transform(network, geometry, offset, **kwargs):
+def distance_transform(network, geometry, offset, method='image',
+                       num_processes=1, **kwargs):
     r"""
     Use the Voronoi vertices and perform image analysis to obtain throat properties
-    """
 
-    import math
-    import numpy as np
-    from skimage.morphology import convex_hull_image
-    from skimage.measure import regionprops
-    from scipy import ndimage
+    Parameters
+    ----------
+    offset : float
+        The distance to erode each throat facet by, usually the fibre radius
+    method : string
+        The default 'image' rasterizes each facet and erodes it with a distance
+        transform.  'analytic' moves the edges of each convex facet inwards
+        exactly, falling back to the image method for any facet that is not
+        convex.
+    num_processes : int
+        The number of worker processes to share the throats between.  The
+        default of 1 processes all throats in the current process.  On
+        platforms that spawn rather than fork new processes the calling script
+        must be protected by an ``if __name__ == '__main__':`` block.
 
+    Notes
+    -----
+    With the 'analytic' method the area, perimeter, centroid and incircle of
+    the offset polygon are calculated exactly rather than from pixel counts,
+    so they differ slightly from those of the 'image' method.
+    """
+    if method not in ['image', 'analytic']:
+        raise Exception('Unrecognized method: ' + str(method))
     Nt = geometry.num_throats()
+    vertices = geometry['throat.vertices']
+    normals = geometry['throat.normal']
+    logger.info('Offsetting the vertices of ' + str(Nt) + ' throats')
+    args = [(vertices[i], normals[i], offset, method) for i in range(Nt)]
+    if num_processes > 1 and Nt > 0:
+        import multiprocessing
+        # Hand the throats to the workers in a few chunks each to limit the
+        # communication overhead
+        chunksize = int(sp.ceil(Nt/(4*num_processes)))
+        pool = multiprocessing.Pool(processes=num_processes)
+        try:
+            results = pool.map(_offset_throat, args, chunksize=chunksize)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_offset_throat(arg) for arg in args]
+
+    eroded_verts = sp.ndarray(Nt, dtype=object)
     area = sp.zeros(Nt)
     perimeter = sp.zeros(Nt)
     centroid = sp.zeros([Nt, 3])
     incentre = sp.zeros([Nt, 3])
     inradius = sp.zeros(Nt)
     equiv_diameter = sp.zeros(Nt)
-    eroded_verts = sp.ndarray(Nt, dtype=object)
-
-    res = 200
-    vertices = geometry['throat.vertices']
-    normals = geometry['throat.normal']
-    z_axis = [0, 0, 1]
-
-    for i in range(Nt):
-        logger.info("Processing throat " + str(i+1)+" of "+str(Nt))
-        # For boundaries some facets will already be aligned with the axis - if this
-        # is the case a rotation is unnecessary and could also cause problems
-        angle = tr.angle_between_vectors(normals[i], z_axis)
-        if angle == 0.0 or angle == np.pi:
-            # We are already aligned
-            rotate_facet = False
-            facet = vertices[i]
-        else:
-            rotate_facet = True
-            M = tr.rotation_matrix(tr.angle_between_vectors(normals[i], z_axis),
-                                   tr.vector_product(normals[i], z_axis))
-            facet = np.dot(vertices[i], M[:3, :3].T)
-        x = facet[:, 0]
-        y = facet[:, 1]
-        z = facet[:, 2]
-        # Get points in 2d for image analysis
-        pts = np.column_stack((x, y))
-        # Translate points so min sits at the origin
-        translation = [pts[:, 0].min(), pts[:, 1].min()]
-        pts -= translation
-        order = np.int(math.ceil(-np.log10(np.max(pts))))
-        # Normalise and scale the points so that largest span equals the resolution
-        # to save on memory and create clear image"
-        max_factor = np.max([pts[:, 0].max(), pts[:, 1].max()])
-        f = res/max_factor
-        # Scale the offset and define a circular structuring element with radius
-        r = f*offset
-        # Only proceed if r is less than half the span of the image"
-        if r <= res/2:
-            pts *= f
-            minp1 = pts[:, 0].min()
-            minp2 = pts[:, 1].min()
-            maxp1 = pts[:, 0].max()
-            maxp2 = pts[:, 1].max()
-            img = np.zeros([np.int(math.ceil(maxp1-minp1)+1),
-                            np.int(math.ceil(maxp2-minp2)+1)])
-            int_pts = np.around(pts, 0).astype(int)
-            for pt in int_pts:
-                img[pt[0]][pt[1]] = 1
-            # Pad with zeros all the way around the edges
-            img_pad = np.zeros([np.shape(img)[0] + 2, np.shape(img)[1] + 2])
-            img_pad[1:np.shape(img)[0]+1, 1:np.shape(img)[1]+1] = img
-
-            # All points should lie on this plane but could be some rounding errors
-            # so use the order parameter
-            z_plane = sp.unique(np.around(z, order+2))
-            if len(z_plane) > 1:
-                logger.error('Rotation for image analysis failed')
-                temp_arr = np.ones(1)
-                temp_arr.fill(np.mean(z_plane))
-                z_plane = temp_arr
-            "Fill in the convex hull polygon"
-            convhullimg = convex_hull_image(img_pad)
-            # Perform a Distance Transform and black out points less than r to create
-            # binary erosion. This is faster than performing an erosion and dt can
-            # also be used later to find incircle"
-            eroded = ndimage.distance_transform_edt(convhullimg)
-            eroded[eroded <= r] = 0
-            eroded[eroded > r] = 1
-            # If we are left with less than 3 non-zero points then the throat is
-            # fully occluded
-            if np.sum(eroded) >= 3:
-                # Do some image analysis to extract the key properties
-                regions = regionprops(eroded[1:np.shape(img)[0]+1,
-                                             1:np.shape(img)[1]+1].astype(int))
-                # Change this to cope with genuine multi-region throats
-                if len(regions) == 1:
-                    for props in regions:
-                        x0, y0 = props.centroid
-                        equiv_diameter[i] = props.equivalent_diameter
-                        area[i] = props.area
-                        perimeter[i] = props.perimeter
-                        coords = props.coords
-                    # Undo the translation, scaling and truncation on the centroid
-                    centroid2d = [x0, y0]/f
-                    centroid2d += (translation)
-                    centroid3d = np.concatenate((centroid2d, z_plane))
-                    # Distance transform the eroded facet to find the incentre and
-                    # inradius
-                    dt = ndimage.distance_transform_edt(eroded)
-                    inx0, iny0 = \
-                        np.asarray(np.unravel_index(dt.argmax(), dt.shape)) \
-                          .astype(float)
-                    incentre2d = [inx0, iny0]
-                    # Undo the translation, scaling and truncation on the incentre
-                    incentre2d /= f
-                    incentre2d += (translation)
-                    incentre3d = np.concatenate((incentre2d, z_plane))
-                    # The offset vertices will be those in the coords that are
-                    # closest to the originals"
-                    offset_verts = []
-                    for pt in int_pts:
-                        vert = np.argmin(np.sum(np.square(coords-pt), axis=1))
-                        if vert not in offset_verts:
-                            offset_verts.append(vert)
-                    # If we are left with less than 3 different vertices then the
-                    # throat is fully occluded as we can't make a shape with
-                    # non-zero area
-                    if len(offset_verts) >= 3:
-                        offset_coords = coords[offset_verts].astype(float)
-                        # Undo the translation, scaling and truncation on the
-                        # offset_verts
-                        offset_coords /= f
-                        offset_coords_3d = \
-                            np.vstack((offset_coords[:, 0]+translation[0],
-                                       offset_coords[:, 1]+translation[1],
-                                       np.ones(len(offset_verts))*z_plane)).T
-
-                        # Get matrix to un-rotate the co-ordinates back to the
-                        # original orientation if we rotated in the first place
-                        if rotate_facet:
-                            MI = tr.inverse_matrix(M)
-                            # Unrotate the offset coordinates
-                            incentre[i] = np.dot(incentre3d, MI[:3, :3].T)
-                            centroid[i] = np.dot(centroid3d, MI[:3, :3].T)
-                            eroded_verts[i] = np.dot(offset_coords_3d, MI[:3, :3].T)
-
-                        else:
-                            incentre[i] = incentre3d
-                            centroid[i] = centroid3d
-                            eroded_verts[i] = offset_coords_3d
-
-                        inradius[i] = dt.max()
-                        # Undo scaling on other parameters
-                        area[i] /= f*f
-                        perimeter[i] /= f
-                        equiv_diameter[i] /= f
-                        inradius[i] /= f
-                    else:
-                        area[i] = 0
-                        perimeter[i] = 0
-                        equiv_diameter[i] = 0
+    for i, result in enumerate(results):
+        eroded_verts[i], area[i], perimeter[i], centroid[i], incentre[i], \
+            inradius[i], equiv_diameter[i] = result
 
     if kwargs['set_dependent'] is True:
         geometry['throat.area'] = area
@@ -179,3 +78,261 @@ def distance_transform(network, geometry, offset, **kwargs):
         geometry['throat.incentre'] = incentre
 
     return eroded_verts
+
+
+def _offset_throat(args):
+    r"""
+    Offset a single throat facet with the requested method, returning a tuple
+    of the offset vertices, area, perimeter, centroid, incentre, inradius and
+    equivalent diameter.  Defined at module level so it can be sent to worker
+    processes.
+    """
+    vertices, normal, offset, method = args
+    result = None
+    if method == 'analytic':
+        result = _offset_facet_analytic(vertices, normal, offset)
+    if result is None:
+        result = _offset_facet_image(vertices, normal, offset)
+    return result
+
+
+def _occluded():
+    r"""
+    The result for a throat that is fully occluded by the offset
+    """
+    return None, 0.0, 0.0, sp.zeros(3), sp.zeros(3), 0.0, 0.0
+
+
+def _rotate_facet(vertices, normal):
+    r"""
+    Rotate the facet so that its normal is aligned with the z axis, returning
+    the rotated vertices and the rotation matrix, or None if the facet was
+    already aligned.  For boundaries some facets will already be aligned with
+    the axis - if this is the case a rotation is unnecessary and could also
+    cause problems.
+    """
+    z_axis = [0, 0, 1]
+    angle = tr.angle_between_vectors(normal, z_axis)
+    if angle == 0.0 or angle == sp.pi:
+        return sp.asarray(vertices, dtype=float), None
+    M = tr.rotation_matrix(angle, tr.vector_product(normal, z_axis))
+    return sp.dot(vertices, M[:3, :3].T), M
+
+
+def _unrotate(points, M):
+    r"""
+    Undo the rotation applied by ``_rotate_facet``
+    """
+    if M is None:
+        return points
+    MI = tr.inverse_matrix(M)
+    return sp.dot(points, MI[:3, :3].T)
+
+
+def _offset_facet_analytic(vertices, normal, offset):
+    r"""
+    Offset the edges of a convex facet inwards by the offset distance by
+    clipping its convex hull with each of the shifted edges in turn.  Returns
+    None if the facet is not convex, so that the image method can be used.
+    """
+    from scipy.spatial import ConvexHull
+
+    facet, M = _rotate_facet(vertices, normal)
+    pts = facet[:, :2]
+    z_plane = sp.mean(facet[:, 2])
+    span = sp.amax(sp.ptp(pts, axis=0))
+    try:
+        hull = ConvexHull(pts)
+    except Exception:
+        return None
+    # Unit outward normals and offsets of each edge in counter-clockwise order
+    # around the hull, with n.x + d <= 0 inside
+    ring = pts[hull.vertices]
+    edges = sp.roll(ring, -1, axis=0) - ring
+    n = sp.column_stack((edges[:, 1], -edges[:, 0]))
+    n /= sp.sqrt(sp.sum(n**2, axis=1))[:, sp.newaxis]
+    d = -sp.sum(n*ring, axis=1)
+    # Any point lying inside the hull means the facet is not convex
+    depth = sp.amin(-(sp.dot(pts, n.T) + d), axis=1)
+    if sp.any(depth > 1e-6*span):
+        return None
+    poly = ring
+    for ni, di in zip(n, d + offset):
+        if len(poly) == 0:
+            break
+        dist = sp.dot(poly, ni) + di
+        nxt = sp.roll(sp.arange(len(poly)), -1)
+        clipped = []
+        for j, k in zip(range(len(poly)), nxt):
+            if dist[j] <= 0:
+                clipped.append(poly[j])
+            if dist[j]*dist[k] < 0:
+                t = dist[j]/(dist[j] - dist[k])
+                clipped.append(poly[j] + t*(poly[k] - poly[j]))
+        poly = sp.array(clipped).reshape(-1, 2)
+    if len(poly) < 3:
+        return _occluded()
+    x, y = poly.T
+    xn, yn = sp.roll(x, -1), sp.roll(y, -1)
+    cross = x*yn - xn*y
+    area = 0.5*sp.sum(cross)
+    if area <= (1e-6*span)**2:
+        return _occluded()
+    perimeter = sp.sum(sp.sqrt((xn - x)**2 + (yn - y)**2))
+    centroid2d = [sp.sum((x + xn)*cross), sp.sum((y + yn)*cross)]
+    centroid2d = sp.array(centroid2d)/(6*area)
+    # Offsetting all edges equally leaves the incentre unchanged
+    try:
+        incentre2d, inradius = _incircle(n, d)
+    except np.linalg.LinAlgError:
+        return None
+    inradius -= offset
+    centroid = _unrotate(sp.append(centroid2d, z_plane), M)
+    incentre = _unrotate(sp.append(incentre2d, z_plane), M)
+    offset_verts = _unrotate(sp.column_stack((poly, sp.ones(len(poly))*z_plane)),
+                             M)
+    equiv_diameter = sp.sqrt(4*area/sp.pi)
+    return offset_verts, area, perimeter, centroid, incentre, inradius, \
+        equiv_diameter
+
+
+def _incircle(n, d):
+    r"""
+    Find the centre and radius of the largest circle inside a convex polygon,
+    given the unit outward normals and offsets of its edges in order.  As the
+    edges are moved inwards each one vanishes at the distance where it and its
+    two neighbours touch a common circle, so the first to vanish is removed
+    repeatedly until only the triangle containing the incircle remains.
+    """
+    while True:
+        m = len(d)
+        prv = sp.roll(sp.arange(m), 1)
+        nxt = sp.roll(sp.arange(m), -1)
+        A = sp.ones([m, 3, 3])
+        A[:, 0, :2] = n[prv]
+        A[:, 1, :2] = n
+        A[:, 2, :2] = n[nxt]
+        b = -sp.column_stack((d[prv], d, d[nxt]))
+        sol = np.linalg.solve(A, b[:, :, sp.newaxis])[:, :, 0]
+        if m <= 3:
+            return sol[0, :2], sol[0, 2]
+        keep = sp.arange(m) != sp.argmin(sol[:, 2])
+        n, d = n[keep], d[keep]
+
+
+def _offset_facet_image(vertices, normal, offset, res=200):
+    r"""
+    Rasterize a facet and erode it with a distance transform to find the
+    offset vertices and the properties of the eroded shape
+    """
+    import math
+    from skimage.morphology import convex_hull_image
+    from skimage.measure import regionprops
+    from scipy import ndimage
+
+    facet, M = _rotate_facet(vertices, normal)
+    x = facet[:, 0]
+    y = facet[:, 1]
+    z = facet[:, 2]
+    # Get points in 2d for image analysis
+    pts = np.column_stack((x, y))
+    # Translate points so min sits at the origin
+    translation = [pts[:, 0].min(), pts[:, 1].min()]
+    pts -= translation
+    order = np.int(math.ceil(-np.log10(np.max(pts))))
+    # Normalise and scale the points so that largest span equals the resolution
+    # to save on memory and create clear image"
+    max_factor = np.max([pts[:, 0].max(), pts[:, 1].max()])
+    f = res/max_factor
+    # Scale the offset and define a circular structuring element with radius
+    r = f*offset
+    # Only proceed if r is less than half the span of the image"
+    if r <= res/2:
+        pts *= f
+        minp1 = pts[:, 0].min()
+        minp2 = pts[:, 1].min()
+        maxp1 = pts[:, 0].max()
+        maxp2 = pts[:, 1].max()
+        img = np.zeros([np.int(math.ceil(maxp1-minp1)+1),
+                        np.int(math.ceil(maxp2-minp2)+1)])
+        int_pts = np.around(pts, 0).astype(int)
+        for pt in int_pts:
+            img[pt[0]][pt[1]] = 1
+        # Pad with zeros all the way around the edges
+        img_pad = np.zeros([np.shape(img)[0] + 2, np.shape(img)[1] + 2])
+        img_pad[1:np.shape(img)[0]+1, 1:np.shape(img)[1]+1] = img
+
+        # All points should lie on this plane but could be some rounding errors
+        # so use the order parameter
+        z_plane = sp.unique(np.around(z, order+2))
+        if len(z_plane) > 1:
+            logger.error('Rotation for image analysis failed')
+            temp_arr = np.ones(1)
+            temp_arr.fill(np.mean(z_plane))
+            z_plane = temp_arr
+        "Fill in the convex hull polygon"
+        convhullimg = convex_hull_image(img_pad)
+        # Perform a Distance Transform and black out points less than r to create
+        # binary erosion. This is faster than performing an erosion and dt can
+        # also be used later to find incircle"
+        eroded = ndimage.distance_transform_edt(convhullimg)
+        eroded[eroded <= r] = 0
+        eroded[eroded > r] = 1
+        # If we are left with less than 3 non-zero points then the throat is
+        # fully occluded
+        if np.sum(eroded) >= 3:
+            # Do some image analysis to extract the key properties
+            regions = regionprops(eroded[1:np.shape(img)[0]+1,
+                                         1:np.shape(img)[1]+1].astype(int))
+            # Change this to cope with genuine multi-region throats
+            if len(regions) == 1:
+                for props in regions:
+                    x0, y0 = props.centroid
+                    equiv_diameter = props.equivalent_diameter
+                    area = props.area
+                    perimeter = props.perimeter
+                    coords = props.coords
+                # Undo the translation, scaling and truncation on the centroid
+                centroid2d = [x0, y0]/f
+                centroid2d += (translation)
+                centroid3d = np.concatenate((centroid2d, z_plane))
+                # Distance transform the eroded facet to find the incentre and
+                # inradius
+                dt = ndimage.distance_transform_edt(eroded)
+                inx0, iny0 = \
+                    np.asarray(np.unravel_index(dt.argmax(), dt.shape)) \
+                      .astype(float)
+                incentre2d = [inx0, iny0]
+                # Undo the translation, scaling and truncation on the incentre
+                incentre2d /= f
+                incentre2d += (translation)
+                incentre3d = np.concatenate((incentre2d, z_plane))
+                # The offset vertices will be those in the coords that are
+                # closest to the originals"
+                offset_verts = []
+                for pt in int_pts:
+                    vert = np.argmin(np.sum(np.square(coords-pt), axis=1))
+                    if vert not in offset_verts:
+                        offset_verts.append(vert)
+                # If we are left with less than 3 different vertices then the
+                # throat is fully occluded as we can't make a shape with
+                # non-zero area
+                if len(offset_verts) >= 3:
+                    offset_coords = coords[offset_verts].astype(float)
+                    # Undo the translation, scaling and truncation on the
+                    # offset_verts
+                    offset_coords /= f
+                    offset_coords_3d = \
+                        np.vstack((offset_coords[:, 0]+translation[0],
+                                   offset_coords[:, 1]+translation[1],
+                                   np.ones(len(offset_verts))*z_plane)).T
+
+                    # Un-rotate the co-ordinates back to the original
+                    # orientation if we rotated in the first place
+                    incentre = _unrotate(incentre3d, M)
+                    centroid = _unrotate(centroid3d, M)
+                    eroded_verts = _unrotate(offset_coords_3d, M)
+                    # Undo scaling on other parameters
+                    return eroded_verts, area/(f*f), perimeter/f, centroid, \
+                        incentre, dt.max()/f, equiv_diameter/f
+    return _occluded()
@@ -4,16 +4,14 @@ throat_vertices -- update throat vertices from Vornoi object
 ===============================================================================
 
 """
-import scipy as _sp
+import OpenPNM.Utilities.vertexops as vo
 
 
 def voronoi(network, geometry, **kwargs):
     r"""
-    Update the pore vertices from the voronoi vertices
+    Update the throat vertices from the voronoi vertices
     """
-    throats = geometry.map_throats(network, geometry. throats())
-    value = _sp.ndarray(len(throats), dtype=object)
-    for i in range(len(throats)):
-        value[i] = \
-            _sp.asarray(list(network['throat.vert_index'][throats[i]].values()))
+    throats = geometry.map_throats(network, geometry.throats())
+    indptr, verts = vo.vertex_csr(network, 'throat', throats)
+    value = vo.csr_to_objects(indptr, verts)
     return value
@@ -5,8 +5,10 @@ Cubic: Generate lattice-like networks
 ===============================================================================
 
 """
+import weakref
 import numpy as np
 import scipy as sp
+import scipy.sparse as sprs
 import scipy.spatial as sptl
 import OpenPNM.Utilities.misc as misc
 from OpenPNM.Network import tools
@@ -48,6 +50,34 @@ class Cubic(GenericNetwork):
         cuboid shape like spheres or cylinders, but still with a cubic lattice
         topology.
 
+    index_dtype : numpy integer type
+        The data type used to store the pore indices in 'throat.conns' and
+        'pore.index'.  The default is the platform integer, but a compact type
+        such as ``numpy.int32`` roughly halves the memory used by the
+        connections of very large networks.  An Exception is raised if the
+        type cannot hold the number of pores.
+
+    implicit : boolean
+        If ``True`` the 'throat.conns' array is not stored.  Instead the
+        connections are computed arithmetically from the lattice shape and the
+        connectivity stencil each time they are requested, and neighbor
+        queries are answered directly from the stencil.  The default is
+        ``False``.  See Notes.
+
+    Notes
+    -----
+    An implicit network behaves exactly like an ordinary one, but only holds
+    the pore coordinates and labels in memory, so it is well suited to very
+    large structured simulations.  Reading ``pn['throat.conns']`` returns a
+    read-only array that is only kept for as long as it is referenced
+    elsewhere, so code that needs it repeatedly should hold on to it.  The
+    adjacency and incidence matrices are built from the stencil without it.
+    Any operation that changes the topology, such as
+    ``trim``, ``extend``, ``clone_pores`` or ``add_boundaries``, stores the
+    connections and turns the network into an ordinary one; the same can be
+    done explicitly with ``materialize``.  Since a ``template`` trims the
+    network on creation it always yields an ordinary network.
+
     Examples
     --------
     >>> import OpenPNM
@@ -77,9 +107,24 @@ class Cubic(GenericNetwork):
     >>> pn.trim(throats=pn['throat.to_drop'])
     >>> pn.Nt < Nt_original
     True
+
+    Very large lattices can be created without storing their connections:
+
+    >>> pn = OpenPNM.Network.Cubic(shape=[5, 5, 5], implicit=True)
+    >>> 'throat.conns' in pn.keys()
+    False
+    >>> pn.find_neighbor_pores(pores=[0])
+    array([ 1,  5, 25])
     """
+    # The offsets of the neighbors connected to each pore by the face, corner
+    # and edge throats, in the order the throats are numbered
+    _face_stencil = [(0, 0, 1), (0, 1, 0), (1, 0, 0)]
+    _corner_stencil = [(1, 1, 1), (1, 1, -1), (1, -1, 1), (-1, 1, 1)]
+    _edge_stencil = [(0, 1, 1), (0, 1, -1), (1, 0, 1), (-1, 0, 1),
+                     (-1, -1, 0), (-1, 1, 0)]
+
     def __init__(self, shape=None, template=None, spacing=[1, 1, 1],
-                 connectivity=6, **kwargs):
+                 connectivity=6, index_dtype=int, implicit=False, **kwargs):
         super().__init__(**kwargs)
 
         if shape is not None:
@@ -94,64 +139,48 @@ class Cubic(GenericNetwork):
         # Store network spacing
         self._spacing = sp.ones(3)*sp.array(spacing, ndmin=1)
 
-        points = np.array([i for i, v in np.ndenumerate(arr)], dtype=float)
-        points += 0.5
-        points *= spacing
-
-        I = np.arange(arr.size).reshape(arr.shape)
-
-        face_joints = [
-            (I[:, :, :-1], I[:, :, 1:]),
-            (I[:, :-1], I[:, 1:]),
-            (I[:-1], I[1:]),
-        ]
-
-        corner_joints = [
-            (I[:-1, :-1, :-1], I[1:, 1:, 1:]),
-            (I[:-1, :-1, 1:], I[1:, 1:, :-1]),
-            (I[:-1, 1:, :-1], I[1:, :-1, 1:]),
-            (I[1:, :-1, :-1], I[:-1, 1:, 1:]),
-        ]
-
-        edge_joints = [
-            (I[:, :-1, :-1], I[:, 1:, 1:]),
-            (I[:, :-1, 1:], I[:, 1:, :-1]),
-            (I[:-1, :, :-1], I[1:, :, 1:]),
-            (I[1:, :, :-1], I[:-1, :, 1:]),
-            (I[1:, 1:, :], I[:-1, :-1, :]),
-            (I[1:, :-1, :], I[:-1, 1:, :]),
-        ]
+        if np.iinfo(index_dtype).max < arr.size:
+            raise Exception('index_dtype ' + np.dtype(index_dtype).name +
+                            ' cannot hold ' + str(arr.size) + ' pore indices')
+
+        # Fill in the coordinates one axis at a time, by broadcasting the
+        # lattice positions along that axis into a view of the output
+        points = np.empty([arr.size, 3], dtype=float)
+        grid = points.reshape(arr.shape + (3,))
+        for i in range(3):
+            pos = (np.arange(arr.shape[i]) + 0.5)*self._spacing[i]
+            grid[..., i] = pos.reshape([-1 if j == i else 1 for j in range(3)])
 
         if connectivity == 6:
-            joints = face_joints
+            stencil = self._face_stencil
         elif connectivity == 8:
-            joints = corner_joints
+            stencil = self._corner_stencil
         elif connectivity == 12:
-            joints = edge_joints
+            stencil = self._edge_stencil
         elif connectivity == 14:
-            joints = face_joints + corner_joints
+            stencil = self._face_stencil + self._corner_stencil
         elif connectivity == 18:
-            joints = face_joints + edge_joints
+            stencil = self._face_stencil + self._edge_stencil
         elif connectivity == 20:
-            joints = edge_joints + corner_joints
+            stencil = self._edge_stencil + self._corner_stencil
         elif connectivity == 26:
-            joints = face_joints + corner_joints + edge_joints
+            stencil = self._face_stencil + self._corner_stencil + \
+                self._edge_stencil
         else:
             raise Exception('Invalid connectivity receieved. Must be 6, 8, 12, 14, '
                             '18, 20 or 26')
-
-        I = np.arange(arr.size).reshape(arr.shape)
-        tails, heads = [], []
-        for T, H in joints:
-            tails.extend(T.flat)
-            heads.extend(H.flat)
-        pairs = np.vstack([tails, heads]).T
+        self._stencil = stencil
+        self._index_dtype = index_dtype
+        self._implicit_conns = implicit
 
         self['pore.coords'] = points
-        self['throat.conns'] = pairs
+        Nt = sum([np.prod(self._block_shape(d)) for d in stencil])
+        if not implicit:
+            self['throat.conns'] = self._lattice_conns()
         self['pore.all'] = np.ones(len(self['pore.coords']), dtype=bool)
-        self['throat.all'] = np.ones(len(self['throat.conns']), dtype=bool)
-        self['pore.index'] = sp.arange(0, len(self['pore.coords']))
+        self['throat.all'] = np.ones(Nt, dtype=bool)
+        self['pore.index'] = sp.arange(0, len(self['pore.coords']),
+                                       dtype=index_dtype)
 
         self._label_surfaces()
 
@@ -159,6 +188,214 @@ class Cubic(GenericNetwork):
         if template is not None:
             self.trim(~arr.flatten())
 
+    def __getitem__(self, key):
+        if key == 'throat.conns' and self._implicit:
+            ref = self.__dict__.get('_conns_ref')
+            conns = ref() if ref is not None else None
+            if conns is None:
+                conns = self._lattice_conns()
+                conns.flags.writeable = False
+                self._conns_ref = weakref.ref(conns)
+            return conns
+        return super().__getitem__(key)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # Weak references cannot be saved, the connections are recomputed
+        state.pop('_conns_ref', None)
+        return state
+
+    def _get_implicit(self):
+        if not getattr(self, '_implicit_conns', False):
+            return False
+        # Once the connections have been stored by a change in topology the
+        # network stays ordinary, even if they are later cleared
+        if 'throat.conns' in self.keys():
+            self._implicit_conns = False
+        return self._implicit_conns
+
+    _implicit = property(fget=_get_implicit)
+
+    def props(self, element=None, mode='all', deep=False):
+        vals = super().props(element=element, mode=mode, deep=deep)
+        if self._implicit and ('throat' in self._parse_element(element)):
+            modes = ['all', 'deep', 'models', 'constants']
+            mode = self._parse_mode(mode=mode, allowed=modes, single=False)
+            if ('all' in mode) or ('constants' in mode):
+                vals.append('throat.conns')
+        return vals
+
+    props.__doc__ = GenericNetwork.props.__doc__
+
+    def _block_shape(self, offset):
+        r"""
+        Returns the shape of the block of pores that have a neighbor at the
+        given stencil offset
+        """
+        return tuple(sp.array(self._shape) - sp.absolute(offset))
+
+    def _stencil_pairs(self):
+        r"""
+        Yields the tail and head pores of the throats made by each offset of
+        the connectivity stencil in turn, in the order they are numbered
+        """
+        shape = self._shape
+        strides = [shape[1]*shape[2], shape[2], 1]
+        for d in self._stencil:
+            head = np.zeros(shape, dtype=bool)
+            head[tuple(slice(max(0, i), n - max(0, -i))
+                       for i, n in zip(d, shape))] = True
+            H = np.flatnonzero(head).astype(self._index_dtype)
+            yield H - np.dot(d, strides), H
+
+    def _lattice_conns(self):
+        r"""
+        Computes the throat connections of the lattice from its shape and
+        connectivity stencil, in the same order as they are numbered
+        """
+        Nt = sum([np.prod(self._block_shape(d)) for d in self._stencil])
+        conns = np.empty([Nt, 2], dtype=self._index_dtype)
+        start = 0
+        for T, H in self._stencil_pairs():
+            stop = start + T.size
+            # Store the smaller index in the first column, as __setitem__ does
+            conns[start:stop, 0] = np.minimum(T, H)
+            conns[start:stop, 1] = np.maximum(T, H)
+            start = stop
+        return conns
+
+    def _stencil_entries(self, data, dropzeros):
+        r"""
+        Yields the tail and head pores and the values of the throats made by
+        each stencil offset, leaving out those with values of zero or less if
+        ``dropzeros`` is True
+        """
+        if data is None:
+            data = sp.ones((self.Nt,))
+        elif sp.shape(data)[0] != self.Nt:
+            raise Exception('Received dataset of incorrect length')
+        start = 0
+        for T, H in self._stencil_pairs():
+            vals = data[start:start + T.size]
+            Ts = np.arange(start, start + T.size)
+            start += T.size
+            if dropzeros:
+                keep = vals > 0
+                T, H, vals, Ts = T[keep], H[keep], vals[keep], Ts[keep]
+            yield T, H, vals, Ts
+
+    def create_adjacency_matrix(self, data=None, sprsfmt='coo',
+                                dropzeros=True, sym=True):
+        if not self._implicit:
+            return super().create_adjacency_matrix(data=data, sprsfmt=sprsfmt,
+                                                   dropzeros=dropzeros,
+                                                   sym=sym)
+        row, col, vals = [], [], []
+        for T, H, v, Ts in self._stencil_entries(data, dropzeros):
+            row.append(np.minimum(T, H))
+            col.append(np.maximum(T, H))
+            vals.append(v)
+            if sym:
+                row.append(col[-1])
+                col.append(row[-2])
+                vals.append(v)
+        temp = sprs.coo_matrix((sp.concatenate(vals),
+                                (sp.concatenate(row), sp.concatenate(col))),
+                               (self.Np, self.Np))
+        if sprsfmt == 'csr':
+            temp = temp.tocsr()
+        if sprsfmt == 'lil':
+            temp = temp.tolil()
+        return temp
+
+    create_adjacency_matrix.__doc__ = \
+        GenericNetwork.create_adjacency_matrix.__doc__
+
+    def create_incidence_matrix(self, data=None, sprsfmt='coo',
+                                dropzeros=True):
+        if not self._implicit:
+            return super().create_incidence_matrix(data=data, sprsfmt=sprsfmt,
+                                                   dropzeros=dropzeros)
+        row, col, vals = [], [], []
+        for T, H, v, Ts in self._stencil_entries(data, dropzeros):
+            row.extend([T, H])
+            col.extend([Ts, Ts])
+            vals.extend([v, v])
+        temp = sprs.coo_matrix((sp.concatenate(vals),
+                                (sp.concatenate(row), sp.concatenate(col))),
+                               (self.Np, self.Nt))
+        if sprsfmt == 'csr':
+            temp = temp.tocsr()
+        if sprsfmt == 'lil':
+            temp = temp.tolil()
+        return temp
+
+    create_incidence_matrix.__doc__ = \
+        GenericNetwork.create_incidence_matrix.__doc__
+
+    def _neighbor_rows(self, pores, element):
+        if not self._implicit:
+            return super()._neighbor_rows(pores=pores, element=element)
+        shape = sp.array(self._shape)
+        strides = sp.array([shape[1]*shape[2], shape[2], 1])
+        pores = sp.array(pores, ndmin=1)
+        # Pores added after the lattice was created have no throats
+        inside = sp.where(pores < sp.prod(shape))[0]
+        ijk = sp.vstack(sp.unravel_index(pores[inside], self._shape)).T
+        rows = []
+        vals = []
+        start = 0
+        for d in self._stencil:
+            block = self._block_shape(d)
+            # Each pore is the tail of a throat to the neighbor at +d and the
+            # head of a throat from the neighbor at -d
+            for sign in [1, -1]:
+                nbrs = ijk + sign*sp.array(d)
+                keep = sp.all((nbrs >= 0) & (nbrs < shape), axis=1)
+                if element == 'pore':
+                    vals.append(sp.dot(nbrs[keep], strides))
+                else:
+                    tails = ijk[keep] if sign == 1 else nbrs[keep]
+                    tails = tails - sp.maximum(0, -sp.array(d))
+                    vals.append(start + sp.ravel_multi_index(tuple(tails.T),
+                                                             block))
+                rows.append(inside[keep])
+            start += sp.prod(block)
+        rows = sp.concatenate(rows)
+        vals = sp.concatenate(vals)
+        order = sp.lexsort((vals, rows))
+        counts = sp.bincount(rows, minlength=sp.size(pores))
+        return sp.split(vals[order], sp.cumsum(counts)[:-1])
+
+    def _connected_rows(self, throats):
+        if not self._implicit:
+            return super()._connected_rows(throats=throats)
+        shape = sp.array(self._shape)
+        strides = sp.array([shape[1]*shape[2], shape[2], 1])
+        throats = sp.array(throats, ndmin=1)
+        conns = sp.empty([sp.size(throats), 2], dtype=self._index_dtype)
+        start = 0
+        for d in self._stencil:
+            block = self._block_shape(d)
+            stop = start + sp.prod(block)
+            hits = sp.where((throats >= start) & (throats < stop))[0]
+            # Throats are numbered by their tail pore within the block
+            tails = sp.vstack(sp.unravel_index(throats[hits] - start, block)).T
+            T = sp.dot(tails + sp.maximum(0, -sp.array(d)), strides)
+            H = T + sp.dot(d, strides)
+            conns[hits, 0] = sp.minimum(T, H)
+            conns[hits, 1] = sp.maximum(T, H)
+            start = stop
+        return conns
+
+    def materialize(self):
+        r"""
+        Stores the 'throat.conns' array of an implicit network, turning it
+        into an ordinary network.  This has no effect on ordinary networks.
+        """
+        if self._implicit:
+            self['throat.conns'] = self._lattice_conns()
+
     def _label_surfaces(self):
         r'''
         It applies the default surface labels for a cubic network
@@ -195,9 +432,11 @@ class Cubic(GenericNetwork):
 
         Notes
         -----
-        This method uses ``clone_pores`` to clone the surface pores (labeled
-        'left','right', etc), then shifts them to the periphery of the domain,
-        and gives them the label 'right_face', 'left_face', etc.
+        This method clones the surface pores (labeled 'left','right', etc),
+        connecting each clone to its parent as ``clone_pores`` does, then
+        shifts them to the periphery of the domain, and gives them the label
+        'right_boundary', 'left_boundary', etc.  The pores for all faces are
+        added with a single call to ``extend_many``.
         """
         x, y, z = self['pore.coords'].T
         Lcx, Lcy, Lcz = self._spacing
@@ -213,15 +452,24 @@ class Cubic(GenericNetwork):
         scale['left'] = scale['right'] = [1, 0, 1]
         scale['bottom'] = scale['top'] = [1, 1, 0]
 
+        Np = self.Np
+        coords = []
+        conns = []
         for label in labels:
+            for item in [label+'_boundary', 'boundary']:
+                if 'pore.' + item not in self.keys():
+                    self['pore.'+item] = False
+                if 'throat.' + item not in self.keys():
+                    self['throat.'+item] = False
+            # Translate the clones of the face pores, and connect each one
+            # to its parent
             ps = self.pores(label)
-            self.clone_pores(pores=ps, apply_label=[label+'_boundary',
-                                                    'boundary'])
-            # Translate cloned pores
-            ind = self.pores(label+'_boundary')
-            coords = self['pore.coords'][ind]
-            coords = coords*scale[label] + offset[label]
-            self['pore.coords'][ind] = coords
+            coords.append(self['pore.coords'][ps]*scale[label] + offset[label])
+            conns.append(sp.vstack((ps, sp.arange(Np, Np + sp.size(ps)))).T)
+            Np += sp.size(ps)
+        tools.extend_many(network=self, pore_coords=coords, throat_conns=conns,
+                          labels=[[label+'_boundary', 'boundary']
+                                  for label in labels])
 
     def add_periodic_connections(self, pores1, pores2, apply_label='periodic'):
         r"""
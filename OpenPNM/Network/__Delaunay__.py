@@ -6,10 +6,10 @@ Delaunay: Generate random networks based on Delaunay Tessellations
 
 """
 import sys
+import copy
 import scipy as sp
 import numpy as np
 import OpenPNM.Utilities.vertexops as vo
-import scipy.sparse as sprs
 import scipy.spatial as sptl
 import scipy.ndimage as spim
 from scipy.spatial import Voronoi
@@ -37,6 +37,17 @@ class Delaunay(GenericNetwork):
         be same size as domain because positions are re-scaled
     base_points : [Np,3] float array
         coordinates to use instead of random generation
+
+    Notes
+    -----
+    The coordinates of the Voronoi vertices are stored once, and the
+    ``'pore.vert_ids'`` and ``'throat.vert_ids'`` arrays hold the indices of
+    the vertices surrounding each pore and making up each throat, padded with
+    -1.  Being ordinary pore and throat arrays they are kept aligned by
+    ``trim`` and ``extend``.  The vertices should be accessed through
+    ``OpenPNM.Utilities.vertexops.vertex_csr``, which returns them as a ragged
+    array in compressed sparse row (CSR) layout.
+
     Examples
     --------
     >>> import OpenPNM
@@ -55,6 +66,31 @@ class Delaunay(GenericNetwork):
         super().__init__(**kwargs)
         self.generate(num_pores, domain_size, prob, base_points)
 
+    def __getstate__(self):
+        state = super().__getstate__()
+        # Store the ragged lists of the Voronoi diagram as flat arrays, which
+        # are much faster to save and load than lists of lists
+        if state.get('_vor') is not None:
+            vor = copy.copy(state['_vor'])
+            for item in ['regions', 'ridge_vertices']:
+                lists = getattr(vor, item)
+                counts = np.array([len(v) for v in lists], dtype=int)
+                flat = np.array([i for v in lists for i in v], dtype=int)
+                setattr(vor, item, (counts, flat))
+            state['_vor'] = vor
+        return state
+
+    def __setstate__(self, state):
+        vor = state.get('_vor')
+        if vor is not None:
+            for item in ['regions', 'ridge_vertices']:
+                value = getattr(vor, item)
+                if isinstance(value, tuple):
+                    counts, flat = value
+                    value = np.split(flat, np.cumsum(counts)[:-1])
+                    setattr(vor, item, [v.tolist() for v in value])
+        super().__setstate__(state)
+
     def generate(self, num_pores, domain_size, prob, base_points):
         r"""
         Method to trigger the generation of the network
@@ -168,50 +204,108 @@ class Delaunay(GenericNetwork):
         logger.debug('Beginning tessellation')
         Tri = sptl.Delaunay(pts)
         logger.debug('Converting tessellation to adjacency matrix')
-        adjmat = sprs.lil_matrix((Np, Np), dtype=int)
-        for i in sp.arange(0, sp.shape(Tri.simplices)[0]):
-            # Keep only simplices that are fully in real domain
-            # this used to be vectorize, but it stopped working...change in scipy?
-            for j in Tri.simplices[i]:
-                if j < Np:
-                    adjmat[j, Tri.simplices[i][Tri.simplices[i] < Np]] = 1
-        # Remove duplicate (lower triangle) and self connections (diagonal)
-        # and convert to coo
-        adjmat = sprs.triu(adjmat, k=1, format="coo")
+        self['throat.conns'] = self._simplices_to_conns(Tri.simplices, Np)
         logger.debug('Conversion to adjacency matrix complete')
-        self['throat.conns'] = sp.vstack((adjmat.row, adjmat.col)).T
         self['pore.all'] = np.ones(len(self['pore.coords']), dtype=bool)
         self['throat.all'] = np.ones(len(self['throat.conns']), dtype=bool)
 
         # Do Voronoi diagram - creating voronoi polyhedra around each pore and save
         # vertex information
         self._vor = Voronoi(pts)
-        all_vert_index = sp.ndarray(Np, dtype=object)
-        for i, polygon in enumerate(self._vor.point_region[0:Np]):
-            if -1 not in self._vor.regions[polygon]:
-                all_vert_index[i] = \
-                    dict(zip(self._vor.regions[polygon],
-                             self._vor.vertices[self._vor.regions[polygon]]))
-
-        # Add throat vertices by looking up vor.ridge_dict
-        throat_verts = sp.ndarray(len(self['throat.conns']), dtype=object)
-        for i, (p1, p2) in enumerate(self['throat.conns']):
-            try:
-                throat_verts[i] = \
-                    dict(zip(self._vor.ridge_dict[(p1, p2)],
-                             self._vor.vertices[self._vor.ridge_dict[(p1, p2)]]))
-            except KeyError:
-                try:
-                    throat_verts[i] = \
-                        dict(zip(self._vor.ridge_dict[(p2, p1)],
-                                 self._vor.vertices[self._vor.ridge_dict[(p2, p1)]]))
-                except KeyError:
-                    logger.error('Throat Pair Not Found in Voronoi Ridge Dictionary')
-
-        self['pore.vert_index'] = all_vert_index
-        self['throat.vert_index'] = throat_verts
+        # Pore vertices are the regions of the real points, excluding any that
+        # are unbounded
+        regions = [self._vor.regions[polygon]
+                   for polygon in self._vor.point_region[0:Np]]
+        regions = [r if -1 not in r else [] for r in regions]
+        # Throat vertices are the ridges between the connected points, found by
+        # matching the sorted ridge points to the throat conns as packed keys
+        ridge_points = sp.sort(self._vor.ridge_points, axis=1).astype(sp.int64)
+        ridge_keys = ridge_points[:, 0]*len(pts) + ridge_points[:, 1]
+        conns = self['throat.conns'].astype(sp.int64)
+        keys = conns[:, 0]*len(pts) + conns[:, 1]
+        order = sp.argsort(ridge_keys)
+        ind = sp.searchsorted(ridge_keys, keys, sorter=order)
+        ind = order[sp.clip(ind, 0, len(order)-1)]
+        found = ridge_keys[ind] == keys
+        if not sp.all(found):
+            logger.error('Throat Pair Not Found in Voronoi Ridge Dictionary')
+        ridges = [self._vor.ridge_vertices[i] if f else []
+                  for i, f in zip(ind, found)]
+        # Only keep the vertices used by the real pores and throats, since most
+        # of the Voronoi vertices belong to the reflected domains
+        used = sp.unique(sp.array([i for v in regions + ridges for i in v],
+                                  dtype=int))
+        self._vert_coords = self._vor.vertices[used]
+        regions = [sp.searchsorted(used, r) for r in regions]
+        ridges = [sp.searchsorted(used, r) for r in ridges]
+        self._store_vertices('pore', self.Ps, regions)
+        self._store_vertices('throat', self.Ts, ridges)
         logger.debug(sys._getframe().f_code.co_name + ': End of method')
 
+    def _store_vertices(self, element, locations, vert_ids):
+        r"""
+        Record the Voronoi vertices of the given pores or throats in the
+        ``'pore.vert_ids'`` or ``'throat.vert_ids'`` array
+
+        Parameters
+        ----------
+        element : string
+            Either 'pore' or 'throat'
+        locations : array_like
+            The pore or throat indices whose vertices are being set
+        vert_ids : list of lists
+            The indices into ``_vert_coords`` of the vertices for each location
+        """
+        counts = sp.array([len(v) for v in vert_ids], dtype=int)
+        ids = sp.array([i for v in vert_ids for i in v], dtype=sp.int32)
+        key = element + '.vert_ids'
+        if key in self.keys():
+            old = vo.vertex_ids(self, element)
+        else:
+            old = -sp.ones((self._count(element), 0), dtype=sp.int32)
+        width = max([sp.shape(old)[1]] + list(counts))
+        value = -sp.ones((self._count(element), width), dtype=sp.int32)
+        value[:, :sp.shape(old)[1]] = old
+        value[locations, :] = -1
+        rows = sp.repeat(locations, counts)
+        starts = sp.cumsum(counts) - counts
+        cols = sp.arange(len(ids)) - sp.repeat(starts, counts)
+        value[rows, cols] = ids
+        self[key] = value
+
+    @staticmethod
+    def _simplices_to_conns(simplices, Np):
+        r"""
+        Extract the unique edges between real pores from a list of simplices
+
+        Parameters
+        ----------
+        simplices : array_like
+            The (Ns, Nd+1) array of vertex indices for each simplex, as
+            returned by ``scipy.spatial.Delaunay``.
+        Np : int
+            The number of real pores.  Vertices with an index equal to or
+            greater than this belong to the reflected dummy domains and any
+            edge touching them is discarded.
+
+        Returns
+        -------
+        An (Nt, 2) array of connections, with the lower pore index in the first
+        column, sorted by the first then second column.
+        """
+        simplices = sp.asarray(simplices)
+        # Every pair of vertices in a simplex forms an edge
+        ind1, ind2 = sp.triu_indices(sp.shape(simplices)[1], k=1)
+        P1 = simplices[:, ind1].ravel()
+        P2 = simplices[:, ind2].ravel()
+        keep = (P1 < Np) * (P2 < Np) * (P1 != P2)
+        P1 = P1[keep].astype(sp.int64)
+        P2 = P2[keep].astype(sp.int64)
+        # Pack each pair into a single key to find the unique edges
+        keys = sp.unique(sp.minimum(P1, P2)*Np + sp.maximum(P1, P2))
+        conns = sp.vstack((keys // Np, keys % Np)).T
+        return conns
+
     def add_boundaries(self):
 
         r"""
@@ -246,8 +340,7 @@ class Delaunay(GenericNetwork):
 
         bound_conns = []
         bound_coords = []
-        bound_vert_index = []
-        throat_vert_index = []
+        bound_verts = []
         # Find boundary extent
         [x_min, x_max, y_min, y_max, z_min, z_max] = \
             vo.vertex_dimension(self, self.pores(), parm='minmax')
@@ -291,8 +384,7 @@ class Delaunay(GenericNetwork):
                         pass
                     bound_coords.append(new_pore_coord)
                     bound_conns.append(np.array([my_pore, new_throat_count + Np]))
-                    bound_vert_index.append(dict(zip(v, throat_verts)))
-                    throat_vert_index.append(dict(zip(v, throat_verts)))
+                    bound_verts.append(throat_verts)
                     new_throat_count += 1
 
         # Add new pores and connections
@@ -329,9 +421,16 @@ class Delaunay(GenericNetwork):
         self['pore.back_boundary'][back] = True
         self['pore.top_boundary'][top] = True
         self['pore.bottom_boundary'][bottom] = True
-        # Save the throat verts
-        self["pore.vert_index"][new_pore_ids] = bound_vert_index
-        self["throat.vert_index"][new_throat_ids] = throat_vert_index
+        # The rounded boundary vertices are appended to the vertex array, and
+        # shared by each new pore and its throat
+        Nv = sp.shape(self._vert_coords)[0]
+        counts = [len(verts) for verts in bound_verts]
+        vert_ids = sp.split(sp.arange(Nv, Nv + sum(counts)),
+                            sp.cumsum(counts)[:-1])
+        if len(bound_verts) > 0:
+            self._vert_coords = sp.vstack([self._vert_coords] + bound_verts)
+        self._store_vertices('pore', new_pore_ids, vert_ids)
+        self._store_vertices('throat', new_throat_ids, vert_ids)
 
     def domain_length(self, face_1, face_2):
         r"""
@@ -359,8 +458,9 @@ class Delaunay(GenericNetwork):
         import pickle as pickle
         Indices = []
         for t in self.throats():
-            indices = list(self["throat.vert_index"][t].keys())
-            verts = self._vor.vertices[indices]
+            indices = vo.vertex_ids(self, 'throat', t)[0]
+            indices = indices[indices >= 0]
+            verts = self._vert_coords[indices]
             # Need to order the indices in convex hull order
             # Compute the standard deviation in all coordinates and eliminate
             # the axis with the smallest to make 2d
@@ -377,6 +477,6 @@ class Delaunay(GenericNetwork):
             Indices.append(np.asarray(indices)[hull2d.vertices].tolist())
         # Create dictionary to pickle
         data = {}
-        data["Verts"] = self._vor.vertices
+        data["Verts"] = self._vert_coords
         data["Indices"] = Indices
         pickle.dump(data, open("fibres.p", "wb"))
@@ -11,9 +11,9 @@ import scipy.sparse as sprs
 import scipy.spatial as sptl
 import OpenPNM.Utilities.misc as misc
 from OpenPNM.Utilities import topology
-from OpenPNM.Base import Core, Workspace, Tools, logging
+from OpenPNM.Network import tools
+from OpenPNM.Base import Core, Tools, logging
 logger = logging.getLogger(__name__)
-mgr = Workspace()
 topo = topology()
 
 
@@ -91,6 +91,61 @@ class GenericNetwork(Core):
 
     props.__doc__ = Core.props.__doc__
 
+    def set_storage(self, backend='memory', path=None):
+        r"""
+        Choose where the pore and throat arrays of this simulation are kept.
+        This applies to the Network and all its Geometry, Phase and Physics
+        objects, and to any Algorithm created on the Network.
+
+        Parameters
+        ----------
+        backend : string
+            Options are:
+
+            **'memory'** : (default) Arrays are normal in-memory ndarrays
+
+            **'memmap'** : Arrays are ``numpy.memmap`` instances backed by one
+            file each, so the operating system can page them to disk.  This
+            allows simulations larger than the available RAM.
+
+        path : string, optional
+            The scratch directory in which to put the files when
+            ``backend='memmap'``.  If not given a temporary directory is used,
+            which is deleted when the storage is no longer in use.
+
+        Notes
+        -----
+        Existing arrays are moved to the new storage.  Arrays are written to
+        the storage through the usual ``__setitem__`` checks, so the scalar
+        broadcasting and length checks are unchanged.  See
+        ``OpenPNM.Base.Tools.MemmapStorage`` for sharing the resulting files
+        with other processes.
+
+        Examples
+        --------
+        >>> import OpenPNM
+        >>> pn = OpenPNM.Network.TestNet()
+        >>> pn.set_storage('memmap')
+        >>> pn['pore.coords'].filename is not None
+        True
+        >>> pn.set_storage('memory')
+        """
+        if backend == 'memory':
+            storage = None
+        elif backend == 'memmap':
+            storage = Tools.MemmapStorage(path=path)
+        else:
+            raise Exception('Unrecognized storage backend: '+backend)
+        self._storage = storage
+        for obj in self._simulation():
+            for key in list(obj.keys()):
+                value = Core.__getitem__(obj, key)
+                if storage is None:
+                    if isinstance(value, sp.memmap):
+                        dict.__setitem__(obj, key, sp.array(value))
+                else:
+                    dict.__setitem__(obj, key, storage.store(obj, key, value))
+
     def create_adjacency_matrix(self, data=None, sprsfmt='coo',
                                 dropzeros=True, sym=True):
         r"""
@@ -276,7 +331,7 @@ class GenericNetwork(Core):
         stacks the two columns and eliminate non-unique values.
         """
         Ts = self._parse_locations(throats)
-        Ps = self['throat.conns'][Ts]
+        Ps = self._connected_rows(Ts)
         if flatten:
             if sp.shape(Ps) == (0, 2):
                 Ps = sp.array([], ndmin=1, dtype=int)
@@ -284,6 +339,12 @@ class GenericNetwork(Core):
                 Ps = sp.unique(sp.hstack(Ps))
         return Ps
 
+    def _connected_rows(self, throats):
+        r"""
+        Returns the rows of 'throat.conns' for the given throats.
+        """
+        return self['throat.conns'][throats]
+
     def find_connecting_throat(self, P1, P2):
         r"""
         Return the throat number connecting pairs of pores
@@ -466,21 +527,7 @@ class GenericNetwork(Core):
         if sp.size(pores) == 0:
             return sp.array([], ndmin=1, dtype=int)
 
-        # Test for existence of incidence or adjacency matrix
-        if element == 'pore':
-            try:
-                neighbors = self._adjacency_matrix['lil'].rows[[pores]]
-            except:
-                temp = self.create_adjacency_matrix(sprsfmt='lil')
-                self._adjacency_matrix['lil'] = temp
-                neighbors = self._adjacency_matrix['lil'].rows[[pores]]
-        elif element == 'throat':
-            try:
-                neighbors = self._incidence_matrix['lil'].rows[[pores]]
-            except:
-                temp = self.create_incidence_matrix(sprsfmt='lil')
-                self._incidence_matrix['lil'] = temp
-                neighbors = self._incidence_matrix['lil'].rows[[pores]]
+        neighbors = self._neighbor_rows(pores=pores, element=element)
 
         if flatten:
             # Convert rows of lil into single flat list
@@ -503,6 +550,29 @@ class GenericNetwork(Core):
             neighbors = [sp.array(neighbors[i]) for i in range(0, len(pores))]
             return sp.array(neighbors, ndmin=1)
 
+    def _neighbor_rows(self, pores, element):
+        r"""
+        Returns the sorted neighboring pores or throats of each given pore,
+        taken from the rows of the 'lil' adjacency or incidence matrix, which
+        are created if necessary.
+        """
+        # Test for existence of incidence or adjacency matrix
+        if element == 'pore':
+            try:
+                neighbors = self._adjacency_matrix['lil'].rows[[pores]]
+            except:
+                temp = self.create_adjacency_matrix(sprsfmt='lil')
+                self._adjacency_matrix['lil'] = temp
+                neighbors = self._adjacency_matrix['lil'].rows[[pores]]
+        elif element == 'throat':
+            try:
+                neighbors = self._incidence_matrix['lil'].rows[[pores]]
+            except:
+                temp = self.create_incidence_matrix(sprsfmt='lil')
+                self._incidence_matrix['lil'] = temp
+                neighbors = self._incidence_matrix['lil'].rows[[pores]]
+        return neighbors
+
     def num_neighbors(self, pores, element='pore', flatten=False,
                       mode='union'):
         r"""
@@ -879,6 +949,11 @@ class GenericNetwork(Core):
                     throat_conns=throat_conns, labels=labels)
     extend.__doc__ = topo.extend.__doc__
 
+    def extend_many(self, pore_coords=[], throat_conns=[], labels=[]):
+        tools.extend_many(network=self, pore_coords=pore_coords,
+                          throat_conns=throat_conns, labels=labels)
+    extend_many.__doc__ = tools.extend_many.__doc__
+
     def trim(self, pores=[], throats=[]):
         topo.trim(network=self, pores=pores, throats=throats)
     trim.__doc__ = topo.trim.__doc__
@@ -8,10 +8,10 @@ Network.tools.topology: Assorted topological manipulation methods
 import scipy as _sp
 import numpy as _np
 import scipy.ndimage as _spim
+import scipy.spatial as _sptl
+from scipy.sparse import csgraph as _csgraph
 from OpenPNM.Base import logging as _logging
-from OpenPNM.Base import Workspace as _workspace
 logger = _logging.getLogger(__name__)
-_mgr = _workspace()
 
 
 def extend(network, pore_coords=[], throat_conns=[], labels=[]):
@@ -64,22 +64,18 @@ def extend(network, pore_coords=[], throat_conns=[], labels=[]):
                 N = Np
             else:
                 N = Nt
-            if network[item].dtype == bool:
-                temp = _sp.where(network[item])[0]
-                network[item] = _sp.zeros((N,), dtype=bool)
-                network[item][temp] = True
-            elif network[item].dtype == object:
-                temp = network[item]
-                network[item] = _sp.ndarray((N,), dtype=object)
-                network[item][_sp.arange(0, _sp.shape(temp)[0])] = temp
+            # Allocate each array once at its new size and copy the old
+            # values into the leading block
+            temp = network[item]
+            if temp.dtype == bool:
+                new = _sp.zeros((N,) + temp.shape[1:], dtype=bool)
+            elif temp.dtype == object:
+                new = _sp.ndarray((N,) + temp.shape[1:], dtype=object)
             else:
-                temp = network[item]
-                try:
-                    network[item] = _sp.ones((N, _sp.shape(temp)[1]),
-                                             dtype=float)*_sp.nan
-                except:
-                    network[item] = _sp.ones((N,), dtype=float)*_sp.nan
-                network[item][_sp.arange(0, _sp.shape(temp)[0])] = temp
+                new = _sp.empty((N,) + temp.shape[1:], dtype=float)
+                new[_sp.shape(temp)[0]:] = _sp.nan
+            new[:_sp.shape(temp)[0]] = temp
+            network[item] = new
     # Apply labels, if supplied
     if labels != []:
         # Convert labels to list if necessary
@@ -102,6 +98,72 @@ def extend(network, pore_coords=[], throat_conns=[], labels=[]):
     network._update_network()
 
 
+def extend_many(network, pore_coords=[], throat_conns=[], labels=[]):
+    r'''
+    Add several groups of pores and/or throats to the network at once.  The
+    result is the same as calling ``extend`` once for each group in turn, but
+    all property and label arrays on the network are only reallocated once.
+
+    Parameters
+    ----------
+    network : OpenPNM Network Object
+        The Network to which pores or throats should be added
+    pore_coords : list of array_like
+        The coordinates of the pores to add, one array per group
+    throat_conns : list of array_like
+        The throat connections to add, one array per group.  The pore indices
+        are numbered as they would be when extending with each group in turn,
+        so the pores of a group are numbered after those of all previous
+        groups.
+    labels : list of strings, or list of lists of strings, optional
+        The labels to apply to the new pores and throats of each group
+
+    See Also
+    --------
+    extend
+
+    Examples
+    --------
+    >>> import OpenPNM
+    >>> pn = OpenPNM.Network.TestNet()
+    >>> coords = [[[0, 0, 6]], [[0, 0, 7]]]
+    >>> conns = [[[4, 125]], [[125, 126]]]
+    >>> OpenPNM.Network.tools.extend_many(network=pn, pore_coords=coords,
+    ...                                   throat_conns=conns,
+    ...                                   labels=['first', 'second'])
+    >>> [pn.Np, pn.Nt]
+    [127, 302]
+    >>> pn.pores('second')
+    array([126])
+    '''
+    groups = max(len(pore_coords), len(throat_conns), len(labels))
+    coords = [_sp.reshape(pore_coords[i], (-1, 3))
+              if i < len(pore_coords) else _sp.empty((0, 3))
+              for i in range(groups)]
+    conns = [_sp.reshape(throat_conns[i], (-1, 2))
+             if i < len(throat_conns) else _sp.empty((0, 2), dtype=int)
+             for i in range(groups)]
+    Np = network.num_pores() + _sp.cumsum([0] + [len(c) for c in coords])
+    Nt = network.num_throats() + _sp.cumsum([0] + [len(c) for c in conns])
+    extend(network=network, pore_coords=_sp.vstack(coords),
+           throat_conns=_sp.vstack(conns).astype(int))
+    # Apply the labels of each group to its own pores and throats
+    for i in range(min(groups, len(labels))):
+        group_labels = labels[i]
+        if type(group_labels) is str:
+            group_labels = [group_labels]
+        for label in group_labels:
+            label = label.split('.')[-1]
+            if Np[i+1] > Np[i]:
+                if 'pore.'+label not in network.labels():
+                    network['pore.'+label] = False
+                network['pore.'+label][Np[i]:Np[i+1]] = True
+            if Nt[i+1] > Nt[i]:
+                if 'throat.'+label not in network.labels():
+                    network['throat.'+label] = False
+                network['throat.'+label][Nt[i]:Nt[i+1]] = True
+
+
 def trim(network, pores=[], throats=[]):
     '''
     Remove pores or throats from the network.  This is an in-place operation,
@@ -136,20 +198,19 @@ def trim(network, pores=[], throats=[]):
     296
 
     '''
-    mgr = network.workspace
+    mgr = network._workspace
     for net in mgr.networks():
         if net._parent is network:
             raise Exception('This Network has been cloned, cannot trim')
+    conns = network['throat.conns']
     if (_sp.size(pores) > 0) and (_sp.size(throats) > 0):
         raise Exception('Cannot delete pores and throats simultaneously')
     elif _sp.size(pores) > 0:
         pores = _sp.array(pores, ndmin=1)
         Pkeep = _sp.ones((network.num_pores(),), dtype=bool)
         Pkeep[pores] = False
-        Tkeep = _sp.ones((network.num_throats(),), dtype=bool)
-        Ts = network.find_neighbor_throats(pores)
-        if len(Ts) > 0:
-            Tkeep[Ts] = False
+        # Throats are kept only if both of their pores are kept
+        Tkeep = Pkeep[conns[:, 0]] & Pkeep[conns[:, 1]]
     elif _sp.size(throats) > 0:
         throats = _sp.array(throats, ndmin=1)
         Tkeep = _sp.ones((network.num_throats(),), dtype=bool)
@@ -159,21 +220,17 @@ def trim(network, pores=[], throats=[]):
         logger.warning('No pores or throats recieved')
         return
 
-    # Trim all associated objects
+    # Trim all associated objects.  The locations of each object are stored
+    # in the order of its label on the Network, so the locations it keeps are
+    # simply the Network's keep mask restricted to that label.  The trimmed
+    # arrays are written with update since they were already validated when
+    # they were first set.
     for item in network._geometries+network._physics+network._phases:
-        Pnet = network['pore.'+item.name]*Pkeep
-        Tnet = network['throat.'+item.name]*Tkeep
-        temp = network.map_pores(pores=_sp.where(Pnet)[0],
-                                 target=item,
-                                 return_mapping=True)
-        Ps = temp['target']
-        temp = network.map_throats(throats=_sp.where(Tnet)[0],
-                                   target=item,
-                                   return_mapping=True)
-        Ts = temp['target']
+        Ps = _sp.where(Pkeep[network['pore.'+item.name]])[0]
+        Ts = _sp.where(Tkeep[network['throat.'+item.name]])[0]
         # Then resize 'all
-        item.update({'pore.all': _sp.ones((_sp.sum(Pnet),), dtype=bool)})
-        item.update({'throat.all': _sp.ones((_sp.sum(Tnet),), dtype=bool)})
+        item.update({'pore.all': _sp.ones((_sp.size(Ps),), dtype=bool)})
+        item.update({'throat.all': _sp.ones((_sp.size(Ts),), dtype=bool)})
         # Overwrite remaining data and info
         for key in list(item.keys()):
             if key.split('.')[1] not in ['all']:
@@ -181,24 +238,23 @@ def trim(network, pores=[], throats=[]):
                 if key.split('.')[0] == 'throat':
                     logger.debug('Trimming {a} from {b}'.format(a=key,
                                                                 b=item.name))
-                    item[key] = temp[Ts]
+                    item.update({key: _sp.take(temp, Ts, axis=0)})
                 if key.split('.')[0] == 'pore':
                     logger.debug('Trimming {a} from {b}'.format(a=key,
                                                                 b=item.name))
-                    item[key] = temp[Ps]
-
-    # Remap throat connections
-    Pmap = _sp.ones((network.Np,), dtype=int)*-1
-    Pmap[Pkeep] = _sp.arange(0, _sp.sum(Pkeep))
-    tpore1 = network['throat.conns'][:, 0]
-    tpore2 = network['throat.conns'][:, 1]
-    Tnew1 = Pmap[tpore1[Tkeep]]
-    Tnew2 = Pmap[tpore2[Tkeep]]
+                    item.update({key: _sp.take(temp, Ps, axis=0)})
+
+    # Remap throat connections with a single lookup into the new indices
+    Ps = _sp.where(Pkeep)[0]
+    Ts = _sp.where(Tkeep)[0]
+    Pmap = _sp.ones((network.Np,), dtype=conns.dtype)*-1
+    Pmap[Ps] = _sp.arange(0, _sp.size(Ps))
+    conns = _sp.take(Pmap, _sp.take(conns, Ts, axis=0))
     # Write 'all' label specifically
-    network.update({'throat.all': _sp.ones((_sp.sum(Tkeep),), dtype=bool)})
-    network.update({'pore.all': _sp.ones((_sp.sum(Pkeep),), dtype=bool)})
+    network.update({'throat.all': _sp.ones((_sp.size(Ts),), dtype=bool)})
+    network.update({'pore.all': _sp.ones((_sp.size(Ps),), dtype=bool)})
     # Write throat connections specifically
-    network.update({'throat.conns': _sp.vstack((Tnew1, Tnew2)).T})
+    network.update({'throat.conns': conns})
     # Overwrite remaining data and info
     for item in list(network.keys()):
         if item.split('.')[-1] not in ['conns', 'all']:
@@ -206,18 +262,20 @@ def trim(network, pores=[], throats=[]):
             if item.split('.')[0] == 'throat':
                 logger.debug('Trimming {a} from {b}'.format(a=item,
                                                             b=network.name))
-                network[item] = temp[Tkeep]
+                network.update({item: _sp.take(temp, Ts, axis=0)})
             if item.split('.')[0] == 'pore':
                 logger.debug('Trimming {a} from {b}'.format(a=item,
                                                             b=network.name))
-                network[item] = temp[Pkeep]
+                network.update({item: _sp.take(temp, Ps, axis=0)})
 
-    # Reset network graphs
-    network._update_network(mode='regenerate')
+    # Reset network graphs, which are rebuilt when next needed
+    network._update_network(mode='clear')
 
-    # Check Network health
-    health = network.check_network_health()
-    if health['trim_pores'] != []:
+    # Check for isolated pores or clusters, which is all the full health
+    # check would be used for here
+    am = network.create_adjacency_matrix(sprsfmt='csr')
+    Nc = _csgraph.connected_components(csgraph=am, directed=False)[0]
+    if Nc > 1:
         logger.warning('Isolated pores exist!  Run check_network_health to ID \
                         which pores to remove.')
         pass
@@ -295,8 +353,11 @@ def stitch(network, donor, P_network, P_donor, method='nearest',
     networK : OpenPNM Network Object
         The Network that will to which to donor Network will be attached
 
-    donor : OpenPNM Network Object
-        The Network to stitch on to the current Network
+    donor : OpenPNM Network Object, or list of Network Objects
+        The Network to stitch on to the current Network.  A list of several
+        donor Networks can be given to stitch them all on at once, in which
+        case ``P_network`` and ``P_donor`` must be lists of the same length
+        holding the pores to use for each donor.
 
     P_network : array_like
         The pores on the current Network
@@ -308,7 +369,8 @@ def stitch(network, donor, P_network, P_donor, method='nearest',
         Some text to append to each label in the donor Network before
         inserting them into the recipient.  The default is to append no
         text, but a common option would be to append the donor Network's
-        name. To insert none of the donor labels, use None.
+        name. To insert none of the donor labels, use None.  When several
+        donors are given this can also be a list with one entry per donor.
 
     len_max : float
         Set a length limit on length of new throats
@@ -326,6 +388,11 @@ def stitch(network, donor, P_network, P_donor, method='nearest',
     one of the Networks so that it is positioned correctly relative to the
     other.
 
+    The pairs of pores lying within ``len_max`` of each other are found with
+    a KD-tree, so the full distance matrix between the two sets of pores is
+    never formed.  All donors, along with the new stitch throats, are added
+    with a single call to ``extend``.
+
     Examples
     --------
     >>> import OpenPNM
@@ -342,59 +409,92 @@ def stitch(network, donor, P_network, P_donor, method='nearest',
     [250, 625]
 
     '''
+    if type(donor) is list:
+        donors = donor
+        if (len(P_network) != len(donors)) or (len(P_donor) != len(donors)):
+            raise Exception('A list of pores is needed for each donor')
+    else:
+        donors = [donor]
+        P_network = [P_network]
+        P_donor = [P_donor]
+    if type(label_suffix) is not list:
+        label_suffix = [label_suffix]*len(donors)
     # Ensure Networks have no associated objects yet
-    if (len(network._simulation()) > 1) or (len(donor._simulation()) > 1):
+    if len(network._simulation()) > 1:
         raise Exception('Cannot stitch a Network with active sibling objects')
+    for item in donors:
+        if len(item._simulation()) > 1:
+            raise Exception('Cannot stitch a Network with active sibling ' +
+                            'objects')
+    if method != 'nearest':
+        raise RuntimeError('<{}> method not supported'.format(method))
     network['throat.stitched'] = False
     # Get the initial number of pores and throats
     N_init = {}
     N_init['pore'] = network.Np
     N_init['throat'] = network.Nt
-    if method == 'nearest':
-        P1 = P_network
-        P2 = P_donor + N_init['pore']  # Increment pores on donor
-        C1 = network['pore.coords'][P_network]
-        C2 = donor['pore.coords'][P_donor]
-        D = _sp.spatial.distance.cdist(C1, C2)
-        [P1_ind, P2_ind] = _sp.where(D <= len_max)
-        conns = _sp.vstack((P1[P1_ind], P2[P2_ind])).T
-    else:
-        raise RuntimeError('<{}> method not supported'.format(method))
-
-    # Enter donor's pores into the Network
-    extend(network=network, pore_coords=donor['pore.coords'])
-
-    # Enter donor's throats into the Network
-    extend(network=network, throat_conns=donor['throat.conns'] +
-           N_init['pore'])
-
-    # Trim throats that are longer then given len_max
-    C1 = network['pore.coords'][conns[:, 0]]
-    C2 = network['pore.coords'][conns[:, 1]]
-    L = _sp.sum((C1 - C2)**2, axis=1)**0.5
-    conns = conns[L <= len_max]
+    # Gather the pores, throats and stitch throats of all donors
+    coords = []
+    conns = []
+    stitches = []
+    offset = {'pore': [N_init['pore']], 'throat': [N_init['throat']]}
+    for item, P1, P2 in zip(donors, P_network, P_donor):
+        P1 = _sp.array(P1, ndmin=1, dtype=int)
+        P2 = _sp.array(P2, ndmin=1, dtype=int)
+        C1 = network['pore.coords'][P1]
+        C2 = item['pore.coords'][P2]
+        [P1_ind, P2_ind] = _nearby_pairs(C1, C2, len_max)
+        stitches.append(_sp.vstack((P1[P1_ind],
+                                    P2[P2_ind] + offset['pore'][-1])).T)
+        coords.append(item['pore.coords'])
+        conns.append(item['throat.conns'] + offset['pore'][-1])
+        offset['pore'].append(offset['pore'][-1] + item.Np)
+        offset['throat'].append(offset['throat'][-1] + item.Nt)
+
+    # Enter donors' pores and throats, and the stitch throats, at once
+    extend(network=network, pore_coords=_sp.vstack(coords),
+           throat_conns=_sp.vstack(conns + stitches))
+    Ts = _sp.r_[offset['throat'][-1]:network.Nt]
+    network['throat.stitched'][Ts] = True
 
     # Add donor labels to recipient network
-    if label_suffix is not None:
-        if label_suffix != '':
-            label_suffix = '_'+label_suffix
-        for label in donor.labels():
+    for i, item in enumerate(donors):
+        suffix = label_suffix[i]
+        if suffix is None:
+            continue
+        if suffix != '':
+            suffix = '_'+suffix
+        for label in item.labels():
             element = label.split('.')[0]
-            locations = _sp.where(network._get_indices(element) >=
-                                  N_init[element])[0]
-            try:
-                network[label + label_suffix]
-            except:
-                network[label + label_suffix] = False
-            network[label+label_suffix][locations] = donor[label]
-
-    # Add the new stitch throats to the Network
-    extend(network=network, throat_conns=conns, labels='stitched')
-
-    # Remove donor from Workspace, if present
+            locations = _sp.r_[offset[element][i]:offset[element][i+1]]
+            if label + suffix not in network.keys():
+                network[label + suffix] = False
+            network[label + suffix][locations] = item[label]
+
+    # Remove donors from Workspace, if present
     # This check allows for the reuse of a donor Network multiple times
-    if donor in _mgr.values():
-        _mgr.purge_object(donor)
+    for item in donors:
+        if item.workspace != {}:
+            item._workspace.purge_object(item)
+
+
+def _nearby_pairs(coords1, coords2, len_max):
+    r'''
+    Finds all pairs of points from two sets that lie within ``len_max`` of
+    each other, returned as two arrays of indices sorted by the first.
+    '''
+    N1 = _sp.shape(coords1)[0]
+    N2 = _sp.shape(coords2)[0]
+    if (N1 == 0) or (N2 == 0):
+        return [_sp.array([], dtype=int), _sp.array([], dtype=int)]
+    if _sp.isinf(len_max):
+        return [_sp.repeat(_sp.arange(N1), N2), _sp.tile(_sp.arange(N2), N1)]
+    kd1 = _sptl.cKDTree(coords1)
+    kd2 = _sptl.cKDTree(coords2)
+    pairs = kd1.sparse_distance_matrix(kd2, max_distance=len_max,
+                                       output_type='ndarray')
+    order = _sp.lexsort((pairs['j'], pairs['i']))
+    return [pairs['i'][order], pairs['j'][order]]
 
 
 def connect_pores(network, pores1, pores2, labels=[], add_conns=True):
@@ -509,6 +609,9 @@ def subdivide(network, pores, shape, labels=[]):
     Notes
     -----
     - It works only for cubic networks.
+    - All pores are subdivided together, so the blocks and their connections
+      to the rest of the network are added with a single ``extend`` and the
+      original pores are removed with a single ``trim``.
 
     Examples
     --------
@@ -558,7 +661,7 @@ def subdivide(network, pores, shape, labels=[]):
             else:
                 dim = single_dim
             div[dim] = 1
-            div[-_sp.array(div, ndmin=1, dtype=bool)] = _sp.array(shape,
+            div[~_sp.array(div, ndmin=1, dtype=bool)] = _sp.array(shape,
                                                                   ndmin=1)
 
     # Creating small network and handling labels
@@ -573,7 +676,6 @@ def subdivide(network, pores, shape, labels=[]):
         non_single_labels = label_groups[_sp.array([0, 1, 2]) != single_dim]
     for l in main_labels:
         new_net['pore.surface_' + l] = False
-        network['pore.surface_' + l] = False
         if single_dim is None:
             new_net['pore.surface_' + l][new_net.pores(labels=l)] = True
         else:
@@ -582,62 +684,86 @@ def subdivide(network, pores, shape, labels=[]):
                 temp_pores = new_net.pores(non_single_labels[ind][loc])
                 new_net['pore.surface_' + l][temp_pores] = True
 
-    old_coords = _sp.copy(new_net['pore.coords'])
     if labels == []:
         labels = ['pore.subdivided_' + new_net.name]
-    for P in pores:
-        # Shifting the new network to the right location and attaching it to
-        # the main network
-        shift = network['pore.coords'][P] - network_spacing/2
-        new_net['pore.coords'] += shift
-        Pn = network.find_neighbor_pores(pores=P)
-        try:
-            Pn_new_net = network.pores(labels)
-        except:
-            Pn_new_net = []
-        Pn_old_net = Pn[~_sp.in1d(Pn, Pn_new_net)]
-        Np1 = network.Np
-        extend(pore_coords=new_net['pore.coords'],
-               throat_conns=new_net['throat.conns'] + Np1,
-               labels=labels, network=network)
-
-        # Moving the temporary labels to the big network
-        for l in main_labels:
-            network['pore.surface_'+l][Np1:] = new_net['pore.surface_'+l]
-
-        # Stitching the old pores of the main network to the new extended pores
-        surf_pores = network.pores('surface_*')
-        surf_coord = network['pore.coords'][surf_pores]
-        for neighbor in Pn:
-            neighbor_coord = network['pore.coords'][neighbor]
-            dist = [round(_sp.inner(neighbor_coord-x, neighbor_coord-x),
-                          20) for x in surf_coord]
-            nearest_neighbor = surf_pores[dist == _sp.amin(dist)]
-            if neighbor in Pn_old_net:
-                coplanar_labels = network.labels(pores=nearest_neighbor)
-                new_neighbors = network.pores(coplanar_labels,
-                                              mode='intersection')
-                # This might happen to the edge of the small network
-                if _sp.size(new_neighbors) == 0:
-                    labels = network.labels(pores=nearest_neighbor,
-                                            mode='intersection')
-                    common_label = [l for l in labels if 'surface_' in l]
-                    new_neighbors = network.pores(common_label)
-            elif neighbor in Pn_new_net:
-                new_neighbors = nearest_neighbor
-            connect_pores(network=network, pores1=neighbor,
-                          pores2=new_neighbors, labels=labels)
-
-        # Removing temporary labels
-        for l in main_labels:
-            network['pore.surface_' + l] = False
-        new_net['pore.coords'] = _sp.copy(old_coords)
+    Np = network.Np
+    Nb = new_net.Np
+    # Work in the frame of a single block centred on the pore it replaces,
+    # which is the same for every subdivided pore
+    rel = new_net['pore.coords'] - network_spacing/2
+    S = _sp.vstack([new_net['pore.surface_'+l] for l in main_labels]).T
+    surf = _sp.where(S.any(axis=1))[0]
+    # The block of the i-th subdivided pore starts at pore Np + i*Nb
+    order = _sp.zeros((Np,), dtype=int) - 1
+    order[pores] = _sp.arange(_sp.size(pores))
+
+    def _nearest(d):
+        # Surface pores of the block nearest to a point at offset d
+        dist = _sp.sum((d - rel[surf])**2, axis=1)
+        return surf[_sp.isclose(dist, _sp.amin(dist), rtol=1e-9, atol=0)]
+
+    def _facing(d):
+        # All pores sharing the surfaces of the pores nearest to offset d
+        near = S[_nearest(d)]
+        found = _sp.where(S[:, near.any(axis=0)].all(axis=1))[0]
+        if _sp.size(found) == 0:  # This might happen at the block edges
+            found = _sp.where(S[:, near.all(axis=0)].any(axis=1))[0]
+        return found
+
+    # Find each subdivided pore and its neighbors on the original network
+    conns = network['throat.conns']
+    P = _sp.concatenate((conns[:, 0], conns[:, 1]))
+    Q = _sp.concatenate((conns[:, 1], conns[:, 0]))
+    hit = order[P] >= 0
+    P = P[hit]
+    Q = Q[hit]
+    # Unsubdivided neighbors connect to the whole facing side of a block,
+    # while a pair of subdivided pores connect their facing surface pores to
+    # their nearest counterparts, once per pair
+    old = order[Q] < 0
+    pairs = (order[Q] >= 0) & (order[Q] < order[P])
+    new_conns = []
+    d = network['pore.coords'][Q] - network['pore.coords'][P]
+    key = _sp.around(d/network_spacing, 6)
+    for mask, mirror in [(old, False), (pairs, True)]:
+        if not _sp.any(mask):
+            continue
+        Ps = P[mask]
+        Qs = Q[mask]
+        uniq, ind, inv = _sp.unique(key[mask], axis=0, return_index=True,
+                                    return_inverse=True)
+        for i in range(_sp.shape(uniq)[0]):
+            Pi = Np + order[Ps[inv == i]]*Nb
+            di = d[mask][ind[i]]
+            if not mirror:
+                face = _facing(di)
+                tails = _sp.repeat(Qs[inv == i], _sp.size(face))
+                heads = (Pi[:, _sp.newaxis] + face).ravel()
+            else:
+                Qi = Np + order[Qs[inv == i]]*Nb
+                faceQ = _facing(-di)
+                near = [_nearest(rel[j] + di) for j in faceQ]
+                local = _sp.concatenate(near)
+                counts = [_sp.size(n) for n in near]
+                tails = (Qi[:, _sp.newaxis] +
+                         _sp.repeat(faceQ, counts)).ravel()
+                heads = (Pi[:, _sp.newaxis] + local).ravel()
+            new_conns.append(_sp.vstack((tails, heads)).T)
+
+    # Enter all blocks and their connections in one step
+    N = _sp.size(pores)
+    offsets = Np + _sp.arange(N)*Nb
+    shift = network['pore.coords'][pores] - network_spacing/2
+    block_coords = new_net['pore.coords'] + shift[:, _sp.newaxis, :]
+    block_conns = (offsets[:, _sp.newaxis, _sp.newaxis] +
+                   new_net['throat.conns'])
+    extend(network=network, pore_coords=block_coords.reshape(-1, 3),
+           throat_conns=_sp.vstack([block_conns.reshape(-1, 2)] + new_conns),
+           labels=labels)
 
     network._label_surfaces()
-    for l in main_labels:
-        del network['pore.surface_'+l]
     trim(network=network, pores=pores)
-    _mgr.purge_object(obj=new_net, mode='complete')
+    new_net._workspace.purge_object(obj=new_net, mode='complete')
 
 
 def trim_occluded_throats(network, mask='all'):
@@ -676,8 +802,10 @@ def merge_pores(network, pores, labels=['merged']):
     ----------
     network : OpenPNM Network Object
 
-    pores : array_like
-        The list of pores which are to be combined into a new single pore
+    pores : array_like, or list of array_like
+        The list of pores which are to be combined into a new single pore.
+        Several groups can be merged at once by sending a list containing one
+        list of pores for each group.
 
     labels : string or list of strings
         The labels to apply to the new pore and new throat connections
@@ -690,6 +818,11 @@ def merge_pores(network, pores, labels=['merged']):
     certain distance of a given pore, and these can then be merged without
     causing any abnormal connections.
 
+    When several groups are given they must not share any pores, otherwise
+    an Exception is raised.  The result is the same as merging each group in
+    turn, with the new pores added in the order of the groups, but the
+    network is only extended and trimmed once.
+
     Examples
     --------
     >>> import OpenPNM as op
@@ -705,15 +838,36 @@ def merge_pores(network, pores, labels=['merged']):
     32
 
     """
-    Pn = network.find_neighbor_pores(pores=pores,
-                                     mode='union',
-                                     flatten=True,
-                                     excl_self=True)
-    xyz = _sp.mean(network['pore.coords'][pores], axis=0)
-    extend(network, pore_coords=xyz, labels=labels)
-    Pnew = network.Ps[-1]
-    connect_pores(network, pores1=Pnew, pores2=Pn, labels=labels)
-    trim(network=network, pores=pores)
+    if (_sp.size(pores) > 0) and (_sp.ndim(pores[0]) > 0):
+        groups = [network._parse_locations(Ps) for Ps in pores]
+    else:
+        groups = [network._parse_locations(pores)]
+    allPs = _sp.concatenate([_sp.unique(Ps) for Ps in groups])
+    if _sp.size(allPs) != _sp.size(_sp.unique(allPs)):
+        raise Exception('The groups of pores to merge must not overlap')
+    Np = network.Np
+    # Label each pore with the group it belongs to
+    group = _sp.zeros((Np,), dtype=int) - 1
+    for i, Ps in enumerate(groups):
+        group[Ps] = i
+    xyz = _sp.vstack([_sp.mean(network['pore.coords'][Ps], axis=0)
+                      for Ps in groups])
+    conns = []
+    for i, Ps in enumerate(groups):
+        Pn = network.find_neighbor_pores(pores=Ps,
+                                         mode='union',
+                                         flatten=True,
+                                         excl_self=True)
+        # Neighbors in an earlier group are replaced by that group's new
+        # pore, while those in a later group will connect to this one when
+        # it is merged
+        g = group[Pn]
+        Pn = _sp.where(g >= 0, Np + g, Pn)[g < i]
+        Pn = _sp.unique(Pn)
+        conns.append(_sp.vstack((_sp.ones_like(Pn)*(Np + i), Pn)).T)
+    extend(network, pore_coords=xyz, throat_conns=_sp.vstack(conns),
+           labels=labels)
+    trim(network=network, pores=_sp.concatenate(groups))
 
 
 def _template_sphere_disc(dim, outer_radius, inner_radius):
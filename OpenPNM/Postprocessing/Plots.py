@@ -276,14 +276,34 @@ def drainage_curves(inv_alg, fig=None, Pc='inv_Pc', sat='inv_sat',
     inv_alg : OpenPNM Algorithm Object
     The invasion algorithm for which the graphs are desired
 
+    Pc, sat, seq : string
+    The names of the throat arrays on ``inv_alg`` holding the invasion
+    pressure, saturation and sequence, without the 'throat.' prefix
+
     timing : string
     if algorithm keeps track of simulated time, insert string here
 
+    Notes
+    -----
+    If the algorithm provides a ``get_drainage_data`` method and ``Pc`` and
+    ``sat`` are left at their defaults, the capillary pressure curves are
+    plotted from the cumulative saturations it returns rather than from the
+    saturation stored on each invaded throat.
+
     """
     inv_throats = inv_alg.toindices(inv_alg['throat.' + seq] > 0)
     sort_seq = _sp.argsort(inv_alg['throat.'+seq][inv_throats])
     inv_throats = inv_throats[sort_seq]
 
+    defaults = (Pc == 'inv_Pc') and (sat == 'inv_sat')
+    if defaults and hasattr(inv_alg, 'get_drainage_data'):
+        data = inv_alg.get_drainage_data()
+        Pc_curve = _sp.array(data['capillary_pressure'])
+        sat_curve = _sp.array(data['invading_phase_saturation'])
+    else:
+        Pc_curve = inv_alg['throat.' + Pc][inv_throats]
+        sat_curve = inv_alg['throat.' + sat][inv_throats]
+
     if fig is None:
         fig = _plt.figure(num=1, figsize=(13, 10), dpi=80,
                           facecolor='w', edgecolor='k')
@@ -294,13 +314,11 @@ def drainage_curves(inv_alg, fig=None, Pc='inv_Pc', sat='inv_sat',
     ax5 = fig.add_subplot(235)   # middle
     ax6 = fig.add_subplot(236)   # right
 
-    ax1.plot(inv_alg['throat.' + Pc][inv_throats],
-             inv_alg['throat.' + sat][inv_throats])
+    ax1.plot(Pc_curve, sat_curve)
     ax1.set_xlabel('Capillary Pressure (Pa)')
     ax1.set_ylabel('Saturation')
     ax1.set_ylim([0, 1])
-    ax1.set_xlim([0.99*min(inv_alg['throat.' + Pc][inv_throats]),
-                  1.01*max(inv_alg['throat.' + Pc][inv_throats])])
+    ax1.set_xlim([0.99*min(Pc_curve), 1.01*max(Pc_curve)])
 
     ax2.plot(inv_alg['throat.' + seq][inv_throats],
              inv_alg['throat.' + sat][inv_throats])
@@ -320,13 +338,11 @@ def drainage_curves(inv_alg, fig=None, Pc='inv_Pc', sat='inv_sat',
         ax3.set_ylim([0, 1])
         ax3.set_xlim([0, 1.01*max(inv_alg['throat.' + timing][inv_throats])])
 
-    ax4.plot(inv_alg['throat.' + sat][inv_throats],
-             inv_alg['throat.' + Pc][inv_throats])
+    ax4.plot(sat_curve, Pc_curve)
     ax4.set_ylabel('Capillary Pressure (Pa)')
     ax4.set_xlabel('Saturation')
     ax4.set_xlim([0, 1])
-    ax4.set_ylim([0.99*min(inv_alg['throat.' + Pc][inv_throats]),
-                  1.01*max(inv_alg['throat.' + Pc][inv_throats])])
+    ax4.set_ylim([0.99*min(Pc_curve), 1.01*max(Pc_curve)])
 
     ax5.plot(inv_alg['throat.' + seq][inv_throats],
              inv_alg['throat.' + Pc][inv_throats])
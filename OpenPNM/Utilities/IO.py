@@ -1,6 +1,14 @@
+import io as _io
 import os as _os
+import re as _re
+import csv as _csv
+import zlib as _zlib
+import base64 as _base64
+import functools as _functools
+import collections as _collections
 import itertools as _itertools
 from xml.etree import ElementTree as _ET
+from xml.sax.saxutils import quoteattr as _quoteattr
 import scipy as _sp
 import numpy as _np
 import pandas as _pd
@@ -9,7 +17,6 @@ import OpenPNM
 from OpenPNM.Utilities import misc as _misc
 from OpenPNM.Base import logging
 logger = logging.getLogger(__name__)
-mgr = OpenPNM.Base.Workspace()
 
 
 class GenericIO():
@@ -53,7 +60,8 @@ class GenericIO():
         return geom
 
     @classmethod
-    def _update_network(cls, network, net, return_geometry=False):
+    def _update_network(cls, network, net, return_geometry=False,
+                        infer_types=True):
         # Infer Np and Nt from length of given prop arrays in file
         for element in ['pore', 'throat']:
             N = [_sp.shape(net[i])[0] for i in net.keys() if i.startswith(element)]
@@ -75,10 +83,11 @@ class GenericIO():
         for item in net.keys():
             # Try to infer array types and change if necessary
             # Chcek for booleans disguised and 1's and 0's
-            num0s = _sp.sum(net[item] == 0)
-            num1s = _sp.sum(net[item] == 1)
-            if (num1s + num0s) == _sp.shape(net[item])[0]:
-                net[item] = net[item].astype(bool)
+            if infer_types:
+                num0s = _sp.sum(net[item] == 0)
+                num1s = _sp.sum(net[item] == 1)
+                if (num1s + num0s) == _sp.shape(net[item])[0]:
+                    net[item] = net[item].astype(bool)
             # Write data to network object
             if item not in network:
                 network.update({item: net[item]})
@@ -119,8 +128,30 @@ class VTK(GenericIO):
     r"""
     Class for writing a Vtp file to be read by ParaView
 
+    Notes
+    -----
+    The data can be written as text (``'ascii'``), or in binary either
+    base64 encoded inside each DataArray (``'binary'``) or as raw bytes
+    appended to the end of the file (``'appended'``).  The binary formats are
+    much faster to write and read, so are recommended for large networks.
+    They can also be compressed with zlib to reduce the file size.
     """
 
+    _TYPES = {
+        'Int8': '<i1',
+        'Int16': '<i2',
+        'Int32': '<i4',
+        'Int64': '<i8',
+        'UInt8': '<u1',
+        'UInt16': '<u2',
+        'UInt32': '<u4',
+        'UInt64': '<u8',
+        'Float32': '<f4',
+        'Float64': '<f8',
+    }
+
+    _BLOCK_SIZE = 2**20  # Bytes per zlib block when compressing
+
     _TEMPLATE = '''
     <?xml version="1.0" ?>
     <VTKFile byte_order="LittleEndian" type="PolyData" version="0.1">
@@ -140,7 +171,8 @@ class VTK(GenericIO):
     '''.strip()
 
     @classmethod
-    def save(cls, network, filename='', phases=[], legacy=True):
+    def save(cls, network, filename='', phases=[], legacy=True,
+             fileformat='ascii', compress=False):
         r"""
         Save network and phase data to a single vtp file for visualizing in
         Paraview
@@ -166,6 +198,21 @@ class VTK(GenericIO):
             with existing code, such as Paraview State files.   Eventually,
             this option will be derprecated and removed.
 
+        fileformat : string
+            How the data arrays are written.  Options are:
+
+            **'ascii'** : (default) As text, which is human readable but slow
+            and large for big networks
+
+            **'binary'** : Base64 encoded inside each DataArray
+
+            **'appended'** : As raw bytes in an AppendedData section at the
+            end of the file, which is the fastest and most compact option
+
+        compress : boolean
+            If True the binary data are compressed with zlib.  This only
+            applies when ``fileformat`` is 'binary' or 'appended'.
+
         """
 
         if filename == '':
@@ -173,7 +220,6 @@ class VTK(GenericIO):
         if ~filename.endswith('.vtp'):
             filename = filename+'.vtp'
 
-        root = _ET.fromstring(VTK._TEMPLATE)
         objs = []
         if type(phases) != list:
             phases = [phases]
@@ -196,39 +242,37 @@ class VTK(GenericIO):
         num_points = _sp.shape(points)[0]
         num_throats = _sp.shape(pairs)[0]
 
-        piece_node = root.find('PolyData').find('Piece')
-        piece_node.set("NumberOfPoints", str(num_points))
-        piece_node.set("NumberOfLines", str(num_throats))
-
-        points_node = piece_node.find('Points')
-        coords = VTK._array_to_element("coords", points.T.ravel('F'), n=3)
-        points_node.append(coords)
-
-        lines_node = piece_node.find('Lines')
-        connectivity = VTK._array_to_element("connectivity", pairs)
-        lines_node.append(connectivity)
-        offsets = VTK._array_to_element("offsets", 2*_np.arange(len(pairs))+2)
-        lines_node.append(offsets)
-
-        point_data_node = piece_node.find('PointData')
+        # Collect the arrays for each section of the file
+        sections = [('Points', [('coords', points, 3)]),
+                    ('Lines', [('connectivity', pairs, 1),
+                               ('offsets', 2*_np.arange(len(pairs))+2, 1)]),
+                    ('PointData', []),
+                    ('CellData', [])]
         for key in key_list:
             array = am[key]
             if array.dtype == _np.bool:
                 array = array.astype(int)
-            if array.size != num_points:
-                continue
-            element = VTK._array_to_element(key, array)
-            point_data_node.append(element)
+            if array.size == num_points:
+                sections[2][1].append((key, array, 1))
+            if array.size == num_throats:
+                sections[3][1].append((key, array, 1))
+
+        if fileformat in ['binary', 'appended']:
+            cls._write_binary(filename, sections, num_points, num_throats,
+                              appended=(fileformat == 'appended'),
+                              compress=compress)
+            return
+        elif fileformat != 'ascii':
+            raise Exception(fileformat+' is not a valid VTK format')
 
-        cell_data_node = piece_node.find('CellData')
-        for key in key_list:
-            array = am[key]
-            if array.dtype == _np.bool:
-                array = array.astype(int)
-            if array.size != num_throats:
-                continue
-            element = VTK._array_to_element(key, array)
-            cell_data_node.append(element)
+        root = _ET.fromstring(VTK._TEMPLATE)
+        piece_node = root.find('PolyData').find('Piece')
+        piece_node.set("NumberOfPoints", str(num_points))
+        piece_node.set("NumberOfLines", str(num_throats))
+        for section, arrays in sections:
+            node = piece_node.find(section)
+            for name, array, n in arrays:
+                node.append(VTK._array_to_element(name, array, n=n))
 
         tree = _ET.ElementTree(root)
         tree.write(filename)
@@ -275,30 +319,36 @@ class VTK(GenericIO):
         net = {}
 
         filename = filename.rsplit('.', maxsplit=1)[0]
-        tree = _ET.parse(filename+'.vtp')
-        piece_node = tree.find('PolyData').find('Piece')
+        root, raw = VTK._parse_file(filename+'.vtp')
+        piece_node = root.find('PolyData').find('Piece')
+        decode = _functools.partial(VTK._element_to_array,
+                                    raw=raw,
+                                    header_type=root.get('header_type',
+                                                         'UInt32'),
+                                    compressed=root.get('compressor')
+                                    is not None)
 
         # Extract connectivity
         conn_element = piece_node.find('Lines').find('DataArray')
-        array = VTK._element_to_array(conn_element, 2)
+        array = decode(conn_element, 2)
         net.update({'throat.conns': array})
         # Extract coordinates
         coord_element = piece_node.find('Points').find('DataArray')
-        array = VTK._element_to_array(coord_element, 3)
+        array = decode(coord_element, 3)
         net.update({'pore.coords': array})
 
         # Extract pore data
         for item in piece_node.find('PointData').iter('DataArray'):
             key = item.get('Name')
             element = key.split('.')[0]
-            array = VTK._element_to_array(item)
+            array = decode(item)
             propname = key.split('.')[1]
             net.update({element+'.'+propname: array})
         # Extract throat data
         for item in piece_node.find('CellData').iter('DataArray'):
             key = item.get('Name')
             element = key.split('.')[0]
-            array = VTK._element_to_array(item)
+            array = decode(item)
             propname = key.split('.')[1]
             net.update({element+'.'+propname: array})
 
@@ -331,15 +381,187 @@ class VTK(GenericIO):
         return element
 
     @staticmethod
-    def _element_to_array(element, n=1):
-        string = element.text
+    def _element_to_array(element, n=1, raw=None, header_type='UInt32',
+                          compressed=False):
+        fmt = element.get('format', 'ascii')
         dtype = element.get("type")
-        array = _np.fromstring(string, sep='\t')
-        array = array.astype(dtype)
+        if fmt == 'ascii':
+            string = element.text
+            array = _np.fromstring(string, sep='\t')
+            array = array.astype(dtype)
+        else:
+            dtype = _np.dtype(VTK._TYPES[dtype])
+            header_type = _np.dtype(VTK._TYPES[header_type])
+            if fmt == 'appended':
+                offset = int(element.get('offset'))
+                buffer = raw[offset:]
+            else:
+                buffer = element.text.strip().encode('ascii')
+            data = VTK._decode(buffer, header_type, compressed,
+                               encoded=(fmt == 'binary'))
+            array = _np.frombuffer(data, dtype=dtype)
+            array = array.astype(dtype.newbyteorder('='))
         if n is not 1:
             array = array.reshape(array.size//n, n)
         return array
 
+    @classmethod
+    def _write_binary(cls, filename, sections, num_points, num_throats,
+                      appended=True, compress=False, cache=None):
+        r"""
+        Writes the arrays in each section of the file as binary data, with
+        each array streamed to disk rather than converted to text.  Arrays
+        already encoded by ``_encode`` can be given in ``cache``, keyed by
+        their name, to avoid encoding them again.
+        """
+        if cache is None:
+            cache = {}
+        fmt = 'appended' if appended else 'binary'
+        # Encode each array as its header followed by its data, which are
+        # written to disk without copying unless compressed
+        encoded = []
+        for section, arrays in sections:
+            for name, array, n in arrays:
+                if name in cache:
+                    encoded.append(cache[name])
+                else:
+                    encoded.append(cls._encode(array, compress))
+        offsets = _np.cumsum([0] + [sum(len(b) for b in item)
+                                    for item in encoded])
+        head = ['<?xml version="1.0" ?>',
+                '<VTKFile byte_order="LittleEndian"' +
+                (' compressor="vtkZLibDataCompressor"' if compress else '') +
+                ' header_type="UInt64" type="PolyData" version="1.0">',
+                '  <PolyData>',
+                '    <Piece NumberOfLines="{0}" NumberOfPoints="{1}">'
+                .format(num_throats, num_points)]
+        with open(filename, 'wb') as f:
+            f.write('\n'.join(head).encode())
+            i = 0
+            for section, arrays in sections:
+                f.write('\n      <{0}>'.format(section).encode())
+                for name, array, n in arrays:
+                    tag = ('\n        <DataArray Name={0} ' +
+                           'NumberOfComponents="{1}" format="{2}" ' +
+                           'type="{3}"').format(_quoteattr(name), n, fmt,
+                                                cls._vtk_type(array))
+                    if appended:
+                        f.write((tag+' offset="{0}"/>'.format(offsets[i]))
+                                .encode())
+                    else:
+                        f.write((tag+'>\n').encode())
+                        cls._write_base64(f, encoded[i], compress)
+                        f.write(b'\n        </DataArray>')
+                    i += 1
+                f.write('\n      </{0}>'.format(section).encode())
+            f.write(b'\n    </Piece>\n  </PolyData>')
+            if appended:
+                f.write(b'\n  <AppendedData encoding="raw">\n   _')
+                for item in encoded:
+                    for block in item:
+                        f.write(block)
+                f.write(b'\n  </AppendedData>')
+            f.write(b'\n</VTKFile>\n')
+
+    @classmethod
+    def _vtk_type(cls, array):
+        for key, value in cls._TYPES.items():
+            if _np.dtype(value) == array.dtype.newbyteorder('<'):
+                return key
+        raise Exception('Arrays of type '+str(array.dtype)+' cannot be ' +
+                        'written in binary format')
+
+    @classmethod
+    def _encode(cls, array, compress):
+        r"""
+        Returns a list containing the header and the data blocks of the
+        array, as stored in a binary VTK file with UInt64 headers.
+        """
+        array = _np.ascontiguousarray(array,
+                                      dtype=array.dtype.newbyteorder('<'))
+        data = array.reshape(-1).view(_np.uint8)
+        if not compress:
+            header = _np.array([data.size], dtype='<u8')
+            return [header.tobytes(), data]
+        B = cls._BLOCK_SIZE
+        blocks = [_zlib.compress(data[i:i+B]) for i in
+                  range(0, data.size, B)]
+        last = data.size - B*(len(blocks) - 1) if blocks else 0
+        header = _np.array([len(blocks), B, last] +
+                           [len(b) for b in blocks], dtype='<u8')
+        return [header.tobytes()] + blocks
+
+    @staticmethod
+    def _write_base64(f, encoded, compress, chunk=3*2**18):
+        if compress:
+            # The header and the compressed data are encoded separately
+            f.write(_base64.b64encode(encoded[0]))
+            f.write(_base64.b64encode(b''.join(encoded[1:])))
+            return
+        # The header and the data are encoded together, in chunks that are
+        # multiples of 3 bytes so no padding occurs until the end
+        header, data = encoded
+        first = chunk - len(header)
+        f.write(_base64.b64encode(header + data[:first].tobytes()))
+        for i in range(first, data.size, chunk):
+            f.write(_base64.b64encode(data[i:i+chunk]))
+
+    @staticmethod
+    def _decode(buffer, header_type, compressed, encoded=False):
+        r"""
+        Returns the raw bytes of one array from the start of ``buffer``, which
+        contains either raw bytes or base64 text.
+        """
+        size = header_type.itemsize
+
+        def read(start, nbytes):
+            if not encoded:
+                return bytes(buffer[start:start+nbytes])
+            # Decode complete groups of 4 characters only
+            return _base64.b64decode(buffer[start:start+4*(-(-nbytes//3))])
+
+        if not compressed:
+            if encoded:
+                data = _base64.b64decode(buffer)
+                return data[size:size+int(_np.frombuffer(data[:size],
+                                                         header_type)[0])]
+            nbytes = int(_np.frombuffer(read(0, size), header_type)[0])
+            return read(size, nbytes)
+        # Compressed arrays start with the number of blocks
+        nblocks = int(_np.frombuffer(read(0, 3*size)[:size], header_type)[0])
+        header_len = (3 + nblocks)*size
+        header = _np.frombuffer(read(0, header_len)[:header_len], header_type)
+        sizes = header[3:].astype(int)
+        if encoded:
+            start = 4*(-(-header_len//3))
+            data = _base64.b64decode(buffer[start:])
+            start = 0
+        else:
+            data = buffer
+            start = header_len
+        ends = start + _np.cumsum(sizes)
+        return b''.join(_zlib.decompress(data[a:b]) for a, b in
+                        zip(ends - sizes, ends))
+
+    @staticmethod
+    def _parse_file(filename):
+        r"""
+        Parses the XML part of a vtp file, and returns it along with the raw
+        appended data, if any.
+        """
+        with open(filename, 'rb') as f:
+            contents = f.read()
+        start = contents.find(b'<AppendedData')
+        if start < 0:
+            return _ET.fromstring(contents), None
+        tag = contents[start:contents.index(b'>', start)]
+        if b'raw' not in tag:
+            raise Exception('Only raw appended data is supported')
+        start = contents.index(b'_', start + len(tag)) + 1
+        end = contents.rindex(b'</AppendedData>')
+        root = _ET.fromstring(contents[:start-1] + contents[end:])
+        return root, memoryview(contents)[start:end]
+
 
 class Statoil(GenericIO):
     r"""
@@ -437,11 +659,18 @@ class Statoil(GenericIO):
             with cls._read_file(filename=filename, ext='dat') as f:
                 row_0 = f.readline().split()
                 num_lines = int(row_0[0])
-                array = _sp.ndarray([num_lines, 6])
-                for i in range(num_lines):
-                    row = f.readline()\
-                           .replace('\t', ' ').replace('\n', ' ').split()
-                    array[i, :] = row[0:6]
+                text = f.read()
+            # Rows vary in length, so all values are converted at once and
+            # the start of each row is found by counting the values per line
+            values = _sp.fromstring(text, sep=' ')
+            chars = _sp.frombuffer(text.encode(), dtype='u1')
+            blank = _sp.in1d(chars, [ord(c) for c in ' \t\r\n'])
+            first = ~blank & _sp.hstack([True, blank[:-1]])
+            line = _sp.cumsum(chars == ord('\n'))
+            counts = _sp.bincount(line[first])
+            counts = counts[counts > 0][:num_lines]
+            starts = _sp.cumsum(counts) - counts
+            array = values[starts.reshape(-1, 1) + _sp.arange(6)]
         node1 = _pd.DataFrame(array[:, [1, 2, 3, 4]])
         node1.columns = ['pore.x_coord', 'pore.y_coord', 'pore.z_coord',
                          'pore.coordination_number']
@@ -610,6 +839,374 @@ class MAT(GenericIO):
         return network
 
 
+class HDF5(GenericIO):
+    r"""
+    Class for saving and loading complete simulations to and from an HDF5 file
+
+    Notes
+    -----
+    Each object is written to its own group in the file, with one dataset per
+    ``pore.*`` or ``throat.*`` array, so the data can also be browsed with
+    any HDF5 viewer.  The relationships between the objects, along with their
+    pore-scale models, are pickled into the '.skeleton' dataset.  Any large
+    arrays held in the attributes of the objects, such as the Voronoi
+    vertices of a Delaunay network or the fibre image of a Voronoi geometry,
+    are written to their own datasets in the '.arrays' group rather than
+    pickled.  The cached adjacency and incidence matrices are not saved, and
+    are rebuilt when next needed.  The class of each object and the function
+    and arguments of each model are also written as plain text attributes for
+    reference.
+
+    When loading, only the size and type of each array is read at first.  The
+    data of an array is read from the file the first time it is accessed, so
+    very large simulations can be opened quickly.  Arrays held in attributes
+    are memory mapped from the file instead, unless they were compressed.
+    The file must therefore remain available until all the needed arrays have
+    been read.
+
+    This format requires the ``h5py`` package.
+    """
+    # Arrays larger than this are written to their own dataset when pickling
+    _skeleton_nbytes = 2**12
+
+    @classmethod
+    def save(cls, objects, filename, compression=None, compression_opts=None,
+             chunks=None):
+        r"""
+        Write a list of OpenPNM objects to an HDF5 file.
+
+        Parameters
+        ----------
+        objects : list of OpenPNM objects
+            The objects to write to the file.  This is usually all the objects
+            of a simulation, as returned by ``network._simulation()``.
+
+        filename : string
+            The name of the file to write.  The extension 'hdf5' is added if
+            not given.
+
+        compression : string, optional
+            The compression filter to apply to each dataset, such as 'gzip' or
+            'lzf'.  The default is no compression.
+
+        compression_opts : int, optional
+            Options for the compression filter, such as the level of 'gzip'
+            compression (0-9).
+
+        chunks : tuple or boolean, optional
+            The chunk shape to use for each dataset.  If ``True`` the chunk
+            shape is chosen automatically, which is also done when
+            ``compression`` is given.
+        """
+        import h5py
+        import dill
+        if not (filename.endswith('.hdf5') or filename.endswith('.h5')):
+            filename = filename + '.hdf5'
+        objects = list(objects)
+        f = h5py.File(filename, mode='w')
+        try:
+            f.attrs['version'] = OpenPNM.__version__
+            arrays = f.create_group('.arrays')
+
+            class Pickler(dill.Pickler):
+                def persistent_id(self, obj):
+                    # Write large arrays to datasets instead of the pickle
+                    if type(obj) in [_np.ndarray, _np.memmap] and \
+                            obj.dtype.kind not in 'OU' and \
+                            obj.nbytes > cls._skeleton_nbytes:
+                        key = str(len(arrays))
+                        cls._write_array(arrays, key, obj, compression,
+                                         compression_opts, chunks)
+                        return key
+                    return None
+
+            # Pickle the objects without their arrays or cached matrices to
+            # store the object graph
+            contents = [dict(obj) for obj in objects]
+            caches = [{item: obj.__dict__[item] for item in
+                       ['_adjacency_matrix', '_incidence_matrix']
+                       if item in obj.__dict__} for obj in objects]
+            buffer = _io.BytesIO()
+            try:
+                for obj, cache in zip(objects, caches):
+                    dict.clear(obj)
+                    obj.__dict__.update({item: {} for item in cache})
+                Pickler(buffer).dump(objects)
+            finally:
+                for obj, data, cache in zip(objects, contents, caches):
+                    dict.update(obj, data)
+                    obj.__dict__.update(cache)
+            f.create_dataset('.skeleton', data=_np.void(buffer.getvalue()))
+            for obj, data in zip(objects, contents):
+                grp = f.create_group(obj.name)
+                grp.attrs['class'] = obj.__class__.__module__ + '.' + \
+                    obj.__class__.__name__
+                for key in data.keys():
+                    cls._write_array(grp, key, _np.asarray(data[key]),
+                                     compression, compression_opts, chunks)
+                models = grp.create_group('models')
+                for propname, model in obj.models.items():
+                    cls._write_model(models.create_group(propname), model)
+        finally:
+            f.close()
+
+    @classmethod
+    def load(cls, filename, lazy=True):
+        r"""
+        Read a list of OpenPNM objects from an HDF5 file written by ``save``.
+
+        Parameters
+        ----------
+        filename : string
+            The name of the file to read
+
+        lazy : boolean, optional
+            If ``True`` (default) each array is read from the file the first
+            time it is accessed.  If ``False`` all arrays are read immediately.
+
+        Returns
+        -------
+        A list of the objects stored in the file.  These objects are not added
+        to the Workspace, which is done by ``Workspace.load_simulation``.
+        """
+        import h5py
+        import dill
+        from functools import partial
+        if not _os.path.isfile(filename):
+            filename = filename + '.hdf5'
+        filename = _os.path.abspath(filename)
+        f = h5py.File(filename, mode='r')
+        try:
+
+            class Unpickler(dill.Unpickler):
+                def persistent_load(self, key):
+                    dset = f['.arrays'][key]
+                    offset = dset.id.get_offset()
+                    if lazy and offset is not None:
+                        return _np.memmap(filename, dtype=dset.dtype, mode='c',
+                                          offset=offset, shape=dset.shape)
+                    return dset[()]
+
+            skeleton = f['.skeleton'][()].tostring()
+            objects = Unpickler(_io.BytesIO(skeleton)).load()
+            for obj in objects:
+                grp = f[obj.name]
+                for key in grp.keys():
+                    if key == 'models':
+                        continue
+                    dset = grp[key]
+                    if dset.attrs.get('pickled', False) or not lazy:
+                        value = cls._read_array(filename, dset.name, f)
+                    else:
+                        loader = partial(cls._read_array, filename, dset.name)
+                        value = OpenPNM.Base.Tools.LazyArray(
+                            loader=loader, shape=dset.shape, dtype=dset.dtype)
+                    dict.__setitem__(obj, key, value)
+        finally:
+            f.close()
+        return objects
+
+    @staticmethod
+    def _write_array(grp, key, arr, compression, compression_opts, chunks):
+        if arr.dtype.kind in 'OU':
+            # Object and unicode arrays have no HDF5 equivalent
+            import dill
+            dset = grp.create_dataset(key, data=_np.void(dill.dumps(arr)))
+            dset.attrs['pickled'] = True
+        elif arr.size == 0:
+            grp.create_dataset(key, data=arr)
+        else:
+            grp.create_dataset(key, data=arr, compression=compression,
+                               compression_opts=compression_opts,
+                               chunks=chunks)
+
+    @staticmethod
+    def _read_array(filename, path, f=None):
+        import h5py
+        if f is None:
+            with h5py.File(filename, mode='r') as f:
+                return HDF5._read_array(filename, path, f)
+        dset = f[path]
+        if dset.attrs.get('pickled', False):
+            import dill
+            return dill.loads(dset[()].tostring())
+        return dset[()]
+
+    @staticmethod
+    def _write_model(grp, model):
+        func = model['model']
+        grp.attrs['model'] = func.__module__ + '.' + func.__name__
+        for key, value in model.items():
+            if key in model.COMPONENTS:
+                continue
+            if isinstance(value, (str, int, float, bool)):
+                grp.attrs[key] = value
+
+
+class VTKSeries():
+    r"""
+    Writes a series of frames to be animated in Paraview, such as the
+    progress of an invasion or a transient simulation.  Each frame is a vtp
+    file holding the current values of the requested properties, and the
+    frames are listed in a 'pvd' collection file that Paraview opens as a
+    single time series.
+
+    Parameters
+    ----------
+    network : OpenPNM Network Object
+        The Network whose pores and throats are shown
+
+    filename : string, optional
+        The name of the 'pvd' file.  The frames are named after it with the
+        frame number appended.  Defaults to the name of the network.
+
+    objects : list of OpenPNM Objects
+        The objects holding the changing properties, such as an Algorithm or
+        a Phase.  The Network is used if none are given.
+
+    props : list of strings
+        The properties to write in each frame, such as
+        ``['pore.occupancy', 'throat.occupancy']``.  Properties not found on
+        an object are skipped.  The names in the file are the same as those
+        given by ``VTK.save`` with ``legacy=False``.
+
+    fileformat : string
+        Either 'appended' (default) or 'binary', as described in ``VTK.save``
+
+    compress : boolean
+        If True the data are compressed with zlib
+
+    Notes
+    -----
+    The vtp format cannot refer to data in another file, so each frame also
+    contains the pore coordinates and throat connections.  These are only
+    encoded once, when the series is created, and copied into each frame as
+    is, while only the requested properties are encoded for each frame.  The
+    'pvd' file is updated after every frame, so the results can be viewed
+    while the simulation is still running.  The topology of the network must
+    not change while the series is being written.
+
+    Examples
+    --------
+    >>> import OpenPNM
+    >>> import OpenPNM.Utilities.IO as io
+    >>> pn = OpenPNM.Network.Cubic(shape=[5, 5, 5])
+    >>> geom = OpenPNM.Geometry.Toray090(network=pn, pores=pn.Ps,
+    ...                                  throats=pn.Ts)
+    >>> water = OpenPNM.Phases.Water(network=pn)
+    >>> phys = OpenPNM.Physics.Standard(network=pn, phase=water,
+    ...                                 pores=pn.Ps, throats=pn.Ts)
+    >>> ip = OpenPNM.Algorithms.InvasionPercolation(network=pn)
+    >>> ip.setup(phase=water)
+    >>> ip.set_inlets(pores=pn.pores('top'))
+    >>> import os, shutil, tempfile
+    >>> path = tempfile.mkdtemp()
+    >>> series = io.VTKSeries(network=pn, filename=os.path.join(path, 'ip'),
+    ...                       objects=[ip],
+    ...                       props=['pore.invasion_sequence',
+    ...                              'throat.invasion_sequence'])
+    >>> while len(ip.queue) > 0:
+    ...     ip.run(n_steps=50)
+    ...     fname = series.write()
+    >>> len(series.frames) > 1
+    True
+    >>> shutil.rmtree(path)
+    """
+
+    def __init__(self, network, filename='', objects=None, props=None,
+                 fileformat='appended', compress=False):
+        if objects is None:
+            objects = []
+        if props is None:
+            props = []
+        if filename == '':
+            filename = network.name
+        filename = filename.rsplit('.pvd', 1)[0]
+        if fileformat not in ['binary', 'appended']:
+            raise Exception(fileformat+' is not a valid format for a series')
+        if type(objects) is not list:
+            objects = [objects]
+        if type(props) is str:
+            props = [props]
+        self._net = network
+        self._objects = objects if objects else [network]
+        self._props = props
+        self._appended = (fileformat == 'appended')
+        self._compress = compress
+        self.filename = filename
+        self.frames = []
+        # Encode the topology once for all frames
+        points = network['pore.coords']
+        pairs = network['throat.conns']
+        self._geometry = [('Points', [('coords', points, 3)]),
+                          ('Lines', [('connectivity', pairs, 1),
+                                     ('offsets',
+                                      2*_np.arange(len(pairs))+2, 1)])]
+        self._cache = {name: VTK._encode(array, compress)
+                       for section, arrays in self._geometry
+                       for name, array, n in arrays}
+        self._Np = _sp.shape(points)[0]
+        self._Nt = _sp.shape(pairs)[0]
+
+    def write(self, time=None):
+        r"""
+        Write the current values of the properties as the next frame
+
+        Parameters
+        ----------
+        time : scalar, optional
+            The time of the frame, as shown in Paraview.  Defaults to the
+            frame number.
+
+        Returns
+        -------
+        The name of the vtp file written for the frame
+        """
+        if time is None:
+            time = len(self.frames)
+        point_data = []
+        cell_data = []
+        for obj in self._objects:
+            for prop in self._props:
+                if prop not in obj.keys():
+                    continue
+                array = obj[prop]
+                if array.dtype == _np.bool:
+                    array = array.astype(int)
+                name = prop
+                if obj is not self._net:
+                    name = prop+'|'+obj.name
+                if prop.startswith('pore') and array.size == self._Np:
+                    point_data.append((name, array, 1))
+                elif prop.startswith('throat') and array.size == self._Nt:
+                    cell_data.append((name, array, 1))
+        sections = self._geometry + [('PointData', point_data),
+                                     ('CellData', cell_data)]
+        fname = '{0}_{1}.vtp'.format(self.filename, len(self.frames))
+        VTK._write_binary(fname, sections, self._Np, self._Nt,
+                          appended=self._appended, compress=self._compress,
+                          cache=self._cache)
+        self.frames.append((time, fname))
+        self._write_collection()
+        return fname
+
+    def _write_collection(self):
+        path = _os.path.dirname(_os.path.abspath(self.filename))
+        lines = ['<?xml version="1.0" ?>',
+                 '<VTKFile byte_order="LittleEndian" type="Collection"' +
+                 ' version="0.1">',
+                 '  <Collection>']
+        for time, fname in self.frames:
+            fname = _os.path.relpath(_os.path.abspath(fname), path)
+            lines.append('    <DataSet file={0} group="" part="0"'
+                         ' timestep="{1}"/>'.format(_quoteattr(fname),
+                                                    repr(float(time))))
+        lines.append('  </Collection>')
+        lines.append('</VTKFile>')
+        with open(self.filename+'.pvd', 'w') as f:
+            f.write('\n'.join(lines)+'\n')
+
+
 class Pandas():
 
     @staticmethod
@@ -712,10 +1309,17 @@ class CSV(GenericIO):
     5. Labels can be imported by placing the characters TRUE and FALSE
     in a column corresponding to the label name (i.e. *pore.front*).  TRUE
     indicates where the label applies and FALSE otherwise.
+
+    6. The data type of a column can be given after a colon in its header,
+    such as *pore.volume:float64*, in which case the column is read directly
+    with that type.  Np x m data can then be given as m separate columns
+    named *pore.coords[0]:float64*, *pore.coords[1]:float64* and so on.
+    This is the format written by ``save``.
     """
 
     @classmethod
-    def save(cls, network, filename='', phases=[]):
+    def save(cls, network, filename='', phases=[], split=False,
+             chunksize=100000):
         r"""
         Save all the pore and throat property data on the Network (and
         optionally on any Phases objects) to CSV files.
@@ -731,25 +1335,45 @@ class CSV(GenericIO):
         phases : list of OpenPNM Phase Objects
             The data on each supplied phase will be added to the CSV file.
 
+        split : boolean
+            If False (default) the pore and throat data are written side by
+            side in a single file.  If True they are written to separate files
+            named *filename_pore.csv* and *filename_throat.csv*.
+
+        chunksize : int
+            The number of rows converted to text and written at a time.  The
+            data are streamed to the file in blocks of this size, so the
+            memory used does not grow with the size of the Network.
+
         Notes
         -----
         The data from all Geometry objects is added to the file automatically.
         Furthermore, the Physics data is added for each Phase object that is
         provided.
+
+        The data type of each column is written in its header, such as
+        *pore.volume:float64*, so that it can be restored exactly by ``load``.
+        Multi-column data like *pore.coords* is written as one column per
+        component, named *pore.coords[0]:float64* and so on, and labels are
+        written as 1's and 0's.
         """
         if type(phases) is not list:  # Ensure it's a list
             phases = [phases]
-
-        dataframes = Pandas.get_data_frames(network=network, phases=phases)
-        dfp = dataframes['pore.DataFrame']
-        dft = dataframes['throat.DataFrame']
-        b = dft.join(other=dfp, how='left')
-
-        # Write to file
         if filename == '':
             filename = network.name
-        with cls._write_file(filename=filename, ext='csv') as f:
-            b.to_csv(f, index=False)
+        if filename.endswith('.csv'):
+            filename = filename[:-4]
+
+        columns = cls._get_columns(network=network, phases=phases)
+        if split:
+            for element in ['pore', 'throat']:
+                with cls._write_file(filename=filename+'_'+element,
+                                     ext='csv') as f:
+                    cls._write_columns(f, columns[element], chunksize)
+        else:
+            with cls._write_file(filename=filename, ext='csv') as f:
+                cls._write_columns(f, columns['pore'] + columns['throat'],
+                                   chunksize)
 
     @classmethod
     def load(cls, filename, network=None, return_geometry=False):
@@ -760,7 +1384,9 @@ class CSV(GenericIO):
         ----------
         filename : string (optional)
             The name of the file containing the data to import.  The formatting
-            of this file is outlined below.
+            of this file is outlined below.  If the file does not exist but
+            files written by ``save`` with ``split=True`` do, then both the
+            pore and throat files are read.
 
         network : OpenPNM Network Object
             The Network object onto which the data should be loaded.  If no
@@ -783,43 +1409,160 @@ class CSV(GenericIO):
         If return_geometry is True, then a tuple is returned containing both
         the network and a geometry object.
 
+        Notes
+        -----
+        Columns whose headers include a data type, as written by ``save``, are
+        read directly with that type.  Otherwise the type is inferred from the
+        data.
         """
         net = {}
 
-        with cls._read_file(filename=filename, ext='csv') as f:
-            a = _pd.read_table(filepath_or_buffer=f,
-                               sep=',',
-                               skipinitialspace=True,
-                               index_col=False,
-                               true_values=['T', 't', 'True', 'true',
-                                            'TRUE'],
-                               false_values=['F', 'f', 'False', 'false',
-                                             'FALSE'])
+        if filename.endswith('.csv'):
+            filename = filename[:-4]
+        filenames = [filename]
+        if not _os.path.isfile(filename+'.csv'):
+            split = [filename+'_pore', filename+'_throat']
+            if all([_os.path.isfile(i+'.csv') for i in split]):
+                filenames = split
+
+        typed = True
+        for filename in filenames:
+            with cls._read_file(filename=filename, ext='csv') as f:
+                header = next(_csv.reader(f))
+                f.seek(0)
+                dtypes = cls._parse_header(header)
+                a = _pd.read_table(filepath_or_buffer=f,
+                                   sep=',',
+                                   skipinitialspace=True,
+                                   index_col=False,
+                                   dtype=dtypes,
+                                   float_precision='round_trip',
+                                   true_values=['T', 't', 'True', 'true',
+                                                'TRUE'],
+                                   false_values=['F', 'f', 'False', 'false',
+                                                 'FALSE'])
+            typed = typed and (len(dtypes) == len(header))
+
+            # Find the number of rows of each element, since the columns of
+            # the shorter element are padded with blanks
+            rows = {}
+            for item in a.keys():
+                element = item.split('.')[0]
+                last = a[item].last_valid_index()
+                N = 0 if last is None else last + 1
+                rows[element] = max(rows.get(element, 0), N)
+
+            # Collect the typed columns, stacking multi-column properties
+            stacks = {}
+            for item in a.keys():
+                if item not in dtypes:
+                    continue
+                name, dtype = item.rsplit(':', 1)
+                dtype = str if dtype == 'str' else _sp.dtype(dtype)
+                N = rows[item.split('.')[0]]
+                data = _sp.array(a[item].values[:N]).astype(dtype)
+                match = _re.match(r'(.*)\[(\d+)\]$', name)
+                if match:
+                    name, col = match.group(1), int(match.group(2))
+                    stacks.setdefault(name, {})[col] = data
+                else:
+                    net[name] = data
+            for name, cols in stacks.items():
+                net[name] = _sp.column_stack([cols[i] for i in sorted(cols)])
+
+            # Now parse through all the other items
+            for item in a.keys():
+                if item in dtypes:
+                    continue
+                element = item.split('.')[0]
+                prop = item.split('.', maxsplit=1)[1]
+                data = _sp.array(a[item].values[:rows[element]])
+                if type(data[0]) is str:
+                    N = _sp.shape(data)[0]
+                    if '.' in data[0].split(' ')[0]:  # Decimal means float
+                        dtype = float
+                    else:
+                        dtype = int
+                    data = _sp.fromstring(' '.join(data), sep=' ',
+                                          dtype=dtype).reshape((N, -1))
+                else:
+                    dtype = type(data[0])
+                net[element+'.'+prop] = data.astype(dtype)
 
-        # Now parse through all the other items
-        for item in a.keys():
+            if network is None:
+                network = OpenPNM.Network.GenericNetwork()
+            network = cls._update_network(network=network, net=net,
+                                          infer_types=not typed)
+            net = {}
+
+        if return_geometry:
+            network = (network, cls.split_geometry(network))
+        return network
+
+    @staticmethod
+    def _get_columns(network, phases):
+        r"""
+        Gather the data to write as a list of (header, array) columns for
+        each element, splitting multi-column arrays into one column each.
+        """
+        data = {}
+        for obj in [network] + phases:
+            suffix = '' if obj is network else '|'+obj.name
+            for item in obj.props(mode=['all', 'deep']) + obj.labels():
+                data[item+suffix] = obj[item]
+        columns = {'pore': [], 'throat': []}
+        for item in sorted(data.keys()):
+            array = _sp.asarray(data[item])
+            dtype = array.dtype.name if array.dtype.kind in 'biuf' else 'str'
             element = item.split('.')[0]
-            prop = item.split('.', maxsplit=1)[1]
-            data = _sp.array(a[item].dropna())
-            if type(data[0]) is str:
-                N = _sp.shape(data)[0]
-                if '.' in data[0].split(' ')[0]:  # Decimal means float
-                    dtype = float
-                else:
-                    dtype = int
-                temp = _sp.empty(_sp.shape(data), dtype=object)
-                for row in range(N):
-                    temp[row] = _sp.fromstring(data[row], sep=' ', dtype=dtype)
-                data = _sp.vstack(temp)
+            if array.ndim == 1:
+                columns[element].append((item+':'+dtype, array))
             else:
-                dtype = type(data[0])
-            net[element+'.'+prop] = data.astype(dtype)
+                array = _sp.reshape(array, (_sp.shape(array)[0], -1))
+                for i in range(_sp.shape(array)[1]):
+                    header = '{0}[{1}]:{2}'.format(item, i, dtype)
+                    columns[element].append((header, array[:, i]))
+        return columns
 
-        if network is None:
-            network = OpenPNM.Network.GenericNetwork()
-        network = cls._update_network(network=network, net=net,
-                                      return_geometry=return_geometry)
-        return network
+    @staticmethod
+    def _write_columns(f, columns, chunksize):
+        r"""
+        Write the given columns to an open file, converting only ``chunksize``
+        rows to text at a time.  Shorter columns are padded with blanks.
+        """
+        writer = _csv.writer(f, lineterminator='\n')
+        writer.writerow([header for header, array in columns])
+        N = max([_sp.shape(array)[0] for header, array in columns] + [0])
+        for start in range(0, N, chunksize):
+            block = []
+            for header, array in columns:
+                chunk = array[start:start+chunksize]
+                if chunk.dtype.kind == 'b':
+                    chunk = chunk.astype(_sp.int8)
+                block.append(chunk.tolist())
+            writer.writerows(_itertools.zip_longest(*block, fillvalue=''))
+
+    @staticmethod
+    def _parse_header(header):
+        r"""
+        Find the data type of each typed column header.  Integer and boolean
+        columns are read as floats when pore and throat data share the file,
+        since the shorter columns are padded with blanks.
+        """
+        typed = [h for h in header if _re.match(r'.+:\w+$', h)]
+        mixed = len(set([h.split('.')[0] for h in header])) > 1
+        dtypes = {}
+        for item in typed:
+            dtype = item.rsplit(':', 1)[1]
+            if dtype == 'str':
+                dtypes[item] = str
+            elif _sp.dtype(dtype).kind == 'f':
+                dtypes[item] = _sp.dtype(dtype)
+            elif mixed or _sp.dtype(dtype).kind == 'b':
+                dtypes[item] = _sp.float64
+            else:
+                dtypes[item] = _sp.dtype(dtype)
+        return dtypes
 
 
 class NetworkX(GenericIO):
@@ -885,8 +1628,6 @@ class NetworkX(GenericIO):
         the network and a geometry object.
 
         """
-        net = {}
-
         # Open file and read first line, to prevent NetworkX instantiation
         with cls._read_file(filename=filename, ext='yaml') as f:
             line = f.readline()
@@ -894,69 +1635,187 @@ class NetworkX(GenericIO):
                 a = _yaml.safe_load(f)
             else:
                 raise ('Provided file does not appear to be a NetworkX file')
+        net = cls._dicts_to_net(nodes=a['node'], adj=a['edge'])
+
+        if network is None:
+            network = OpenPNM.Network.GenericNetwork()
+        network = cls._update_network(network=network, net=net,
+                                      return_geometry=return_geometry)
+        return network
+
+    @classmethod
+    def save(cls, network, filename='', phases=[]):
+        r"""
+        Write the Network (and optionally Phase) data to a YAML file that can
+        be read by NetworkX using ``networkx.read_yaml``, or by ``load``.
+
+        Parameters
+        ----------
+        network : OpenPNM Network Object
+            The Network containing the data to be written
+
+        filename : string
+            Desired file name, defaults to network name if not given
+
+        phases : list of phase objects ([])
+            Phases that have properties we want to write to file
+        """
+        if filename == '':
+            filename = network.name
+        filename = filename.replace('.yaml', '') + '.yaml'
+        graph = cls.to_graph(network=network, phases=phases)
+        # Write only the graph data, in the layout expected by load
+        adj = {n: dict(graph.adj[n]) for n in graph.adj.keys()}
+        state = {'graph': graph.graph,
+                 'node': dict(graph.nodes(data=True)),
+                 'adj': adj,
+                 'edge': adj}
+        with open(filename, 'w') as f:
+            f.write('!!python/object:networkx.classes.graph.Graph\n')
+            _yaml.safe_dump(state, f)
+
+    @classmethod
+    def from_graph(cls, graph, network=None, return_geometry=False):
+        r"""
+        Add data to an OpenPNM Network from a NetworkX graph object.
+
+        Parameters
+        ----------
+        graph : NetworkX Graph
+            The graph to convert.  The nodes must be numbered from 0 to N-1.
 
+        network : OpenPNM Network Object
+            The OpenPNM Network onto which the data should be loaded.  If no
+            Network is supplied then an empty Import Network is created and
+            returned.
+
+        return_geometry : Boolean
+            If True, then all geometrical related properties are removed from
+            the Network object and added to a GenericGeometry object.
+
+        Returns
+        -------
+        If no Network object is supplied then one will be created and returned.
+
+        If return_geometry is True, then a tuple is returned containing both
+        the network and a geometry object.
+        """
+        net = cls._dicts_to_net(nodes=dict(graph.nodes(data=True)),
+                                adj=graph.adj)
+        if network is None:
+            network = OpenPNM.Network.GenericNetwork()
+        network = cls._update_network(network=network, net=net,
+                                      return_geometry=return_geometry)
+        return network
+
+    @classmethod
+    def to_graph(cls, network, phases=[]):
+        r"""
+        Create a NetworkX graph from an OpenPNM Network, with the pore and
+        throat data as node and edge attributes.
+
+        Parameters
+        ----------
+        network : OpenPNM Network Object
+            The Network to convert
+
+        phases : list of phase objects ([])
+            Phases whose properties should also be added to the graph.  Their
+            names are appended to the attribute names as in ``'viscosity|air'``
+
+        Returns
+        -------
+        A NetworkX Graph with the node numbers equal to the pore indices
+        """
+        import networkx as nx
+        if type(phases) is not list:  # Ensure it's a list
+            phases = [phases]
+        data = {i: network[i] for i in
+                network.props(mode=['all', 'deep']) + network.labels()}
+        for phase in phases:
+            data.update({i+'|'+phase.name: phase[i] for i in
+                         phase.props(mode=['all', 'deep']) + phase.labels()})
+        graph = nx.Graph()
+        for element in ['pore', 'throat']:
+            keys = [k for k in sorted(data.keys()) if k.startswith(element)
+                    and k not in ['pore.all', 'throat.all', 'throat.conns']]
+            # Convert each array to a list of Python values in one call,
+            # then build the attribute dicts of all nodes or edges at once
+            names = [k.split('.', 1)[1] for k in keys]
+            cols = [_sp.asarray(data[k]).tolist() for k in keys]
+            attrs = [dict(zip(names, row)) for row in zip(*cols)]
+            if not attrs:
+                attrs = [{} for i in range(network._count(element))]
+            if element == 'pore':
+                graph.add_nodes_from(zip(range(network.Np), attrs))
+            else:
+                conns = network['throat.conns']
+                graph.add_edges_from(zip(conns[:, 0].tolist(),
+                                         conns[:, 1].tolist(), attrs))
+        return graph
+
+    @staticmethod
+    def _dicts_to_net(nodes, adj):
+        r"""
+        Convert the node and adjacency dicts of a NetworkX graph into a dict
+        of OpenPNM arrays, extracting each attribute for all nodes or edges
+        at once.
+        """
+        net = {}
         # Parsing node data
-        Np = len(a['node'])
+        Np = len(nodes)
         net.update({'pore.all': _sp.ones((Np,), dtype=bool)})
-        for n in a['node'].keys():
-            props = a['node'][n]
-            for item in props.keys():
-                val = a['node'][n][item]
-                dtype = type(val)
-                # Remove prepended pore. and pore_ if present
-                for b in ['pore.', 'pore_']:
-                    item = item.replace(b, '')
-                # Create arrays for subsequent indexing, if not present already
-                if 'pore.'+item not in net.keys():
-                    if dtype is list:
-                        dtype = type(val[0])
-                        cols = len(val)
-                        net['pore.'+item] = _sp.ndarray((Np, cols), dtype=dtype)
-                    else:
-                        net['pore.'+item] = _sp.ndarray((Np,), dtype=dtype)
-                net['pore.'+item][n] = val
+        inds = _sp.fromiter(nodes.keys(), dtype=int, count=Np)
+        props = list(nodes.values())
+        for item, vals in NetworkX._collect(props).items():
+            # Remove prepended pore. and pore_ if present
+            for b in ['pore.', 'pore_']:
+                item = item.replace(b, '')
+            arr = _sp.array(vals)
+            net['pore.'+item] = _sp.empty_like(arr)
+            net['pore.'+item][inds] = arr
 
         # Parsing edge data
-        # Deal with conns explicitly
-
-        conns = []
-        for n in a['edge'].keys():
-            neighbors = a['edge'][n].keys()
-            conns.extend([sorted([i, n]) for i in neighbors])
-        # Remove duplicate pairs from conns and sort
-        conns.sort()
-        conns = list(conns for conns, _ in _itertools.groupby(conns))
+        # Deal with conns explicitly, storing each pair once and sorted
+        keys = list(adj.keys())
+        lens = [len(adj[n]) for n in keys]
+        P1 = _sp.repeat(_sp.array(keys, dtype=int), lens)
+        nbrs = _itertools.chain.from_iterable(adj[n].keys() for n in keys)
+        P2 = _sp.fromiter(nbrs,
+                          dtype=int, count=sum(lens))
+        data = list(_itertools.chain.from_iterable(adj[n].values()
+                                                   for n in keys))
+        conns = _sp.sort(_sp.vstack((P1, P2)).T, axis=1).reshape((-1, 2))
+        order = _sp.lexsort((conns[:, 1], conns[:, 0]))
+        conns = conns[order]
+        if len(conns) > 1:
+            keep = _sp.any(conns[1:] != conns[:-1], axis=1)
+            keep = _sp.hstack(([True], keep))
+            conns = conns[keep]
+            order = order[keep]
         # Add conns to Network
         Nt = len(conns)
         net.update({'throat.all': _sp.ones(Nt, dtype=bool)})
-        net.update({'throat.conns': _sp.array(conns)})
-
-        # Scan through each edge and extract all its properties
-        i = 0
-        for t in conns:
-            props = a['edge'][t[0]][t[1]]
-            for item in props:
-                val = props[item]
-                dtype = type(val)
-                # Remove prepended throat. and throat_ if present
-                for b in ['throat.', 'throat_']:
-                    item = item.replace(b, '')
-                # Create arrays for subsequent indexing, if not present already
-                if 'throat.'+item not in net.keys():
-                    if dtype is list:
-                        dtype = type(val[0])
-                        cols = len(val)
-                        net['throat.'+item] = _sp.ndarray((Nt, cols), dtype=dtype)
-                    else:
-                        net['throat.'+item] = _sp.ndarray((Nt,), dtype=dtype)
-                net['throat.'+item][i] = val
-            i += 1
+        net.update({'throat.conns': conns})
 
-        if network is None:
-            network = OpenPNM.Network.GenericNetwork()
-        network = cls._update_network(network=network, net=net,
-                                      return_geometry=return_geometry)
-        return network
+        # Extract all the properties of each edge
+        props = [data[i] for i in order.tolist()]
+        for item, vals in NetworkX._collect(props).items():
+            # Remove prepended throat. and throat_ if present
+            for b in ['throat.', 'throat_']:
+                item = item.replace(b, '')
+            net['throat.'+item] = _sp.array(vals)
+        return net
+
+    @staticmethod
+    def _collect(props):
+        r"""
+        Turn a list of attribute dicts into a dict of lists of values, with
+        ``nan`` wherever an attribute is missing.
+        """
+        names = _collections.OrderedDict.fromkeys(
+            _itertools.chain.from_iterable(props))
+        return {k: [d.get(k, _sp.nan) for d in props] for k in names}
 
 
 class iMorph(GenericIO):
@@ -1017,9 +1876,8 @@ class iMorph(GenericIO):
         graph_file = _os.path.join(path, graph_file)
         # parsing the nodes file
         with open(node_file, 'r') as file:
-            Np = _sp.fromstring(file.readline().rsplit('=')[1], sep='\t',
-                                dtype=int)[0]
-            vox_size = _sp.fromstring(file.readline().rsplit(')')[1], sep='\t',)[0]
+            Np = int(file.readline().rsplit('=')[1])
+            vox_size = float(file.readline().rsplit(')')[1])
             #
             # network always recreated to prevent errors
             network = OpenPNM.Network.Empty(Np=Np, Nt=0)
@@ -1027,14 +1885,16 @@ class iMorph(GenericIO):
             # Define expected properies
             network['pore.volume'] = _sp.nan
             scrap_lines = [file.readline() for line in range(4)]
-            while True:
-                vals = file.readline().split('\t')
-                if len(vals) == 1:
-                    break
-                network['pore.volume'][int(vals[0])] = float(vals[3])
-                if 'pore.'+vals[2] not in network.labels():
-                    network['pore.'+vals[2]] = False
-                network['pore.'+vals[2]][int(vals[0])] = True
+            nodes = _pd.read_table(filepath_or_buffer=file,
+                                   header=None,
+                                   sep='\t',
+                                   usecols=[0, 2, 3])
+        inds = nodes[0].values.astype(int)
+        network['pore.volume'][inds] = nodes[3].values
+        node_types = nodes[2].values.astype(str)
+        for item in _sp.unique(node_types):
+            network['pore.'+item] = False
+            network['pore.'+item][inds[node_types == item]] = True
 
         if voxel_size is None:
             voxel_size = vox_size * 1.0E-6  # file stores value in microns
@@ -1045,43 +1905,45 @@ class iMorph(GenericIO):
 
         # parsing the graph file
         with open(graph_file, 'r') as file:
-            # Define expected properties
-            network['pore.coords'] = _sp.zeros((Np, 3))*_sp.nan
-            network['pore.types'] = _sp.nan
-            network['pore.color'] = _sp.nan
-            network['pore.radius'] = _sp.nan
-            network['pore.dmax'] = _sp.nan
-            network['pore.node_number'] = _sp.nan
-            # Scan file to get pore coordinate data
-            scrap_lines = [file.readline() for line in range(3)]
-            line = file.readline()
-            xmax = 0.0
-            ymax = 0.0
-            zmax = 0.0
-            node_num = 0
-            while line != 'connectivity table\n':
-                vals = _sp.fromstring(line, sep='\t')
-                xmax = vals[1] if vals[1] > xmax else xmax
-                ymax = vals[2] if vals[2] > ymax else ymax
-                zmax = vals[3] if vals[3] > zmax else zmax
-                network['pore.coords'][int(vals[0]), :] = vals[1:4]
-                network['pore.types'][int(vals[0])] = vals[4]
-                network['pore.color'][int(vals[0])] = vals[5]
-                network['pore.radius'][int(vals[0])] = vals[6]
-                network['pore.dmax'][int(vals[0])] = vals[7]
-                network['pore.node_number'][int(vals[0])] = node_num
-                node_num += 1
-                line = file.readline()
-            # Scan file to get to connectivity data
-            scrap_lines.append(file.readline())  # Skip line
-            # Create sparse lil array incrementally build adjacency matrix
-            lil = _sp.sparse.lil_matrix((Np, Np), dtype=int)
-            while True:
-                vals = _sp.fromstring(file.readline(), sep='\t', dtype=int)
-                if len(vals) <= 1:
-                    break
-                lil.rows[vals[0]] = vals[2:]
-                lil.data[vals[0]] = _sp.ones(vals[1])
+            text = file.read()
+        node_text, conn_text = text.split('connectivity table\n', 1)
+        # Skip the 3 header lines, then read the pore data in one block
+        node_text = node_text.split('\n', 3)[3]
+        num_cols = len(node_text.split('\n', 1)[0].split())
+        vals = _sp.fromstring(node_text, sep=' ').reshape(-1, num_cols)
+        inds = vals[:, 0].astype(int)
+        xmax, ymax, zmax = _sp.amax(vals[:, 1:4], axis=0).clip(min=0.0)
+        # Define expected properties
+        network['pore.coords'] = _sp.zeros((Np, 3))*_sp.nan
+        network['pore.coords'][inds, :] = vals[:, 1:4]
+        for i, item in enumerate(['types', 'color', 'radius', 'dmax']):
+            network['pore.'+item] = _sp.nan
+            network['pore.'+item][inds] = vals[:, 4+i]
+        network['pore.node_number'] = _sp.nan
+        network['pore.node_number'][inds] = _sp.arange(len(inds))
+        # Each row of the connectivity table holds a pore index, its number
+        # of neighbors and the neighbors themselves, so rows vary in length
+        lines = conn_text.split('\n')[1:]  # Skip header line
+        lengths = []
+        for line in lines:
+            n = len(line.split())
+            if n <= 1:
+                break
+            lengths.append(n)
+        lengths = _sp.array(lengths, dtype=int)
+        vals = _sp.fromstring(' '.join(lines[:len(lengths)]), sep=' ',
+                              dtype=int)
+        starts = _sp.cumsum(lengths) - lengths
+        num_nbrs = lengths - 2
+        rows = _sp.repeat(vals[starts], num_nbrs)
+        first = _sp.cumsum(num_nbrs) - num_nbrs
+        j = _sp.arange(num_nbrs.sum()) - _sp.repeat(first, num_nbrs)
+        cols = vals[_sp.repeat(starts + 2, num_nbrs) + j]
+        # Keep the upper triangle, ordered by row as in the adjacency matrix
+        keep = rows < cols
+        order = _sp.argsort(rows[keep], kind='mergesort')
+        rows = rows[keep][order]
+        cols = cols[keep][order]
 
         # fixing any negative volumes or distances so they are 1 voxel/micron
         network['pore.volume'][_sp.where(network['pore.volume'] < 0)[0]] = 1.0
@@ -1089,9 +1951,8 @@ class iMorph(GenericIO):
         network['pore.dmax'][_sp.where(network['pore.dmax'] < 0)[0]] = 1.0
 
         # Add adjacency matrix to OpenPNM network
-        conns = _sp.sparse.triu(lil, k=1, format='coo')
-        network.update({'throat.all': _sp.ones(len(conns.col), dtype=bool)})
-        network['throat.conns'] = _sp.vstack([conns.row, conns.col]).T
+        network.update({'throat.all': _sp.ones(len(cols), dtype=bool)})
+        network['throat.conns'] = _sp.vstack([rows, cols]).T
 
         network['pore.to_trim'] = False
         network['pore.to_trim'][network.pores('*throat')] = True
@@ -1220,54 +2081,51 @@ class MARock(GenericIO):
             elif file.endswith(".th2np"):
                 th2np_file = _os.path.join(path, file)
 
-        with open(np2th_file, mode='rb') as f:
-            [Np, Nt] = _sp.fromfile(file=f, count=2, dtype='u4')
-            net['pore.boundary_type'] = _sp.ndarray([Np, ], int)
-            net['throat.conns'] = _sp.ones([Nt, 2], int)*(-1)
-            net['pore.coordination'] = _sp.ndarray([Np, ], int)
-            net['pore.ID_number'] = _sp.ndarray([Np, ], int)
-            for i in range(0, Np):
-                ID = _sp.fromfile(file=f, count=1, dtype='u4')
-                net['pore.ID_number'][i] = ID
-                net['pore.boundary_type'][i] = _sp.fromfile(file=f, count=1,
-                                                            dtype='u1')
-                z = _sp.fromfile(file=f, count=1, dtype='u4')[0]
-                net['pore.coordination'][i] = z
-                att_pores = _sp.fromfile(file=f, count=z, dtype='u4')
-                att_throats = _sp.fromfile(file=f, count=z, dtype='u4')
-                for j in range(0, len(att_throats)):
-                    t = att_throats[j] - 1
-                    p = att_pores[j] - 1
-                    net['throat.conns'][t] = [i, p]
-            net['throat.conns'] = _sp.sort(net['throat.conns'], axis=1)
-            net['pore.volume'] = _sp.fromfile(file=f, count=Np, dtype='u4')
-            nx = _sp.fromfile(file=f, count=1, dtype='u4')
-            nxy = _sp.fromfile(file=f, count=1, dtype='u4')
-            pos = _sp.fromfile(file=f, count=Np, dtype='u4')
-            ny = nxy/nx
-            ni = _sp.mod(pos, nx)
-            nj = _sp.mod(_sp.floor(pos/nx), ny)
-            nk = _sp.floor(_sp.floor(pos/nx)/ny)
-            net['pore.coords'] = _sp.array([ni, nj, nk]).T
-
+        # Throat records all have the same length so are read at once
+        throat_dtype = _sp.dtype([('ID', 'u4'), ('area', 'f4'),
+                                  ('numvox', 'u4'), ('pores', 'u4', (2, ))])
         with open(th2np_file, mode='rb') as f:
             Nt = _sp.fromfile(file=f, count=1, dtype='u4')[0]
-            net['throat.area'] = _sp.ones([Nt, ], dtype=int)*(-1)
-            for i in range(0, Nt):
-                ID = _sp.fromfile(file=f, count=1, dtype='u4')
-                net['throat.area'][i] = _sp.fromfile(file=f, count=1,
-                                                     dtype='f4')
-                numvox = _sp.fromfile(file=f, count=1, dtype='u4')
-                att_pores = _sp.fromfile(file=f, count=2, dtype='u4')
-            nx = _sp.fromfile(file=f, count=1, dtype='u4')
-            nxy = _sp.fromfile(file=f, count=1, dtype='u4')
-            pos = _sp.fromfile(file=f, count=Nt, dtype='u4')
-            ny = nxy/nx
-            ni = _sp.mod(pos, nx)
-            nj = _sp.mod(_sp.floor(pos/nx), ny)
-            nk = _sp.floor(_sp.floor(pos/nx)/ny)
-            net['throat.coords'] = _sp.array([ni, nj, nk]).T
-            net['pore.internal'] = net['pore.boundary_type'] == 0
+            records = _sp.fromfile(file=f, count=Nt, dtype=throat_dtype)
+            net['throat.area'] = records['area'].astype(float)
+            [nx, nxy] = _sp.fromfile(file=f, count=2, dtype='u4')
+            loc = _sp.fromfile(file=f, count=Nt, dtype='u4')
+            net['throat.coords'] = cls._voxel_coords(loc, nx, nxy)
+
+        raw = _sp.fromfile(np2th_file, dtype='u1')
+        [Np, Nt] = raw[:8].view('u4')
+        # Each pore record holds its ID (u4), boundary type (u1) and
+        # coordination z (u4), followed by z attached pores and z attached
+        # throats (u4).  The records vary in length, but z is the number of
+        # throats naming the pore in the th2np file, so their start positions
+        # follow from it without reading the records one by one.
+        z = _sp.bincount(records['pores'].ravel(), minlength=Np+1)[1:Np+1]
+        lengths = 9 + 8*z
+        starts = 8 + _sp.cumsum(lengths) - lengths
+        valid = (starts[-1] + 9 <= raw.size) and \
+            _sp.all(cls._gather(raw, starts + 5, 'u4') == z)
+        if not valid:
+            starts = cls._record_starts(raw, Np)
+        z = cls._gather(raw, starts + 5, 'u4').astype(int)
+        pos = starts[-1] + 9 + 8*z[-1]
+        net['pore.ID_number'] = cls._gather(raw, starts, 'u4').astype(int)
+        net['pore.boundary_type'] = raw[starts + 4].astype(int)
+        net['pore.coordination'] = z
+        net['pore.internal'] = net['pore.boundary_type'] == 0
+        # Locate the j-th attached pore and throat of each record
+        j = _sp.arange(z.sum()) - _sp.repeat(_sp.cumsum(z) - z, z)
+        locs = _sp.repeat(starts + 9, z) + 4*j
+        att_pores = cls._gather(raw, locs, 'u4').astype(int)
+        att_throats = cls._gather(raw, locs + 4*_sp.repeat(z, z),
+                                  'u4').astype(int)
+        net['throat.conns'] = _sp.ones([Nt, 2], int)*(-1)
+        net['throat.conns'][att_throats - 1, 0] = _sp.repeat(_sp.arange(Np), z)
+        net['throat.conns'][att_throats - 1, 1] = att_pores - 1
+        net['throat.conns'] = _sp.sort(net['throat.conns'], axis=1)
+        net['pore.volume'] = raw[pos:pos+4*Np].view('u4').copy()
+        [nx, nxy] = raw[pos+4*Np:pos+4*Np+8].view('u4')
+        loc = raw[pos+4*Np+8:pos+8*Np+8].view('u4')
+        net['pore.coords'] = cls._voxel_coords(loc, nx, nxy)
 
         # Convert voxel area and volume to actual dimensions
         net['throat.area'] = (voxel_size**2)*net['throat.area']
@@ -1283,3 +2141,34 @@ class MARock(GenericIO):
         network.trim(throats=ind)
 
         return network
+
+    @classmethod
+    def _record_starts(cls, raw, Np):
+        r"""
+        Find the start of each pore record by walking through the records,
+        for files whose th2np data does not give the coordination numbers.
+        """
+        starts = _sp.empty(Np, dtype=int)
+        pos = 8
+        for i in range(Np):
+            starts[i] = pos
+            pos += 9 + 8*int(cls._gather(raw, [pos + 5], 'u4')[0])
+        return starts
+
+    @staticmethod
+    def _gather(raw, locs, dtype):
+        r"""
+        Read values of the given dtype starting at each byte location in a
+        raw uint8 buffer, which need not be aligned.
+        """
+        dtype = _sp.dtype(dtype)
+        inds = _sp.reshape(locs, (-1, 1)) + _sp.arange(dtype.itemsize)
+        return raw[inds].view(dtype).ravel()
+
+    @staticmethod
+    def _voxel_coords(loc, nx, nxy):
+        ny = nxy/nx
+        ni = _sp.mod(loc, nx)
+        nj = _sp.mod(_sp.floor(loc/nx), ny)
+        nk = _sp.floor(_sp.floor(loc/nx)/ny)
+        return _sp.array([ni, nj, nk]).T
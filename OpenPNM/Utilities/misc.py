@@ -1,6 +1,7 @@
 import scipy as _sp
 import time as _time
 import scipy.sparse as _sprs
+import scipy.ndimage as _spim
 import OpenPNM as _op
 from scipy.spatial.distance import cdist as dist
 
@@ -202,7 +203,8 @@ def amalgamate_data(objs=[], delimiter='_'):
     dlim = delimiter
     exclusion_list = ['pore.centroid', 'pore.vertices', 'throat.centroid',
                       'throat.offset_vertices', 'throat.vertices', 'throat.normal',
-                      'throat.perimeter', 'pore.vert_index', 'throat.vert_index']
+                      'throat.perimeter', 'pore.vert_index', 'throat.vert_index',
+                      'pore.vert_ids', 'throat.vert_ids']
     for item in objs:
         mro = [module.__name__ for module in item.__class__.__mro__]
         # If Network object, combine Geometry and Network keys
@@ -284,3 +286,134 @@ def conduit_lengths(network, throats=None, mode='pore'):
         plen2 = lengths*(1-fractions)
 
     return _sp.vstack((plen1, network['throat.length'], plen2)).T[throats]
+
+
+def label_stats(image, labels=None, voxel_size=1, chunk_size=10**7):
+    r"""
+    Find the volume, centroid and bounding box of every labelled region of an
+    image in a single sweep
+
+    Parameters
+    ----------
+    image : ND-array
+        An image of integer labels, such as the hull image of a Voronoi
+        geometry where each voxel holds the index of the pore it lies in.
+    labels : array_like, optional
+        The labels to report, in the order they are to be returned.  If not
+        given all labels found in the image are reported in ascending order.
+    voxel_size : float
+        The edge length of each voxel, used to scale the volumes and centroids.
+    chunk_size : int
+        The approximate number of voxels to process at once.  The image is
+        swept in slabs along its first axis so that the temporary arrays stay
+        small even if the image is a memory mapped file.
+
+    Returns
+    -------
+    A dictionary containing:
+
+    **'labels'** : The labels described by each row of the other arrays
+
+    **'volume'** : The number of voxels of each label times the voxel volume
+
+    **'centroid'** : The mean voxel indices of each label times the voxel size
+
+    **'bbox_min'** and **'bbox_max'** : The smallest and largest voxel indices
+    of each label along each axis
+
+    Labels that are not found in the image are given a volume of 0, a
+    centroid of nan and bounding box indices of -1.
+
+    Examples
+    --------
+    >>> import scipy as sp
+    >>> import OpenPNM.Utilities.misc as misc
+    >>> im = sp.zeros([4, 4], dtype=int)
+    >>> im[1:3, 0:4] = 1
+    >>> stats = misc.label_stats(im, labels=[1, 2])
+    >>> stats['volume']
+    array([ 8.,  0.])
+    >>> stats['centroid'][0]
+    array([ 1.5,  1.5])
+    >>> stats['bbox_max'][0]
+    array([2, 3])
+    """
+    image = _sp.asanyarray(image)
+    shape = _sp.shape(image)
+    ndim = len(shape)
+    step = max(1, int(chunk_size//max(1, _sp.prod(shape[1:]))))
+    found = []
+    for start in range(0, shape[0], step):
+        block = _sp.asarray(image[start:start + step])
+        # Relabel the block with consecutive integers to reduce it in one pass
+        vals, inv = _sp.unique(block, return_inverse=True)
+        counts = _sp.bincount(inv)
+        coords = _sp.unravel_index(_sp.arange(_sp.size(block)), _sp.shape(block))
+        sums = _sp.vstack([_sp.bincount(inv, weights=c) for c in coords]).T
+        sums[:, 0] += counts*start
+        slices = _spim.find_objects(inv.reshape(_sp.shape(block)) + 1)
+        bmin = _sp.array([[s.start for s in sl] for sl in slices])
+        bmax = _sp.array([[s.stop - 1 for s in sl] for sl in slices])
+        bmin[:, 0] += start
+        bmax[:, 0] += start
+        found.append((vals, counts, sums, bmin, bmax))
+    # Combine the results from all slabs
+    vals = _sp.concatenate([f[0] for f in found])
+    all_labels, inv = _sp.unique(vals, return_inverse=True)
+    counts = _sp.bincount(inv, weights=_sp.concatenate([f[1] for f in found]))
+    sums = _sp.vstack([f[2] for f in found])
+    sums = _sp.vstack([_sp.bincount(inv, weights=sums[:, i])
+                       for i in range(ndim)]).T
+    bmin = _sp.zeros([len(all_labels), ndim], dtype=int) + _sp.iinfo(int).max
+    bmax = -_sp.ones([len(all_labels), ndim], dtype=int)
+    _sp.minimum.at(bmin, inv, _sp.vstack([f[3] for f in found]))
+    _sp.maximum.at(bmax, inv, _sp.vstack([f[4] for f in found]))
+    # Pick out the requested labels
+    if labels is None:
+        labels = all_labels
+    labels = _sp.array(labels, ndmin=1)
+    ind = _sp.clip(_sp.searchsorted(all_labels, labels), 0,
+                   len(all_labels) - 1)
+    present = all_labels[ind] == labels
+    stats = {'labels': labels,
+             'volume': _sp.zeros(len(labels)),
+             'centroid': _sp.ones([len(labels), ndim])*_sp.nan,
+             'bbox_min': -_sp.ones([len(labels), ndim], dtype=int),
+             'bbox_max': -_sp.ones([len(labels), ndim], dtype=int)}
+    ind = ind[present]
+    stats['volume'][present] = counts[ind]*voxel_size**ndim
+    stats['centroid'][present] = sums[ind]/counts[ind, _sp.newaxis]*voxel_size
+    stats['bbox_min'][present] = bmin[ind]
+    stats['bbox_max'][present] = bmax[ind]
+    return stats
+
+
+def invaded_volume(inv_Pc, volume, pressures):
+    r"""
+    Find the total volume invaded at each of the given capillary pressures
+    by sorting the elements by invasion pressure and taking a cumulative sum
+    of their volumes, so the cost does not depend on the number of pressures
+
+    Parameters
+    ----------
+    inv_Pc : array_like
+        The pressure at which each pore or throat is invaded
+
+    volume : array_like
+        The volume of each pore or throat
+
+    pressures : array_like
+        The capillary pressures at which the invaded volume is required
+
+    Returns
+    -------
+    An array the same length as ``pressures`` containing the volume of all
+    elements with ``inv_Pc`` less than or equal to each pressure.
+    """
+    inv_Pc = _sp.array(inv_Pc, ndmin=1)
+    volume = _sp.array(volume, ndmin=1)
+    inds = _sp.argsort(inv_Pc, kind='mergesort')
+    Vcum = _sp.concatenate(([0], _sp.cumsum(volume[inds])))
+    # Make the fully invaded volume match the total without round-off
+    Vcum[-1] = _sp.sum(volume)
+    return Vcum[_sp.searchsorted(inv_Pc[inds], pressures, side='right')]
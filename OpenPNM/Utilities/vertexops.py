@@ -64,6 +64,193 @@ def PolyWeightedCentroid2D(pts):
     return [Cx, Cy]
 
 
+def vertex_ids(network, element='pore', locations=None):
+    r"""
+    Return the indices of the Voronoi vertices of the given pores or throats
+
+    Parameters
+    ----------
+    network : OpenPNM Network Object
+        A Delaunay network (or subclass) holding the Voronoi vertices
+    element : string
+        Either 'pore' or 'throat'
+    locations : array_like
+        The pore or throat indices to retrieve, defaults to all
+
+    Returns
+    -------
+    An integer array with one row per location, holding the indices into
+    ``network._vert_coords`` padded with -1.
+
+    Notes
+    -----
+    Extending a network fills the rows of the new pores and throats with nans,
+    and these are returned as having no vertices.
+    """
+    element = element.split('.')[0]
+    if locations is None:
+        locations = np.arange(network._count(element))
+    ids = network[element + '.vert_ids'][locations]
+    if ids.dtype.kind == 'f':
+        ids = np.where(np.isfinite(ids), ids, -1)
+    return np.array(ids, ndmin=2, dtype=int)
+
+
+def vertex_csr(network, element='pore', locations=None):
+    r"""
+    Return the Voronoi vertices of the given pores or throats as a ragged array
+    in compressed sparse row (CSR) layout
+
+    Parameters
+    ----------
+    network : OpenPNM Network Object
+        A Delaunay network (or subclass) holding the Voronoi vertices
+    element : string
+        Either 'pore' or 'throat'
+    locations : array_like
+        The pore or throat indices to retrieve, defaults to all
+
+    Returns
+    -------
+    indptr : array_like
+        The offsets into ``verts`` of length len(locations) + 1, so that the
+        vertices of the i-th location are ``verts[indptr[i]:indptr[i+1]]``
+    verts : array_like
+        The (N, 3) array of vertex coordinates for all locations concatenated
+
+    Notes
+    -----
+    Networks saved by earlier versions only hold the ``vert_index``
+    dictionaries of vertex index to coordinate, in which case these are
+    converted instead.
+
+    Example
+    ---------
+    >>> import OpenPNM
+    >>> import OpenPNM.Utilities.vertexops as vo
+    >>> pn = OpenPNM.Network.Delaunay(num_pores=50, domain_size=[1, 1, 1])
+    >>> indptr, verts = vo.vertex_csr(pn, 'throat', [0, 1])
+    >>> len(indptr)
+    3
+    >>> np.shape(verts) == (indptr[-1], 3)
+    True
+    """
+    element = element.split('.')[0]
+    if locations is None:
+        locations = np.arange(network._count(element))
+    locations = np.array(locations, ndmin=1, dtype=int)
+    if element + '.vert_ids' in network.keys():
+        ids = vertex_ids(network, element, locations)
+        mask = ids >= 0
+        indptr = np.concatenate(([0], np.cumsum(np.sum(mask, axis=1))))
+        verts = network._vert_coords[ids[mask]]
+    else:
+        values = network[element + '.vert_index'][locations]
+        values = [list(d.values()) if d is not None else None for d in values]
+        indptr, verts = objects_to_csr(values)
+    return indptr, verts
+
+
+def objects_to_csr(values):
+    r"""
+    Convert an object array of coordinate arrays, such as 'pore.vertices', into
+    the ragged CSR layout returned by ``vertex_csr``.  Entries of None are
+    treated as having no vertices.
+    """
+    values = [np.reshape(v, (-1, 3)) if v is not None else np.zeros((0, 3))
+              for v in values]
+    counts = [np.shape(v)[0] for v in values]
+    indptr = np.concatenate(([0], np.cumsum(counts))).astype(int)
+    if len(values) > 0:
+        verts = np.vstack(values).astype(float)
+    else:
+        verts = np.zeros((0, 3))
+    return indptr, verts
+
+
+def csr_to_objects(indptr, verts):
+    r"""
+    Convert a ragged CSR layout into an object array holding one array of
+    coordinates per location, the inverse of ``objects_to_csr``
+    """
+    value = np.ndarray(len(indptr) - 1, dtype=object)
+    for i, v in enumerate(np.split(verts, indptr[1:-1])):
+        value[i] = v
+    return value
+
+
+def csr_polygon_area(indptr, verts, normals):
+    r"""
+    Return the area of the convex hull of each set of coplanar vertices given
+    in the ragged CSR layout, for all polygons at once
+
+    Parameters
+    ----------
+    indptr, verts : array_like
+        The ragged vertex data as returned by ``vertex_csr``
+    normals : array_like
+        The (N, 3) array of normal vectors of the plane of each polygon
+
+    Notes
+    -----
+    The vertices of each polygon are sorted by angle about their mean in the
+    plane, then any that are not convex corners are removed repeatedly which
+    leaves the convex hull.  The area is then found with the shoelace formula.
+    Polygons with fewer than 3 vertices are given zero area.
+
+    Example
+    ---------
+    >>> import OpenPNM.Utilities.vertexops as vo
+    >>> sq = [[0, 0, 0], [1, 1, 0], [1, 0, 0], [0.5, 0.5, 0], [0, 1, 0]]
+    >>> tri = [[0, 0, 1], [0, 2, 1], [0, 0, 3]]
+    >>> indptr, verts = vo.objects_to_csr([sq, tri])
+    >>> vo.csr_polygon_area(indptr, verts, [[0, 0, 1], [1, 0, 0]])
+    array([ 1.,  2.])
+    """
+    N = len(indptr) - 1
+    counts = np.diff(indptr)
+    area = np.zeros(N)
+    if N == 0 or indptr[-1] == 0:
+        return area
+    ids = np.repeat(np.arange(N), counts)
+    normals = np.array(normals, dtype=float, ndmin=2)
+    normals = normals/np.linalg.norm(normals, axis=1)[:, np.newaxis]
+    # Build an orthonormal basis in the plane of each polygon
+    axis = np.eye(3)[np.argmin(np.absolute(normals), axis=1)]
+    u = np.cross(normals, axis)
+    u = u/np.linalg.norm(u, axis=1)[:, np.newaxis]
+    w = np.cross(normals, u)
+    centre = np.vstack([np.bincount(ids, verts[:, i], minlength=N)
+                        for i in range(3)]).T
+    centre /= np.maximum(counts, 1)[:, np.newaxis]
+    rel = verts - centre[ids]
+    x = np.sum(rel*u[ids], axis=1)
+    y = np.sum(rel*w[ids], axis=1)
+    order = np.lexsort((np.arctan2(y, x), ids))
+    x, y, ids = x[order], y[order], ids[order]
+    while True:
+        # Find the previous and next vertex around each polygon
+        new = np.concatenate(([True], ids[1:] != ids[:-1]))
+        starts = np.where(new)[0]
+        ends = np.concatenate((starts[1:], [len(ids)])) - 1
+        nxt = np.arange(1, len(ids) + 1)
+        nxt[ends] = starts
+        prv = np.arange(-1, len(ids) - 1)
+        prv[starts] = ends
+        cross = (x - x[prv])*(y[nxt] - y) - (y - y[prv])*(x[nxt] - x)
+        # Remove concave or collinear vertices, but only the first of any
+        # consecutive run so that coincident hull vertices are not all lost
+        concave = cross <= 0
+        remove = concave*~concave[prv]*(np.bincount(ids)[ids] > 2)
+        if not np.any(remove):
+            break
+        x, y, ids = x[~remove], y[~remove], ids[~remove]
+    twice_area = np.bincount(ids, x*y[nxt] - x[nxt]*y, minlength=N)
+    polygons = np.bincount(ids, minlength=N) > 2
+    area[polygons] = 0.5*np.absolute(twice_area[polygons])
+    return area
+
+
 def scale(network, scale_factor=[1, 1, 1], preserve_vol=False,
           linear_scaling=[False, False, False]):
     r"""
@@ -102,19 +289,23 @@ def scale(network, scale_factor=[1, 1, 1], preserve_vol=False,
                                      scale_factor, linear_scaling)
 
     network["pore.coords"] = network["pore.coords"]*lin_scale
-    # Cycle through all vertices of all pores updating vertex values
-    for pore in network.pores():
-        for i, vert in network['pore.vert_index'][pore].items():
-            vert_scale = _linear_scale_factor(vert, minmax,
-                                              scale_factor, linear_scaling)
-            network["pore.vert_index"][pore][i] = vert*vert_scale
-    # Cycle through all vertices of all throats updating vertex values
-    for throat in network.throats():
-        for i, vert in network['throat.vert_index'][throat].items():
-
-            vert_scale = _linear_scale_factor(vert, minmax,
-                                              scale_factor, linear_scaling)
-            network["throat.vert_index"][throat][i] = vert*vert_scale
+    if 'pore.vert_ids' in network.keys():
+        # Scale the vertex array shared by all pores and throats
+        vert = network._vert_coords
+        vert_scale = _linear_scale_factor(vert, minmax, scale_factor,
+                                          linear_scaling)
+        network._vert_coords = vert*vert_scale
+    else:
+        # Cycle through the vertex dictionaries of older networks
+        for element in ['pore', 'throat']:
+            for verts in network[element + '.vert_index']:
+                if verts is None:
+                    continue
+                for i, vert in verts.items():
+                    vert_scale = _linear_scale_factor(vert, minmax,
+                                                      scale_factor,
+                                                      linear_scaling)
+                    verts[i] = vert*vert_scale
     # Scale the vertices on the voronoi diagram stored on the network
     # These are used for adding boundaries on the Delaunay network class
     vert = network._vor.vertices
@@ -216,12 +407,9 @@ def vertex_dimension(network, face1=[], face2=[], parm='volume'):
     else:
         return 0
 
-    if 'pore.vert_index' in network.props():
-        verts = []
-        for pore in pores:
-            for vert in np.asarray(list(network['pore.vert_index'][pore].values())):
-                verts.append(vert)
-        verts = np.asarray(verts)
+    if 'pore.vert_ids' in network.props() or \
+            'pore.vert_index' in network.props():
+        verts = vertex_csr(network, 'pore', pores)[1]
     else:
         verts = network['pore.coords'][pores]
 
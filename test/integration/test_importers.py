@@ -0,0 +1,147 @@
+r"""
+Synthetic network files for testing and benchmarking the importers in
+OpenPNM.Utilities.IO.  The files describe a simple cubic lattice, so networks
+of any size can be written and the imported topology checked against the
+Cubic network.  Run this file directly to time the import of large networks:
+
+    python test_importers.py 100
+
+which writes and loads networks with 100**3 pores in each format.
+"""
+import os
+import sys
+import time
+import tempfile
+import scipy as sp
+import OpenPNM
+import OpenPNM.Utilities.IO as io
+
+
+def _lattice(shape):
+    mgr = OpenPNM.Base.Workspace()
+    pn = OpenPNM.Network.Cubic(shape=shape)
+    coords = pn['pore.coords'] - 0.5
+    conns = pn['throat.conns']
+    mgr.purge_object(pn)
+    return coords, conns
+
+
+def _neighbors(Np, conns):
+    # List the neighboring pores and throats of each pore, in throat order
+    Ts = sp.hstack([sp.arange(len(conns)), sp.arange(len(conns))])
+    Ps = sp.hstack([conns[:, 0], conns[:, 1]])
+    nbrs = sp.hstack([conns[:, 1], conns[:, 0]])
+    order = sp.lexsort((Ts, Ps))
+    z = sp.bincount(Ps, minlength=Np)
+    splits = sp.cumsum(z)[:-1]
+    return sp.split(nbrs[order], splits), sp.split(Ts[order], splits), z
+
+
+def write_statoil(path, prefix, shape):
+    coords, conns = _lattice(shape)
+    Np, Nt = len(coords), len(conns)
+    nbrs, Ts, z = _neighbors(Np, conns)
+    with open(os.path.join(path, prefix+'_node1.dat'), 'w') as f:
+        f.write('{0} {1} {2} {3}\n'.format(Np, *shape))
+        for i in range(Np):
+            f.write('{0}\t{1} {2} {3}\t{4}\t'.format(i+1, *coords[i], z[i]))
+            f.write('\t'.join(map(str, nbrs[i]+1)))
+            f.write('\t0\t0\t')
+            f.write('\t'.join(map(str, Ts[i]+1)))
+            f.write('\n')
+    vals = sp.vstack([sp.arange(Np)+1, sp.ones(Np), 0.4*sp.ones(Np),
+                      0.03*sp.ones(Np), sp.zeros(Np)]).T
+    sp.savetxt(os.path.join(path, prefix+'_node2.dat'), vals,
+               fmt=['%d', '%e', '%e', '%e', '%e'])
+    vals = sp.vstack([sp.arange(Nt)+1, conns.T+1, 0.1*sp.ones(Nt),
+                      0.03*sp.ones(Nt), sp.ones(Nt)]).T
+    sp.savetxt(os.path.join(path, prefix+'_link1.dat'), vals,
+               fmt=['%d', '%d', '%d', '%e', '%e', '%e'],
+               header=str(Nt), comments='')
+    vals = sp.vstack([sp.arange(Nt)+1, conns.T+1, 0.3*sp.ones(Nt),
+                      0.3*sp.ones(Nt), 0.4*sp.ones(Nt), 0.01*sp.ones(Nt),
+                      sp.zeros(Nt)]).T
+    sp.savetxt(os.path.join(path, prefix+'_link2.dat'), vals,
+               fmt=['%d', '%d', '%d', '%e', '%e', '%e', '%e', '%e'])
+    return coords, conns
+
+
+def write_marock(path, prefix, shape):
+    coords, conns = _lattice(shape)
+    Np, Nt = len(coords), len(conns)
+    nbrs, Ts, z = _neighbors(Np, conns)
+    nx, ny = shape[0], shape[1]
+    with open(os.path.join(path, prefix+'.np2th'), 'wb') as f:
+        sp.array([Np, Nt], dtype='u4').tofile(f)
+        for i in range(Np):
+            sp.array([i+1], dtype='u4').tofile(f)
+            sp.array([0], dtype='u1').tofile(f)
+            sp.hstack([z[i], nbrs[i]+1, Ts[i]+1]).astype('u4').tofile(f)
+        sp.ones(Np, dtype='u4').tofile(f)
+        sp.array([nx, nx*ny], dtype='u4').tofile(f)
+        loc = coords[:, 0] + nx*coords[:, 1] + nx*ny*coords[:, 2]
+        loc.astype('u4').tofile(f)
+    dtype = sp.dtype([('ID', 'u4'), ('area', 'f4'), ('numvox', 'u4'),
+                      ('pores', 'u4', (2, ))])
+    records = sp.zeros(Nt, dtype=dtype)
+    records['ID'] = sp.arange(Nt) + 1
+    records['area'] = 1.5
+    records['numvox'] = 1
+    records['pores'] = conns + 1
+    with open(os.path.join(path, prefix+'.th2np'), 'wb') as f:
+        sp.array([Nt], dtype='u4').tofile(f)
+        records.tofile(f)
+        sp.array([nx, nx*ny], dtype='u4').tofile(f)
+        loc = sp.mean(coords[conns], axis=1)
+        loc = loc[:, 0] + nx*loc[:, 1] + nx*ny*loc[:, 2]
+        loc.astype('u4').tofile(f)
+    return coords, conns
+
+
+def _same_topology(net, coords, conns):
+    a = sp.sort(net['throat.conns'], axis=1)
+    a = a[sp.lexsort((a[:, 1], a[:, 0]))]
+    b = sp.sort(conns, axis=1)
+    b = b[sp.lexsort((b[:, 1], b[:, 0]))]
+    return sp.all(a == b) and sp.allclose(net['pore.coords'], coords)
+
+
+def test_load_synthetic_statoil():
+    path = os.path.join(TEMP_DIR, 'statoil')
+    os.mkdir(path)
+    coords, conns = write_statoil(path, 'synth', [6, 5, 4])
+    net = io.Statoil.load(path=path, prefix='synth')
+    assert net.Np == 120
+    assert net.Nt == len(conns)
+    assert _same_topology(net, coords, conns)
+    assert sp.allclose(net['throat.radius'], 0.1)
+
+
+def test_load_synthetic_marock():
+    path = os.path.join(TEMP_DIR, 'marock')
+    os.mkdir(path)
+    coords, conns = write_marock(path, 'synth', [6, 5, 4])
+    net = io.MARock.load(path=path, voxel_size=2)
+    assert net.Np == 120
+    assert net.Nt == len(conns)
+    assert _same_topology(net, coords, conns)
+    assert sp.all(net['pore.coordination'] == net.num_neighbors(net.Ps))
+    assert sp.allclose(net['throat.area'], 6.0)
+    assert sp.allclose(net['pore.volume'], 8.0)
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    shape = [n, n, n]
+    path = tempfile.mkdtemp()
+    for name, writer, loader in [
+            ('Statoil', write_statoil,
+             lambda: io.Statoil.load(path=path, prefix='synth')),
+            ('3DMA-Rock', write_marock,
+             lambda: io.MARock.load(path=path))]:
+        writer(path, 'synth', shape)
+        t0 = time.time()
+        net = loader()
+        print('{0}: loaded {1} pores and {2} throats in {3:.2f} s'
+              .format(name, net.Np, net.Nt, time.time() - t0))
+        OpenPNM.Base.Workspace().clear()
@@ -122,3 +122,28 @@ def test_OP_plotting():
     assert isinstance(a, matplotlib.figure.Figure)
     a = OP.plot_primary_drainage_curve()
     assert isinstance(a, matplotlib.figure.Figure)
+
+
+def test_OP_get_drainage_data():
+    mgr.clear()
+    pn = OpenPNM.Network.Cubic(shape=[30, 30, 1], spacing=0.01)
+    geom = OpenPNM.Geometry.Toray090(network=pn, pores=pn.Ps, throats=pn.Ts)
+    water = OpenPNM.Phases.Water(network=pn)
+    OpenPNM.Physics.Standard(network=pn, phase=water, geometry=geom)
+    OP = OrdinaryPercolation(network=pn)
+    OP.setup(invading_phase=water)
+    OP.set_inlets(pores=pn.pores('left'))
+    OP.run(npts=25)
+    data = OP.get_drainage_data()
+    Pvol = pn['pore.volume']
+    Tvol = pn['throat.volume']
+    vol_tot = sp.sum(Pvol) + sp.sum(Tvol)
+    for Pc, S in zip(data['capillary_pressure'],
+                     data['invading_phase_saturation']):
+        V = sp.sum(Pvol[OP['pore.inv_Pc'] <= Pc]) + \
+            sp.sum(Tvol[OP['throat.inv_Pc'] <= Pc])
+        assert sp.allclose(V/vol_tot, S)
+    assert data['invading_phase_saturation'][-1] == 1.0
+    inds = OP['pore.inv_Pc'] == data['capillary_pressure'][-1]
+    assert sp.all(OP['pore.inv_sat'][inds] == 1.0)
+    mgr.clear()
@@ -46,6 +46,17 @@ def test_subdivide_consecutive():
     assert (pn._subdivide_flag)
 
 
+
+def test_subdivide_2d():
+    pn = OpenPNM.Network.Cubic(shape=[6, 5, 1], spacing=0.001)
+    pn.subdivide(pores=[3, 4, 9], shape=[3, 4], labels='nano')
+    assert pn.Np == (30+3*12-3)
+    Ps = pn.pores('nano')
+    assert sp.all(pn['pore.coords'][Ps, 2] == 0.0005)
+    # Adjacent subdivided pores are joined face to face
+    Ts = pn.find_neighbor_throats(pores=Ps, mode='intersection')
+    assert sp.size(Ts) == 3*17 + 4 + 3
+
 def test_clone_and_trim():
     mgr.clear()
     pn = OpenPNM.Network.Cubic(shape=[5, 5, 5], name='net')
@@ -96,6 +107,35 @@ def test_stitch():
     mgr.clear()
 
 
+
+def test_stitch_many_donors():
+    mgr = OpenPNM.Base.Workspace()
+    [Nx, Ny, Nz] = [10, 10, 10]
+    pn = OpenPNM.Network.Cubic(shape=[Nx, Ny, Nz])
+    top = OpenPNM.Network.Cubic(shape=[Nx, Ny, Nz])
+    top['pore.coords'][:, 2] += Nz
+    top['pore.upper'] = True
+    bot = OpenPNM.Network.Cubic(shape=[Nx, Ny, Nz])
+    bot['pore.coords'][:, 2] -= Nz
+    pn.stitch(donor=[top, bot],
+              P_network=[pn.pores('top'), pn.pores('bottom')],
+              P_donor=[top.pores('bottom'), bot.pores('top')],
+              len_max=1,
+              method='nearest',
+              label_suffix=['top', 'bot'])
+    assert pn.Np == 3*top.Np
+    assert pn.Nt == (3*top.Nt + 2*Nx*Ny)
+    assert pn.num_throats('stitched') == 2*Nx*Ny
+    assert sp.all(pn.pores('upper_top') == sp.r_[1000:2000])
+    assert sp.all(pn.pores('top_bot') == bot.pores('top') + 2000)
+    assert sp.all(pn.throats('all_bot') == sp.r_[2*top.Nt:3*top.Nt])
+    Ts = pn.throats('stitched')
+    L = sp.diff(pn['pore.coords'][pn['throat.conns'][Ts]], axis=1)
+    assert sp.allclose(sp.absolute(L[:, 0, 2]), 1)
+    assert top not in mgr.values()
+    assert bot not in mgr.values()
+    mgr.clear()
+
 def test_distance_center():
     shape = sp.array([7, 5, 9])
     spacing = sp.array([2, 1, 0.5])
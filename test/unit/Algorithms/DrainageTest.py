@@ -224,3 +224,51 @@ class DrainageTest:
         data = self.alg.get_drainage_data()
         assert 'capillary_pressure' in data.keys()
         assert 'invading_phase_saturation' in data.keys()
+
+    def test_run_events_matches_points(self):
+        self.alg.setup(invading_phase=self.water, defending_phase=self.air)
+        self.alg.set_inlets(pores=self.net.pores('top'))
+        self.alg.run(mode='events')
+        Pc = self.alg._inv_points
+        pinv = sp.copy(self.alg['pore.inv_Pc'])
+        tinv = sp.copy(self.alg['throat.inv_Pc'])
+        data = self.alg.get_drainage_data()
+        assert sp.all(sp.diff(data['capillary_pressure']) > 0)
+        assert sp.all(sp.diff(data['invading_phase_saturation']) >= 0)
+        self.alg.run(inv_pressures=Pc)
+        assert sp.all(self.alg['pore.inv_Pc'] == pinv)
+        assert sp.all(self.alg['throat.inv_Pc'] == tinv)
+
+    def test_run_events_w_trapping_and_residual(self):
+        self.alg.setup(invading_phase=self.water,
+                       defending_phase=self.air,
+                       trapping=True)
+        self.alg.set_inlets(pores=self.net.pores('top'))
+        self.alg.set_outlets(pores=self.net.pores('bottom'))
+        Ts = self.net.find_neighbor_throats(pores=self.net.pores('left'))
+        self.alg.set_residual(throats=Ts)
+        self.alg.run(mode='events')
+        Pc = self.alg._inv_points
+        pinv = sp.copy(self.alg['pore.inv_Pc'])
+        tinv = sp.copy(self.alg['throat.inv_Pc'])
+        trapped = self.alg['pore.trapped'] < sp.inf
+        assert sp.all(pinv[trapped] == sp.inf)
+        self.alg.setup(invading_phase=self.water,
+                       defending_phase=self.air,
+                       trapping=True)
+        self.alg.set_inlets(pores=self.net.pores('top'))
+        self.alg.set_outlets(pores=self.net.pores('bottom'))
+        self.alg.set_residual(throats=Ts)
+        self.alg.run(inv_pressures=Pc)
+        assert sp.all(self.alg['pore.inv_Pc'] == pinv)
+        assert sp.all(self.alg['throat.inv_Pc'] == tinv)
+
+    def test_run_bad_mode(self):
+        self.alg.setup(invading_phase=self.water, defending_phase=self.air)
+        self.alg.set_inlets(pores=self.net.pores('top'))
+        flag = False
+        try:
+            self.alg.run(mode='bad_mode')
+        except:
+            flag = True
+        assert flag
@@ -0,0 +1,90 @@
+import scipy as sp
+import OpenPNM
+mgr = OpenPNM.Base.Workspace()
+mgr.loglevel = 60
+
+
+class RelativePermeabilityTest:
+    def setup_class(self):
+        self.net = OpenPNM.Network.Cubic(shape=[6, 6, 6], spacing=0.0001)
+        self.geo = OpenPNM.Geometry.Toray090(network=self.net,
+                                             pores=self.net.Ps,
+                                             throats=self.net.Ts)
+        self.water = OpenPNM.Phases.Water(network=self.net)
+        self.air = OpenPNM.Phases.Air(network=self.net)
+        self.phys_w = OpenPNM.Physics.Standard(network=self.net,
+                                               phase=self.water,
+                                               geometry=self.geo)
+        self.phys_a = OpenPNM.Physics.Standard(network=self.net,
+                                               phase=self.air,
+                                               geometry=self.geo)
+        self.drn = OpenPNM.Algorithms.Drainage(network=self.net)
+        self.drn.setup(invading_phase=self.water, defending_phase=self.air)
+        self.drn.set_inlets(pores=self.net.pores('top'))
+        self.drn.run(mode='events')
+        self.alg = OpenPNM.Algorithms.RelativePermeability(network=self.net)
+
+    def _stokes_rate(self, phase, conductance):
+        alg = OpenPNM.Algorithms.StokesFlow(network=self.net, phase=phase)
+        alg.set_boundary_conditions(bctype='Dirichlet', bcvalue=1,
+                                    pores=self.net.pores('left'))
+        alg.set_boundary_conditions(bctype='Dirichlet', bcvalue=0,
+                                    pores=self.net.pores('right'))
+        alg.setup(conductance=conductance)
+        alg.solve()
+        return sp.absolute(alg.rate(pores=self.net.pores('left'))[0])
+
+    def test_run_matches_stokes_flow(self):
+        self.alg.setup(invading_phase=self.water, defending_phase=self.air,
+                       percolation=self.drn)
+        self.alg.set_inlets(pores=self.net.pores('left'))
+        self.alg.set_outlets(pores=self.net.pores('right'))
+        self.alg.run()
+        data = self.alg.get_relperm_data()
+        assert sp.all(sp.diff(data['invading_phase_saturation']) >= 0)
+        # Compare one step against the conduit conductance model
+        i = sp.size(data['capillary_pressure'])//2
+        self.drn.return_results(Pc=data['capillary_pressure'][i])
+        f = OpenPNM.Physics.models.multiphase.conduit_conductance
+        for phys in [self.phys_w, self.phys_a]:
+            phys.models.add(propname='throat.conduit_conductance', model=f,
+                            throat_conductance='throat.hydraulic_conductance')
+        Q0 = self._stokes_rate(self.water, 'throat.hydraulic_conductance')
+        Q = self._stokes_rate(self.water, 'throat.conduit_conductance')
+        assert sp.allclose(data['invading_phase_relperm'][i], Q/Q0)
+        Q0 = self._stokes_rate(self.air, 'throat.hydraulic_conductance')
+        Q = self._stokes_rate(self.air, 'throat.conduit_conductance')
+        assert sp.allclose(data['defending_phase_relperm'][i], Q/Q0)
+
+    def test_run_direct_solver(self):
+        self.alg.setup(invading_phase=self.water, defending_phase=self.air,
+                       percolation=self.drn, mode='loose')
+        self.alg.set_inlets(pores=self.net.pores('left'))
+        self.alg.set_outlets(pores=self.net.pores('right'))
+        Pc = sp.linspace(0, 20000, 10)
+        self.alg.run(inv_pressures=Pc)
+        kr_cg = self.alg.get_relperm_data()['invading_phase_relperm']
+        self.alg.run(inv_pressures=Pc, iterative_solver=None)
+        kr = self.alg.get_relperm_data()['invading_phase_relperm']
+        assert sp.allclose(kr_cg, kr)
+
+    def test_run_without_outlets(self):
+        self.alg.setup(invading_phase=self.water, defending_phase=self.air,
+                       percolation=self.drn)
+        self.alg.set_inlets(pores=self.net.pores('left'))
+        flag = False
+        try:
+            self.alg.run()
+        except:
+            flag = True
+        assert flag
+
+    def test_get_relperm_data_before_run(self):
+        alg = OpenPNM.Algorithms.RelativePermeability(network=self.net)
+        flag = False
+        try:
+            alg.get_relperm_data()
+        except Exception as e:
+            flag = 'has not been run' in str(e)
+        assert flag
+        mgr.purge_object(alg)
@@ -1,5 +1,6 @@
 import OpenPNM
 import os
+import gc
 from os.path import join
 import pytest
 
@@ -103,6 +104,70 @@ class WorkspaceTest:
         net2 = self.workspace[net.name]
         assert 'pore.blah' in net2.keys()
 
+    def test_save_and_load_simulation_hdf5(self):
+        net = OpenPNM.Network.Cubic(shape=[5, 5, 5])
+        geo = OpenPNM.Geometry.Toray090(network=net, pores=net.Ps,
+                                        throats=net.Ts)
+        fname = join(TEMP_DIR, 'test_simulation_hdf5')
+        self.workspace.save_simulation(network=net, filename=fname,
+                                       fileformat='hdf5', compression='gzip')
+        assert os.path.isfile(fname + '.hdf5')
+        self.workspace.clear()
+        self.workspace.load_simulation(fname + '.hdf5')
+        net2 = self.workspace[net.name]
+        geo2 = self.workspace[geo.name]
+        assert net2 is not net
+        # Arrays are not read until they are first accessed
+        lazy = OpenPNM.Base.Tools.LazyArray
+        assert isinstance(dict.__getitem__(geo2, 'pore.diameter'), lazy)
+        assert sorted(net2.props()) == sorted(net.props())
+        assert sorted(net2.labels()) == sorted(net.labels())
+        assert net2.Np == net.Np
+        assert isinstance(dict.__getitem__(geo2, 'pore.diameter'), lazy)
+        assert (geo2['pore.diameter'] == geo['pore.diameter']).all()
+        assert not isinstance(dict.__getitem__(geo2, 'pore.diameter'), lazy)
+        assert (net2['throat.conns'] == net['throat.conns']).all()
+        assert geo2.models.keys() == geo.models.keys()
+        geo2.models.regenerate()
+
+    def test_save_and_load_large_simulation_hdf5(self):
+        import h5py
+        net = OpenPNM.Network.Cubic(shape=[25, 20, 20])
+        geo = OpenPNM.Geometry.Stick_and_Ball(network=net, pores=net.Ps,
+                                              throats=net.Ts)
+        # Fill the cached sparse matrices, which should not be saved
+        net.find_neighbor_pores(pores=[0])
+        dual = OpenPNM.Network.Delaunay(num_pores=200,
+                                        domain_size=[1, 1, 1])
+        fname = join(TEMP_DIR, 'test_large_simulation_hdf5.hdf5')
+        OpenPNM.Utilities.IO.HDF5.save(objects=[net, geo, dual],
+                                       filename=fname)
+        with h5py.File(fname, mode='r') as f:
+            assert f['.skeleton'][()].nbytes < 2**16
+        objs = OpenPNM.Utilities.IO.HDF5.load(fname)
+        net2, geo2, dual2 = objs
+        assert net2.Np == 10000
+        assert net2._adjacency_matrix == {}
+        assert (geo2['pore.diameter'] == geo['pore.diameter']).all()
+        assert (net2.find_neighbor_pores(pores=[0]) == [1, 20, 400]).all()
+        assert (dual2._vert_coords == dual._vert_coords).all()
+        assert (dual2['pore.vert_ids'] == dual['pore.vert_ids']).all()
+        for obj in [net, geo, dual]:
+            self.workspace.purge_object(obj)
+
+    def test_save_and_load_workspace_hdf5(self):
+        self.workspace.clear()
+        net = OpenPNM.Network.Cubic(shape=[5, 5, 5])
+        phase = OpenPNM.Phases.Air(network=net)
+        fname = join(TEMP_DIR, 'test_workspace_hdf5')
+        self.workspace.save_workspace(filename=fname, fileformat='hdf5')
+        self.workspace.load_workspace(fname + '.hdf5', lazy=False)
+        phase2 = self.workspace[phase.name]
+        assert isinstance(dict.__getitem__(phase2, 'pore.viscosity'),
+                          OpenPNM.Base.Tools.LazyArray) is False
+        assert (phase2['pore.viscosity'] == phase['pore.viscosity']).all()
+        assert phase2._net is self.workspace[net.name]
+
     def test_ghost_object(self):
         a = self.workspace.ghost_object(self.net)
         # Different objects...
@@ -133,12 +198,186 @@ class WorkspaceTest:
         assert geo.name not in self.workspace.keys()
         assert net.name not in self.workspace.keys()
 
+    def test_purge_object_single_removes_labels(self):
+        net = OpenPNM.Network.Cubic(shape=[3, 3, 3])
+        geo = OpenPNM.Geometry.GenericGeometry(network=net, pores=net.Ps,
+                                               throats=net.Ts)
+        phase = OpenPNM.Phases.GenericPhase(network=net)
+        phys = OpenPNM.Physics.GenericPhysics(network=net, phase=phase,
+                                              pores=net.Ps, throats=net.Ts)
+        assert any(item is net for item in geo._referrers)
+        assert any(item is phase for item in phys._referrers)
+        phys.name = 'renamed_physics'
+        assert 'pore.renamed_physics' in phase.keys()
+        self.workspace.purge_object(phys)
+        assert 'pore.renamed_physics' not in phase.keys()
+        assert 'pore.renamed_physics' not in net.keys()
+        assert phase.physics() == []
+        assert not any(item is phys for item in phase._referrers)
+        assert 'pore.' + geo.name in net.keys()
+
     def test_clone_simulation(self):
         a = self.workspace.clone_simulation(self.net)
         assert a.name != self.net.name
         assert a in self.workspace.values()
         assert a.name in self.workspace.keys()
 
+    def test_clone_simulation_repeatedly(self):
+        ws = OpenPNM.Base.Workspace.isolated()
+        with ws:
+            net = OpenPNM.Network.Cubic(shape=[4, 4, 4])
+            OpenPNM.Geometry.TestGeometry(network=net, pores=net.Ps,
+                                          throats=net.Ts)
+
+        def count():
+            gc.collect()
+            return sum(isinstance(item, OpenPNM.Network.Cubic) and
+                       item._workspace is ws for item in gc.get_objects())
+        clones = [ws.clone_simulation(net, name=str(i)) for i in range(4)]
+        # Each clone copies only the original, not the earlier clones
+        assert count() == 5
+        for item in clones:
+            assert item._clones() == []
+        assert not any(item is clones[0] for item in net._referrers)
+        # Purging the original still removes its labels from the clones
+        ws.purge_object(net)
+        assert 'pore.' + net.name not in clones[1].keys()
+        # Clones are not kept alive by the original
+        ws.purge_object(clones[0], mode='complete')
+        del clones[0]
+        assert count() == 4
+
+    def test_clone_simulation_copy_on_write(self):
+        net = OpenPNM.Network.Cubic(shape=[5, 5, 5])
+        geo = OpenPNM.Geometry.TestGeometry(network=net, pores=net.Ps,
+                                            throats=net.Ts)
+        a = self.workspace.clone_simulation(net, name='cow',
+                                            copy_on_write=True)
+        b = a._geometries[0]
+        assert b is not geo
+        assert b.name == geo.name + '_cow'
+        # The arrays are shared until first accessed
+        shared = dict.__getitem__(b, 'pore.diameter')
+        assert shared.base is dict.__getitem__(geo, 'pore.diameter')
+        assert not shared.flags.writeable
+        old = geo['pore.diameter'].copy()
+        b['pore.diameter'][0] = 1.0
+        assert b['pore.diameter'].flags.writeable
+        assert geo['pore.diameter'][0] == old[0]
+        geo['pore.diameter'][1] = 123.0
+        assert b['pore.diameter'][1] == old[1]
+        geo['pore.diameter'] *= 2
+        assert (b['pore.diameter'][1:] == old[1:]).all()
+        assert (a['throat.conns'] == net['throat.conns']).all()
+        assert a.num_neighbors(pores=0) == net.num_neighbors(pores=0)
+
+    def test_clone_simulation_copy_on_write_stokes_flow(self):
+        net = OpenPNM.Network.Cubic(shape=[5, 5, 5])
+        phase = OpenPNM.Phases.GenericPhase(network=net)
+        phys = OpenPNM.Physics.GenericPhysics(network=net, phase=phase,
+                                              pores=net.Ps, throats=net.Ts)
+        phys['throat.hydraulic_conductance'] = 1.0
+
+        def stokes(network, phase, inlet):
+            alg = OpenPNM.Algorithms.StokesFlow(network=network, phase=phase)
+            alg.set_boundary_conditions(bctype='Dirichlet', bcvalue=inlet,
+                                        pores=network.pores('top'))
+            alg.set_boundary_conditions(bctype='Dirichlet', bcvalue=0.0,
+                                        pores=network.pores('bottom'))
+            alg.run()
+            alg.return_results()
+            return alg
+        stokes(net, phase, 1.0)
+        clone = self.workspace.clone_simulation(net, name='cow_stokes',
+                                                copy_on_write=True)
+        phase2 = clone._phases[0]
+        stokes(clone, phase2, 2.0)
+        assert phase['pore.pressure'].max() == 1.0
+        stokes(net, phase, 3.0)
+        assert phase2['pore.pressure'].max() == 2.0
+        assert phase['pore.pressure'].max() == 3.0
+        assert (phase2['throat.rate'] != phase['throat.rate']).any()
+        # Labels and properties can be changed in place on either side
+        net['pore.top'][0] = True
+        assert not clone['pore.top'][0]
+        phase['pore.temperature'][0] = 300.0
+        phase2['pore.temperature'][0] = 310.0
+        assert phase['pore.temperature'][0] == 300.0
+
+    def test_isolated_workspace(self):
+        ws = OpenPNM.Base.Workspace.isolated()
+        assert ws is not self.workspace
+        with ws:
+            assert OpenPNM.Base.Workspace() is ws
+            net = OpenPNM.Network.Cubic(shape=[3, 3, 3], name='iso_net')
+        assert OpenPNM.Base.Workspace() is self.workspace
+        # Objects created on net join its Workspace
+        geo = OpenPNM.Geometry.TestGeometry(network=net, pores=net.Ps,
+                                            throats=net.Ts, name='iso_geo')
+        assert sorted(ws.keys()) == ['iso_geo', 'iso_net']
+        assert 'iso_net' not in self.workspace.keys()
+        assert geo.workspace is ws
+        geo.models.regenerate()
+        fname = join(TEMP_DIR, 'test_isolated')
+        ws.save_simulation(net, filename=fname)
+        ws2 = OpenPNM.Base.Workspace.isolated()
+        ws2.load_simulation(filename=fname)
+        assert sorted(ws2.keys()) == ['iso_geo', 'iso_net']
+        assert ws2['iso_net'].workspace is ws2
+        ws.purge_object(geo)
+        assert list(ws.keys()) == ['iso_net']
+        assert 'iso_geo' in ws2.keys()
+
+    def test_isolated_workspace_positional_network(self):
+        ws = OpenPNM.Base.Workspace.isolated()
+        with ws:
+            net = OpenPNM.Network.Cubic(shape=[3, 3, 3])
+        geo = OpenPNM.Geometry.GenericGeometry(net, pores=net.Ps,
+                                               throats=net.Ts)
+        phase = OpenPNM.Phases.GenericPhase(net)
+        phys = OpenPNM.Physics.GenericPhysics(net, phase, pores=net.Ps,
+                                              throats=net.Ts)
+        for item in [geo, phase, phys]:
+            assert item.workspace is ws
+            assert item.name not in self.workspace.keys()
+
+    def test_isolated_workspaces_same_names(self):
+        geos = []
+        for shape in [[3, 3, 3], [4, 4, 4]]:
+            ws = OpenPNM.Base.Workspace.isolated()
+            with ws:
+                net = OpenPNM.Network.Cubic(shape=shape, name='same_net')
+                geos.append(OpenPNM.Geometry.TestGeometry(network=net,
+                                                          pores=net.Ps,
+                                                          throats=net.Ts,
+                                                          name='same_geo'))
+        # Each ModelsDict regenerates onto its own object
+        for geo in geos:
+            assert geo.models._find_master() is geo
+            assert geo.models['pore.seed']._find_master() is geo
+            geo.models.regenerate()
+            assert geo['pore.seed'].size == geo.Np
+        assert geos[0].Np != geos[1].Np
+
+    def test_isolated_workspaces_in_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        def run(i):
+            ws = OpenPNM.Base.Workspace.isolated()
+            with ws:
+                net = OpenPNM.Network.Cubic(shape=[3, 3, 3], name='net')
+                OpenPNM.Geometry.TestGeometry(network=net, pores=net.Ps,
+                                              throats=net.Ts, name='geo')
+                net['pore.index'] = i
+            return ws
+
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(run, range(8)))
+        for i, ws in enumerate(results):
+            assert sorted(ws.keys()) == ['geo', 'net']
+            assert (ws['net']['pore.index'] == i).all()
+            assert ws['geo']._net is ws['net']
+
     def test_geometries(self):
         a = self.workspace.geometries()
         assert type(a) is list
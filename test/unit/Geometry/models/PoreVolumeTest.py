@@ -1,3 +1,62 @@
+import OpenPNM
+import scipy as sp
+import tempfile
+import OpenPNM.Geometry.models as gm
+
+
 class PoreVolumeTest:
+    def setup_class(self):
+        bp = sp.array([[0.2, 0.2, 0.2], [0.2, 0.8, 0.2], [0.8, 0.2, 0.2],
+                       [0.8, 0.8, 0.2], [0.2, 0.2, 0.8], [0.2, 0.8, 0.8],
+                       [0.8, 0.2, 0.8], [0.8, 0.8, 0.8]])
+        scale = 1e-4
+        p = (sp.random.random([len(bp), 3])-0.5)/10000
+        bp += p
+        self.net = OpenPNM.Network.Delaunay(domain_size=[scale, scale, scale],
+                                            base_points=bp*scale)
+        self.net.add_boundaries()
+        self.geo = OpenPNM.Geometry.Voronoi(network=self.net,
+                                            pores=self.net.Ps,
+                                            throats=self.net.Ts,
+                                            fibre_rad=5e-6,
+                                            voxel_vol=False)
+
     def test_get_hull_volume(self):
-        pass
+        cube = sp.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0],
+                         [0, 0, 1], [1, 0, 1], [0, 1, 1], [1, 1, 1]])
+        vol, com = gm.pore_volume._get_hull_volume(cube*2.0)
+        assert sp.allclose(vol, 8.0)
+        assert sp.allclose(com, [1, 1, 1])
+
+    def test_in_hull_volume_chunked(self):
+        f = gm.pore_volume.in_hull_volume
+        v1 = f(network=self.net, geometry=self.geo, fibre_rad=5e-6)
+        fibres = sp.array(self.geo._fibre_image)
+        hulls = sp.array(self.geo._hull_image)
+        v2 = f(network=self.net, geometry=self.geo, fibre_rad=5e-6,
+               chunk_len=23, memmap_dir=tempfile.gettempdir())
+        assert sp.all(v1 == v2)
+        assert sp.all(fibres == self.geo._fibre_image)
+        assert sp.all(hulls == self.geo._hull_image)
+        assert hulls.dtype == sp.uint16
+        assert sp.sum(v1) > 0
+
+    def test_line_voxels(self):
+        f = gm.pore_volume._line_voxels
+        square = sp.array([[0, 0, 0], [10, 0, 0], [10, 10, 0], [0, 10, 0]])
+        vox = f(sp.array([0, 4]), square*1e-6, 1e-6, [11, 11, 11])
+        assert sp.shape(vox) == (40, 3)
+        assert sp.all(vox[:-1, 0] <= vox[1:, 0])
+        tri = sp.array([[0, 0, 2], [0, 0, 8], [0, 6, 2]])
+        verts = sp.vstack((square, tri))*1e-6
+        vox = f(sp.array([0, 4, 7]), verts, 1e-6, [11, 11, 11])
+        assert [10, 10, 0] in vox.tolist()
+        assert [0, 6, 2] in vox.tolist()
+        assert [0, 0, 5] in vox.tolist()
+
+    def test_voxel_centroid(self):
+        im = sp.zeros([6, 6, 6], dtype=int)
+        im[0:2, 0:2, 0:2] = 1
+        im[3:6, 3:6, 3:6] = 2
+        com = gm.pore_volume._voxel_centroid(im, pores=[1, 2, 3], vox_len=2)
+        assert sp.allclose(com, [[1, 1, 1], [8, 8, 8], [0, 0, 0]])
@@ -1,3 +1,62 @@
+import OpenPNM
+import scipy as sp
+import OpenPNM.Geometry.models as gm
+f = gm.throat_offset_vertices.distance_transform
+
+
 class ThroatOffsetVerticesTest:
-    def test_voronoi(self):
-        pass
+    def setup_class(self):
+        bp = sp.array([[0.2, 0.2, 0.2], [0.2, 0.8, 0.2], [0.8, 0.2, 0.2],
+                       [0.8, 0.8, 0.2], [0.2, 0.2, 0.8], [0.2, 0.8, 0.8],
+                       [0.8, 0.2, 0.8], [0.8, 0.8, 0.8]])
+        scale = 1e-4
+        p = (sp.random.random([len(bp), 3])-0.5)/10000
+        bp += p
+        self.net = OpenPNM.Network.Delaunay(domain_size=[scale, scale, scale],
+                                            base_points=bp*scale)
+        self.net.add_boundaries()
+        self.geo = OpenPNM.Geometry.Voronoi(network=self.net,
+                                            pores=self.net.Ps,
+                                            throats=self.net.Ts,
+                                            fibre_rad=5e-6,
+                                            voxel_vol=False)
+
+    def test_distance_transform_analytic(self):
+        f(network=self.net, geometry=self.geo, offset=5e-6,
+          set_dependent=True)
+        a1 = self.geo['throat.area'].copy()
+        d1 = self.geo['throat.indiameter'].copy()
+        f(network=self.net, geometry=self.geo, offset=5e-6,
+          set_dependent=True, method='analytic')
+        a2 = self.geo['throat.area'].copy()
+        d2 = self.geo['throat.indiameter'].copy()
+        assert sp.allclose(a1, a2, rtol=0.1)
+        assert sp.allclose(d1, d2, rtol=0.1)
+
+    def test_distance_transform_parallel(self):
+        v1 = f(network=self.net, geometry=self.geo, offset=5e-6,
+               set_dependent=False)
+        v2 = f(network=self.net, geometry=self.geo, offset=5e-6,
+               set_dependent=False, num_processes=2)
+        for a, b in zip(v1, v2):
+            assert sp.array_equal(a, b)
+
+    def test_distance_transform_bad_method(self):
+        flag = False
+        try:
+            f(network=self.net, geometry=self.geo, offset=5e-6,
+              set_dependent=False, method='blah')
+        except Exception:
+            flag = True
+        assert flag
+
+    def test_offset_square(self):
+        square = sp.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]])
+        g = gm.throat_offset_vertices._offset_facet_analytic
+        verts, area, perim, cen, incen, inrad, diam = g(square, [0, 0, 1], 0.1)
+        assert sp.allclose(area, 0.64)
+        assert sp.allclose(perim, 3.2)
+        assert sp.allclose(inrad, 0.4)
+        assert sp.allclose(incen, [0.5, 0.5, 0])
+        assert sp.allclose(sp.sort(verts[:, 0]), [0.1, 0.1, 0.9, 0.9])
+        assert g(square, [0, 0, 1], 0.6)[0] is None
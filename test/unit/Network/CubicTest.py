@@ -1,3 +1,4 @@
+import pickle
 import OpenPNM
 import scipy as sp
 
@@ -122,3 +123,110 @@ class CubicTest:
         L = self.net.domain_length(face_1=self.net.pores('top'),
                                    face_2=self.net.pores('bottom'))
         assert sp.allclose(L, 4, rtol=1e-02)
+
+    def test_coords_and_conns(self):
+        net = OpenPNM.Network.Cubic(shape=[2, 3, 4], spacing=[1, 2, 3])
+        assert sp.allclose(net['pore.coords'][0], [0.5, 1, 1.5])
+        assert sp.allclose(net['pore.coords'][-1], [1.5, 5, 10.5])
+        assert sp.allclose(net['pore.coords'][5], [0.5, 3, 4.5])
+        assert net['throat.conns'].tolist()[:2] == [[0, 1], [1, 2]]
+        assert net.Nt == 2*3*3 + 2*2*4 + 1*3*4
+
+    def test_index_dtype(self):
+        net = OpenPNM.Network.Cubic(shape=[5, 5, 5], index_dtype=sp.int32)
+        assert net['throat.conns'].dtype == sp.int32
+        assert net['pore.index'].dtype == sp.int32
+        assert sp.all(net['throat.conns'] == self.net['throat.conns'])
+        assert net.num_neighbors(pores=62) == 6
+        net.trim(pores=[0, 1])
+        assert net.Np == 123
+
+    def test_index_dtype_too_small(self):
+        flag = False
+        try:
+            OpenPNM.Network.Cubic(shape=[10, 10, 10], index_dtype=sp.int8)
+        except Exception:
+            flag = True
+        assert flag
+
+    def test_implicit(self):
+        net = OpenPNM.Network.Cubic(shape=[4, 5, 6], connectivity=26,
+                                    implicit=True)
+        ref = OpenPNM.Network.Cubic(shape=[4, 5, 6], connectivity=26)
+        assert 'throat.conns' not in net.keys()
+        assert 'throat.conns' in net.props('throat')
+        assert net.Nt == ref.Nt
+        assert sp.all(net['throat.conns'] == ref['throat.conns'])
+        Ps = [0, 7, 33, 119]
+        a = net.find_neighbor_pores(pores=Ps, flatten=False)
+        b = ref.find_neighbor_pores(pores=Ps, flatten=False)
+        assert all([sp.all(i == j) for i, j in zip(a, b)])
+        a = net.find_neighbor_throats(pores=Ps, mode='intersection')
+        b = ref.find_neighbor_throats(pores=Ps, mode='intersection')
+        assert sp.all(a == b)
+        assert sp.all(net.num_neighbors(Ps) == ref.num_neighbors(Ps))
+        am = net.create_incidence_matrix() - ref.create_incidence_matrix()
+        assert am.nnz == 0
+        vals = sp.rand(net.Nt) - 0.5
+        for kwargs in [{}, {'dropzeros': False}, {'sym': False}]:
+            a = net.create_adjacency_matrix(data=vals, **kwargs)
+            b = ref.create_adjacency_matrix(data=vals, **kwargs)
+            assert a.nnz == b.nnz
+            assert (a - b).nnz == 0
+        for kwargs in [{}, {'dropzeros': False}]:
+            a = net.create_incidence_matrix(data=vals, **kwargs)
+            b = ref.create_incidence_matrix(data=vals, **kwargs)
+            assert a.nnz == b.nnz
+            assert (a - b).nnz == 0
+        assert 'throat.conns' not in net.keys()
+
+    def test_implicit_conns_cached(self):
+        net = OpenPNM.Network.Cubic(shape=[4, 5, 6], implicit=True)
+        conns = net['throat.conns']
+        assert net['throat.conns'] is conns
+        assert not conns.flags.writeable
+        net2 = pickle.loads(pickle.dumps(net))
+        assert sp.all(net2['throat.conns'] == conns)
+
+    def test_implicit_connected_pores(self):
+        net = OpenPNM.Network.Cubic(shape=[4, 5, 6], connectivity=26,
+                                    implicit=True)
+        ref = OpenPNM.Network.Cubic(shape=[4, 5, 6], connectivity=26)
+
+        def fail():
+            raise Exception('The full conns array should not be built')
+        net._lattice_conns = fail
+        Ts = [0, 5, 99, 100, net.Nt - 1, 5]
+        a = net.find_connected_pores(throats=Ts)
+        assert sp.all(a == ref.find_connected_pores(throats=Ts))
+        assert sp.all(net.find_connected_pores(throats=net.Ts) ==
+                      ref['throat.conns'])
+        a = net.find_connected_pores(throats=Ts, flatten=True)
+        assert sp.all(a == ref.find_connected_pores(throats=Ts, flatten=True))
+        a = net.find_neighbor_pores(pores=[0, 57], flatten=False)
+        b = ref.find_neighbor_pores(pores=[0, 57], flatten=False)
+        assert all([sp.all(i == j) for i, j in zip(a, b)])
+
+    def test_implicit_materialize(self):
+        net = OpenPNM.Network.Cubic(shape=[5, 5, 5], implicit=True)
+        net.materialize()
+        assert 'throat.conns' in net.keys()
+        assert sp.all(net['throat.conns'] == self.net['throat.conns'])
+        net = OpenPNM.Network.Cubic(shape=[5, 5, 5], implicit=True)
+        net.trim(pores=[0, 1])
+        assert 'throat.conns' in net.keys()
+        assert net.num_neighbors(pores=0) == 3
+
+    def test_add_boundaries(self):
+        net = OpenPNM.Network.Cubic(shape=[3, 4, 5], spacing=[1, 2, 3])
+        net.add_boundaries()
+        assert net.Np == 60 + 2*(12 + 15 + 20)
+        assert net.num_throats('boundary') == 2*(12 + 15 + 20)
+        Ps = net.pores('top_boundary')
+        assert sp.allclose(net['pore.coords'][Ps, 2], 15)
+        Ts = net.find_neighbor_throats(pores=Ps)
+        assert sp.all(net['throat.top_boundary'][Ts])
+        parents = net.find_neighbor_pores(pores=Ps)
+        assert sp.all(net['pore.top'][parents])
+        Ps = net.pores('front_boundary')
+        assert sp.allclose(net['pore.coords'][Ps, 0], 0)
@@ -29,3 +29,27 @@ class DelaunayTest:
     def test_export_vor_fibres(self):
         self.net._export_vor_fibres()
         os.remove('fibres.p')
+
+    def test_simplices_to_conns(self):
+        simplices = sp.array([[0, 1, 2, 3], [1, 2, 3, 4], [2, 3, 4, 5]])
+        conns = OpenPNM.Network.Delaunay._simplices_to_conns(simplices, 5)
+        assert sp.all(conns[:, 0] < conns[:, 1])
+        assert sp.shape(conns) == (9, 2)
+        assert 5 not in conns
+        assert [2, 4] in conns.tolist()
+
+    def test_vertices_follow_trim_and_extend(self):
+        net = OpenPNM.Network.Delaunay(num_pores=30, domain_size=[1, 1, 1])
+        vo = OpenPNM.Utilities.vertexops
+        indptr, verts = vo.vertex_csr(net, 'throat')
+        before = sp.split(verts, indptr[1:-1])
+        Ts = net.find_neighbor_throats(pores=[0, 1])
+        net.trim(pores=[0, 1])
+        keep = sp.setdiff1d(sp.arange(len(before)), Ts)
+        indptr, verts = vo.vertex_csr(net, 'throat')
+        for i, t in enumerate(keep):
+            assert sp.allclose(verts[indptr[i]:indptr[i+1]], before[t])
+        net.extend(pore_coords=[[2, 2, 2]], throat_conns=[[0, net.Np]])
+        indptr, verts = vo.vertex_csr(net, 'pore', [net.Np - 1])
+        assert indptr[-1] == 0
+        self.mgr.purge_object(net)
@@ -335,3 +335,35 @@ class GenericNetworkTest:
         net.add_boundary_pores(pores=pores, offset=[0, 0, 1])
         assert net.Np == 32
         assert net.Nt == throats + 5
+
+    def test_set_storage_memmap(self):
+        import os
+        net = OpenPNM.Network.Cubic(shape=[5, 5, 5])
+        geo = OpenPNM.Geometry.GenericGeometry(network=net, pores=net.Ps,
+                                               throats=net.Ts)
+        geo['pore.diameter'] = 1.0
+        net.set_storage('memmap')
+        path = net._storage.path
+        assert isinstance(net['pore.coords'], sp.memmap)
+        assert isinstance(geo['pore.diameter'], sp.memmap)
+        # New arrays go through the normal checks and into the storage
+        geo['throat.diameter'] = 2.0
+        assert isinstance(geo['throat.diameter'], sp.memmap)
+        assert sp.all(geo['throat.diameter'] == 2.0)
+        net['pore.foo'] = sp.ones((net.Np + 1, ))
+        assert 'pore.foo' not in net.keys()
+        # Replacing an array removes its old file
+        N = len(os.listdir(path))
+        geo['throat.diameter'] = 3.0
+        assert len(os.listdir(path)) == N
+        # Topology changes keep the arrays in the storage
+        OpenPNM.Network.tools.trim(network=net, pores=[0])
+        assert isinstance(net['throat.conns'], sp.memmap)
+        conns = OpenPNM.Base.Tools.MemmapStorage.open_readonly(
+            net['throat.conns'].filename,
+            dtype=net['throat.conns'].dtype,
+            shape=net['throat.conns'].shape)
+        assert sp.all(conns == net['throat.conns'])
+        net.set_storage('memory')
+        assert not isinstance(net['pore.coords'], sp.memmap)
+        assert not isinstance(geo['pore.diameter'], sp.memmap)
@@ -25,3 +25,59 @@ class NetworkToolsTest:
         c = op.Network.tools.plot_coordinates(network=self.net, fig=b,
                                               pores=[1, 2, 3], c='b', s=50)
         assert c is b
+
+    def test_extend_many(self):
+        net1 = op.Network.Cubic(shape=[3, 3, 3])
+        net1['pore.prop'] = 1.0
+        net2 = op.Network.Cubic(shape=[3, 3, 3])
+        net2['pore.prop'] = 1.0
+        coords = [[[0, 0, 5], [0, 0, 6]], [[0, 0, 7]]]
+        conns = [[[26, 27], [27, 28]], [[28, 29]]]
+        for i in range(2):
+            op.Network.tools.extend(network=net1, pore_coords=coords[i],
+                                    throat_conns=conns[i],
+                                    labels=['new', 'group'+str(i)])
+        op.Network.tools.extend_many(network=net2, pore_coords=coords,
+                                     throat_conns=conns,
+                                     labels=[['new', 'group0'],
+                                             ['new', 'group1']])
+        assert sorted(net1.keys()) == sorted(net2.keys())
+        for item in net1.keys():
+            a = sp.nan_to_num(net1[item])
+            b = sp.nan_to_num(net2[item])
+            assert sp.all(a == b)
+        assert sp.all(net2.pores('group1') == [29])
+        assert sp.all(net2.throats('new') == [54, 55, 56])
+
+    def test_trim_with_objects(self):
+        net = op.Network.Cubic(shape=[4, 4, 4])
+        Ps = net.pores('top')
+        Ts = net.find_neighbor_throats(pores=Ps, mode='intersection')
+        geo1 = op.Geometry.GenericGeometry(network=net, pores=Ps, throats=Ts)
+        geo2 = op.Geometry.GenericGeometry(network=net,
+                                           pores=net.pores('top', mode='not'),
+                                           throats=net.throats(geo1.name,
+                                                               mode='not'))
+        geo1['pore.id'] = Ps
+        geo2['pore.id'] = net.pores(geo2.name)
+        phase = op.Phases.GenericPhase(network=net)
+        phase['throat.id'] = net.Ts
+        drop = [3, 7, 15, 50]
+        keep = sp.setdiff1d(net.Ps, drop)
+        Tdrop = net.find_neighbor_throats(pores=drop)
+        Tkeep = sp.setdiff1d(net.Ts, Tdrop)
+        net.trim(pores=drop)
+        assert net.Np == 60
+        assert sp.all(net['pore.'+geo1.name] + net['pore.'+geo2.name])
+        assert sp.all(geo1['pore.id'] == sp.setdiff1d(Ps, drop))
+        assert sp.all(net['pore.id'] == keep)
+        assert sp.all(phase['throat.id'] == Tkeep)
+        op.Base.Workspace().clear()
+
+    def test_trim_unregistered_network(self):
+        ws = op.Base.Workspace.isolated()
+        with ws:
+            net = op.Network.Cubic(shape=[3, 3, 3])
+        ws.clear()
+        op.Network.tools.trim(network=net, pores=[0])
+        assert net.Np == 26
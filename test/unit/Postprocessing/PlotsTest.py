@@ -1,4 +1,5 @@
 import OpenPNM
+import scipy as sp
 import matplotlib as mpl
 
 
@@ -39,6 +40,23 @@ class PlotsTest:
         a = OpenPNM.Postprocessing.Plots.porosity_profile(self.net, axis=2)
         assert isinstance(a, mpl.figure.Figure)
 
+    def test_drainage_curves(self):
+        OP = OpenPNM.Algorithms.OrdinaryPercolation(network=self.net)
+        OP.setup(invading_phase=self.water)
+        OP.set_inlets(pores=self.net.pores('top'))
+        OP.run(npts=10)
+        a = OpenPNM.Postprocessing.Plots.drainage_curves(OP)
+        assert isinstance(a, mpl.figure.Figure)
+        # Explicitly named arrays are plotted instead of get_drainage_data
+        OP['throat.my_Pc'] = 2*OP['throat.inv_Pc']
+        fig = mpl.figure.Figure()
+        b = OpenPNM.Postprocessing.Plots.drainage_curves(OP, fig=fig,
+                                                         Pc='my_Pc')
+        x = b.axes[0].lines[0].get_xdata()
+        Ts = OP.toindices(OP['throat.inv_seq'] > 0)
+        Ts = Ts[sp.argsort(OP['throat.inv_seq'][Ts])]
+        assert sp.all(x == OP['throat.my_Pc'][Ts])
+
 #    def test_profiles(self):
 #        vals = self.geo['pore.diameter']
 #        a = OpenPNM.Postprocessing.Plots.profiles(self.net, values=vals)
@@ -99,6 +99,50 @@ class IOTest:
         assert 'pore.diameter'+'|'+self.net.name not in net.keys()
         assert [item for item in net.keys() if '|'+self.phase.name in item]
 
+    def test_save_load_vtk_binary_formats(self):
+        fname = os.path.join(TEMP_DIR, 'test_save_vtk_3')
+        io.VTK.save(network=self.net, filename=fname, phases=self.phase)
+        ref = io.VTK.load(fname+'.vtp')
+        for fileformat in ['binary', 'appended']:
+            for compress in [False, True]:
+                io.VTK.save(network=self.net,
+                            filename=fname,
+                            phases=self.phase,
+                            fileformat=fileformat,
+                            compress=compress)
+                net = io.VTK.load(fname+'.vtp')
+                assert sorted(net.keys()) == sorted(ref.keys())
+                for item in ref.keys():
+                    assert net[item].dtype == ref[item].dtype
+                    assert sp.allclose(net[item], ref[item])
+
+    def test_save_vtk_bad_format(self):
+        fname = os.path.join(TEMP_DIR, 'test_save_vtk_4')
+        with pytest.raises(Exception):
+            io.VTK.save(network=self.net, filename=fname, fileformat='blah')
+
+    def test_vtk_series(self):
+        fname = os.path.join(TEMP_DIR, 'test_vtk_series')
+        series = io.VTKSeries(network=self.net, filename=fname,
+                              objects=[self.phase],
+                              props=['pore.temperature', 'pore.blah'],
+                              compress=True)
+        for i in range(3):
+            self.phase['pore.temperature'] = 300.0 + i
+            series.write(time=0.5*i)
+        assert len(series.frames) == 3
+        assert os.path.isfile(fname+'.pvd')
+        with open(fname+'.pvd') as f:
+            text = f.read()
+        assert text.count('<DataSet') == 3
+        assert 'timestep="1.0"' in text
+        net = io.VTK.load(series.frames[-1][1])
+        assert net.Np == 27
+        assert net.Nt == 54
+        key = 'pore.temperature|'+self.phase.name
+        assert sp.all(net[key] == 302.0)
+        assert len(net.props()) == 3
+
     def test_save_and_load_csv_no_phases(self):
         fname = os.path.join(TEMP_DIR, 'test_save_csv_1')
         io.CSV.save(network=self.net, filename=fname)
@@ -121,6 +165,47 @@ class IOTest:
         assert [True for item in net.keys() if 'temperature' in item]
         assert [True for item in net.keys() if 'diffusive_conductance' in item]
 
+    def test_save_and_load_csv_typed(self):
+        fname = os.path.join(TEMP_DIR, 'test_save_csv_3')
+        io.CSV.save(network=self.net, filename=fname, phases=self.phase,
+                    chunksize=10)
+        with open(fname+'.csv') as f:
+            header = f.readline()
+        assert 'pore.coords[2]:float64' in header
+        net = io.CSV.load(fname+'.csv')
+        for item in self.net.props(mode=['all', 'deep']) + self.net.labels():
+            assert net[item].dtype == self.net[item].dtype
+            assert sp.all(net[item] == self.net[item])
+        item = 'throat.diffusive_conductance'
+        assert sp.all(net[item+'|'+self.phase.name] == self.phase[item])
+
+    def test_save_and_load_csv_split(self):
+        fname = os.path.join(TEMP_DIR, 'test_save_csv_4')
+        io.CSV.save(network=self.net, filename=fname, split=True)
+        assert os.path.isfile(fname+'_pore.csv')
+        assert os.path.isfile(fname+'_throat.csv')
+        net = io.CSV.load(fname)
+        assert net.Np == 27
+        assert net.Nt == 54
+        assert net['throat.conns'].dtype == self.net['throat.conns'].dtype
+        assert sp.all(net['throat.conns'] == self.net['throat.conns'])
+        assert sp.all(net['pore.coords'] == self.net['pore.coords'])
+
+    def test_save_and_load_csv_with_nans(self):
+        net = op.Network.Cubic(shape=[3, 3, 3])
+        net['pore.partial'] = sp.rand(net.Np)
+        net['pore.partial'][[0, 5, 26]] = sp.nan
+        net['throat.partial'] = sp.nan
+        for split in [False, True]:
+            fname = os.path.join(TEMP_DIR, 'test_save_csv_5_'+str(split))
+            io.CSV.save(network=net, filename=fname, split=split)
+            net2 = io.CSV.load(fname)
+            assert net2.Np == net.Np
+            assert net2.Nt == net.Nt
+            for item in ['pore.partial', 'throat.partial']:
+                assert sp.all(sp.isnan(net2[item]) == sp.isnan(net[item]))
+                assert sp.allclose(net2[item], net[item], equal_nan=True)
+
     def test_save_and_load_mat_no_phases(self):
         fname = os.path.join(TEMP_DIR, 'test_save_mat_1')
         io.MAT.save(network=self.net, filename=fname)
@@ -153,6 +238,29 @@ class IOTest:
         a = {'pore.area', 'pore.diameter', 'throat.length', 'throat.perimeter'}
         assert a.issubset(net.props())
 
+    def test_networkx_graph_round_trip(self):
+        graph = io.NetworkX.to_graph(network=self.net, phases=[self.phase])
+        assert graph.number_of_nodes() == self.net.Np
+        assert graph.number_of_edges() == self.net.Nt
+        assert 'temperature|'+self.phase.name in graph.node[0]
+        net = io.NetworkX.from_graph(graph)
+        assert net.Nt == self.net.Nt
+        Ts = self.net.find_connecting_throat(net['throat.conns'][:, 0],
+                                             net['throat.conns'][:, 1])
+        Ts = sp.array(Ts).flatten().astype(int)
+        assert sp.allclose(net['pore.coords'], self.net['pore.coords'])
+        assert sp.allclose(net['throat.diameter'],
+                           self.net['throat.diameter'][Ts])
+
+    def test_save_load_networkx(self):
+        fname = os.path.join(TEMP_DIR, 'test_save_networkx')
+        io.NetworkX.save(network=self.net, filename=fname)
+        assert os.path.isfile(fname+'.yaml')
+        net = io.NetworkX.load(filename=fname+'.yaml')
+        assert net.Np == self.net.Np
+        assert net.Nt == self.net.Nt
+        assert sp.allclose(net['pore.diameter'], self.net['pore.diameter'])
+
     def test_load_imorph(self):
         path = os.path.join(FIXTURE_DIR, 'iMorph-Sandstone')
         net = io.iMorph.load(path)
@@ -176,3 +284,9 @@ class IOTest:
              'pore.coords', 'pore.volume', 'throat.area', 'throat.conns',
              'throat.coords'}
         assert a.issubset(net.props())
+        # The record walk used as a fallback finds the same records
+        fname = os.path.join(path, 'castle_cln.np2th')
+        raw = sp.fromfile(fname, dtype='u1')
+        starts = io.MARock._record_starts(raw, net.Np)
+        ids = io.MARock._gather(raw, starts, 'u4')
+        assert sp.all(ids == net['pore.ID_number'])
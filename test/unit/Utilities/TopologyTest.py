@@ -34,6 +34,32 @@ class TopologyTest:
         assert net.Np == 95
         assert net.Nt == 222
 
+    def test_merge_pores_groups(self):
+        net1 = OpenPNM.Network.Cubic(shape=[10, 10, 1], spacing=1)
+        net2 = OpenPNM.Network.Cubic(shape=[10, 10, 1], spacing=1)
+        net1['pore.id'] = net1.Ps
+        groups = [[11, 12, 21, 22], [13, 14, 23, 24], [77, 78]]
+        for Ps in groups:
+            Ps = net1.Ps[sp.in1d(net1['pore.id'], Ps)]
+            topo.merge_pores(network=net1, pores=Ps, labels=['merged'])
+        topo.merge_pores(network=net2, pores=groups, labels=['merged'])
+        assert net2.Np == 100 - 10 + 3
+        assert sp.all(net1['throat.conns'] == net2['throat.conns'])
+        assert sp.allclose(net1['pore.coords'], net2['pore.coords'])
+        assert sp.all(net2.pores('merged') == [90, 91, 92])
+        assert sp.all(net2.find_neighbor_pores(pores=90) ==
+                      [1, 2, 10, 16, 23, 24, 91])
+
+    def test_merge_pores_overlapping_groups(self):
+        net = OpenPNM.Network.Cubic(shape=[10, 10, 1], spacing=1)
+        flag = False
+        try:
+            topo.merge_pores(network=net, pores=[[11, 12], [12, 13]])
+        except Exception:
+            flag = True
+        assert flag
+        assert net.Np == 100
+
     def test_template_sphere_shell(self):
         from OpenPNM.Network import tools
         spacing = sp.array([0.5])
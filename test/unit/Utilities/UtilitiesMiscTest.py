@@ -53,3 +53,21 @@ class UtilitiesMiscTest:
         pts = sp.hstack([pts1, pts2])
         check = misc.iscoplanar(coords=net['pore.coords'][pts])
         assert check
+
+    def test_label_stats(self):
+        im = sp.ones([10, 12, 14], dtype=int)*-1
+        im[2:5, 3:9, 4:6] = 7
+        im[6:10, 0:2, 0:14] = 3
+        for chunk_size in [10**7, 100]:
+            stats = misc.label_stats(im, labels=[3, 7, 5], voxel_size=2,
+                                     chunk_size=chunk_size)
+            assert sp.all(stats['volume'] == sp.array([112, 36, 0])*8)
+            assert sp.allclose(stats['centroid'][0], sp.array([7.5, 0.5, 6.5])*2)
+            assert sp.allclose(stats['centroid'][1], sp.array([3, 5.5, 4.5])*2)
+            assert sp.all(sp.isnan(stats['centroid'][2]))
+            assert sp.all(stats['bbox_min'][1] == [2, 3, 4])
+            assert sp.all(stats['bbox_max'][1] == [4, 8, 5])
+            assert sp.all(stats['bbox_max'][2] == -1)
+        stats = misc.label_stats(im)
+        assert sp.all(stats['labels'] == [-1, 3, 7])
+        assert sp.sum(stats['volume']) == sp.size(im)
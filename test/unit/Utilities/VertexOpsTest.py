@@ -1,5 +1,6 @@
 import OpenPNM
 import scipy as sp
+import scipy.spatial
 import OpenPNM.Utilities.vertexops as vo
 
 
@@ -52,6 +53,30 @@ class VertexOpsTest:
         assert r == len(throat_verts)
         assert c == 2
 
+    def test_vertex_csr_matches_voronoi(self):
+        net = OpenPNM.Network.Delaunay(num_pores=30, domain_size=[1, 1, 1])
+        indptr, verts = vo.vertex_csr(net, 'pore')
+        assert len(indptr) == net.Np + 1
+        for i in net.Ps:
+            region = net._vor.regions[net._vor.point_region[i]]
+            if -1 in region:
+                assert indptr[i+1] == indptr[i]
+            else:
+                assert sp.allclose(verts[indptr[i]:indptr[i+1]],
+                                   net._vor.vertices[region])
+        assert net['pore.vert_ids'].dtype.kind == 'i'
+        self.mgr.purge_object(net)
+
+    def test_csr_polygon_area(self):
+        indptr, verts = vo.objects_to_csr(self.geo['throat.offset_vertices'])
+        area = vo.csr_polygon_area(indptr, verts, self.geo['throat.normal'])
+        for i in self.geo.throats():
+            v = self.geo['throat.offset_vertices'][i]
+            verts_2D = vo.rotate_and_chop(v, self.geo['throat.normal'][i])
+            hull = sp.spatial.ConvexHull(verts_2D, qhull_options='QJ Pp')
+            A = vo.PolyArea2D(verts_2D[hull.vertices])
+            assert sp.allclose(area[i], A)
+
 if __name__ == '__main__':
     a = VertexOpsTest()
     a.setup_class()